@@ -1,9 +1,9 @@
 import pygame
 import sys
-import random
 import math
 import numpy as np
 from typing import List, Tuple
+from roulette_selection import RouletteWheel
 
 # --- Constantes do Pygame e da Visualização ---
 SCREEN_WIDTH = 800
@@ -24,6 +24,8 @@ POPULATION_SIZE = 100
 NUM_GENERATIONS = 500
 MUTATION_RATE = 0.02 # Chance de 2% de uma rota sofrer mutação
 ELITISM_SIZE = 2 # Quantos dos melhores indivíduos passam para a próxima geração
+SEED = None # Semente do gerador aleatório (None = execução não reproduzível)
+SELECTION_METHOD = "roulette" # "roulette" (roleta) ou "sus" (amostragem universal estocástica)
 
 # --- Funções do Algoritmo Genético (versão completa) ---
 
@@ -41,10 +43,10 @@ def calculate_fitness(path: Path) -> float:
         distance += calculate_distance(path[i], path[(i + 1) % len(path)])
     return distance
 
-def crossover(parent1: Path, parent2: Path) -> Path:
+def crossover(parent1: Path, parent2: Path, rng: np.random.Generator) -> Path:
     """Realiza o crossover ordenado (OX1) para criar um filho."""
     child = [None] * len(parent1)
-    start, end = sorted(random.sample(range(len(parent1)), 2))
+    start, end = sorted(rng.choice(len(parent1), 2, replace=False).tolist())
     
     # Copia o segmento do pai 1
     child[start:end] = parent1[start:end]
@@ -70,10 +72,10 @@ def crossover(parent1: Path, parent2: Path) -> Path:
     return child
 
 
-def mutate(path: Path) -> Path:
+def mutate(path: Path, rng: np.random.Generator) -> Path:
     """Troca duas cidades de lugar na rota (mutação de troca)."""
-    if random.random() < MUTATION_RATE:
-        idx1, idx2 = random.sample(range(len(path)), 2)
+    if rng.random() < MUTATION_RATE:
+        idx1, idx2 = rng.choice(len(path), 2, replace=False).tolist()
         path[idx1], path[idx2] = path[idx2], path[idx1]
     return path
 
@@ -104,7 +106,10 @@ def draw_route(screen, route, cities):
 
 # --- Loop Principal ---
 
-def main():
+def main(seed=SEED):
+    # Toda a aleatoriedade da execução vem deste gerador
+    rng = np.random.default_rng(seed)
+
     pygame.init()
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
     pygame.display.set_caption("Visualizador de Algoritmo Genético - PCV")
@@ -112,8 +117,8 @@ def main():
     clock = pygame.time.Clock()
 
     # 1. Inicialização
-    cities = [(random.randint(0, 100), random.randint(0, 100)) for _ in range(N_CITIES)]
-    population = [random.sample(cities, len(cities)) for _ in range(POPULATION_SIZE)]
+    cities = [tuple(city) for city in rng.integers(0, 101, size=(N_CITIES, 2)).tolist()]
+    population = [[cities[i] for i in rng.permutation(len(cities))] for _ in range(POPULATION_SIZE)]
     
     best_route_so_far = None
     best_distance_so_far = float('inf')
@@ -141,21 +146,22 @@ def main():
             best_distance_so_far = fitness_scores[0]
             best_route_so_far = sorted_population[0]
 
-        # Inverte o fitness para a seleção (maior é melhor)
-        selection_probs = 1 / np.array(fitness_scores)
-        selection_probs /= np.sum(selection_probs) # Normaliza
+        # Inverte o fitness para a seleção (maior é melhor); a roleta é montada uma vez por geração
+        wheel = RouletteWheel(1 / np.array(fitness_scores))
+
+        # Seleciona de uma vez os dois pais (distintos) de cada filho
+        parent_pairs = wheel.sample_pairs(POPULATION_SIZE - len(new_population), rng,
+                                          distinct=True, method=SELECTION_METHOD)
 
         # Gera o resto da nova população
-        while len(new_population) < POPULATION_SIZE:
-            # Seleciona dois pais
-            indices = np.random.choice(len(population), 2, p=selection_probs, replace=False)
-            parent1, parent2 = population[indices[0]], population[indices[1]]
+        for parent1_index, parent2_index in parent_pairs.tolist():
+            parent1, parent2 = population[parent1_index], population[parent2_index]
             
             # Crossover
-            child = crossover(parent1, parent2)
+            child = crossover(parent1, parent2, rng)
             
             # Mutação
-            child = mutate(child)
+            child = mutate(child, rng)
             
             new_population.append(child)
 
@@ -8,6 +8,7 @@ import sys
 import numpy as np
 import pygame
 from benchmark_att48 import *
+from roulette_selection import RouletteWheel
 
 
 # Define constant values
@@ -22,6 +23,7 @@ N_CITIES = 15
 POPULATION_SIZE = 100
 N_GENERATIONS = None
 MUTATION_PROBABILITY = 0.5
+SEED = None  # random generator seed (None = non-reproducible run)
 
 # Define colors
 WHITE = (255, 255, 255)
@@ -30,6 +32,10 @@ RED = (255, 0, 0)
 BLUE = (0, 0, 255)
 
 
+# Random generator used by the selection step
+rng = np.random.default_rng(SEED)
+
+
 # Initialize problem
 # Using Random cities generation
 # cities_locations = [(random.randint(NODE_RADIUS + PLOT_X_OFFSET, WIDTH - NODE_RADIUS), random.randint(NODE_RADIUS, HEIGHT - NODE_RADIUS))
@@ -108,15 +114,17 @@ while running:
 
     new_population = [population[0]]  # Keep the best individual: ELITISM
 
-    while len(new_population) < POPULATION_SIZE:
+    # selection
+    # simple selection based on first 10 best solutions
+    # parent1, parent2 = random.choices(population[:10], k=2)
 
-        # selection
-        # simple selection based on first 10 best solutions
-        # parent1, parent2 = random.choices(population[:10], k=2)
+    # solution based on fitness probability: the wheel is built once per generation
+    # and every parent pair is drawn in a single vectorized call
+    wheel = RouletteWheel(1 / np.array(population_fitness))
+    parent_pairs = wheel.sample_pairs(POPULATION_SIZE - len(new_population), rng)
 
-        # solution based on fitness probability
-        probability = 1 / np.array(population_fitness)
-        parent1, parent2 = random.choices(population, weights=probability, k=2)
+    for parent1_index, parent2_index in parent_pairs.tolist():
+        parent1, parent2 = population[parent1_index], population[parent2_index]
 
         # child1 = order_crossover(parent1, parent2)
         child1 = order_crossover(parent1, parent1)
@@ -131,7 +139,20 @@ while running:
     clock.tick(FPS)
 
 
-# TODO: save the best individual in a file if it is better than the one saved.
+# Save the best individual in a file if it is better than the one saved
+BEST_SOLUTION_FILE = "best_solution.npz"
+if best_solutions:
+    best_index = int(np.argmin(best_fitness_values))
+    saved_fitness = float('inf')
+    try:
+        with np.load(BEST_SOLUTION_FILE) as saved:
+            if np.array_equal(saved["cities"], np.array(cities_locations)):
+                saved_fitness = float(saved["fitness"])
+    except FileNotFoundError:
+        pass
+    if best_fitness_values[best_index] < saved_fitness:
+        np.savez(BEST_SOLUTION_FILE, fitness=best_fitness_values[best_index],
+                 solution=np.array(best_solutions[best_index]), cities=np.array(cities_locations))
 
 # exit software
 pygame.quit()
@@ -0,0 +1,138 @@
+# adaptive_mutation.py
+
+import numpy as np
+
+ADAPTATION_METHODS = ("one_fifth", "lognormal")
+INITIAL_SIGMA_FRACTION = 0.1   # Initial step size as a fraction of (upper_bound - lower_bound)
+MIN_SIGMA = 1e-12
+# 1/5th success rule: sigmas are scaled by exp((success_rate - 1/5) / ONE_FIFTH_DAMPING),
+# growing above a 1/5 success rate and shrinking below it (at most x0.67 per generation)
+ONE_FIFTH_DAMPING = 0.5
+
+class SelfAdaptiveMutation:
+    """Gaussian mutation with one step size (sigma) per individual, adapted as the GA runs.
+
+    Every gene of a child moves by `sigma * y`, where y ~ N(0, C). Children
+    inherit the geometric mean of their parents' sigmas (a clone inherits its
+    parent's), and then:
+
+    - "lognormal": the sigma is perturbed as sigma * exp(tau * N(0, 1)) before
+      mutating, with tau = 1 / sqrt(D); good sigmas survive with the
+      individuals that carry them.
+    - "one_fifth": once the children are evaluated, the fraction of cloned
+      children (copies of one parent, so mutation is the only change) that
+      beat their parent scales every sigma up (above 1/5) or down (below).
+      Crossover children are not judged: a blend rarely beats the better
+      parent whatever the sigma, which pinned the rate near 0.1 and made the
+      sigmas shrink at a fixed pace instead of adapting. Without clones
+      (`crossover_rate=1`) all children are judged against their better
+      parent. The rate is pooled over the generation on purpose: judged
+      child by child, selection keeps exactly the lucky children whose sigmas
+      were just enlarged, and the sigmas drift upwards however rare success is.
+      On sphere and Ackley (P=200) it needs about 1.5x the generations of
+      "lognormal" at D=10 and about as many at D=30, where it beats the fixed
+      mutation. On "curviness", whose optimum lies on the a = 0 boundary, it
+      is still about 2x slower than the fixed mutation; prefer "lognormal".
+
+    With `covariance=True`, C follows a CMA-ES-style rank-mu update from the
+    steps of the best children, so mutations stretch along the directions
+    that have been paying off; otherwise C is the identity. C only encodes
+    the shape (its trace is kept at D); the scale is the sigmas' job.
+
+    All state is kept in arrays aligned with the population rows, and every
+    update works on the whole population at once. `mutation_rate` is not
+    used: every gene mutates.
+    """
+
+    def __init__(self, population_size, n_params, lower_bound, upper_bound, method="lognormal",
+                 covariance=False, initial_sigma=None):
+        if method not in ADAPTATION_METHODS:
+            raise ValueError(f"unknown adaptation method {method!r}; choose from {', '.join(ADAPTATION_METHODS)}")
+        self.method = method
+        self.lower_bound, self.upper_bound = lower_bound, upper_bound
+        self.max_sigma = upper_bound - lower_bound
+        if initial_sigma is None:
+            initial_sigma = INITIAL_SIGMA_FRACTION * self.max_sigma
+        self.sigmas = np.full(population_size, float(initial_sigma))
+        self.tau = 1 / np.sqrt(n_params)
+        self.covariance = np.eye(n_params) if covariance else None
+        self._factor = self.covariance
+        # Per-row data of the current population, filled in by `mutate`
+        self._parent_fitness = None
+        self._steps = None
+        self._cloned = None
+
+    def update(self, fitnesses):
+        """Adapts sigmas and covariance from the fitnesses of the children made by the last `mutate`."""
+        if self._parent_fitness is None or not len(self._parent_fitness):
+            return
+        children_fitness = fitnesses[1:]
+        if self.method == "one_fifth":
+            judged = self._cloned if self._cloned.any() else slice(None)
+            success_rate = np.mean(children_fitness[judged] > self._parent_fitness[judged])
+            self.sigmas *= np.exp((success_rate - 0.2) / ONE_FIFTH_DAMPING)
+            np.clip(self.sigmas, MIN_SIGMA, self.max_sigma, out=self.sigmas)
+        if self.covariance is not None:
+            self._update_covariance(children_fitness)
+
+    def _update_covariance(self, children_fitness):
+        # Rank-mu update: weighted scatter of the normalized steps of the best half of the children
+        n_params = self.covariance.shape[0]
+        mu = max(1, len(children_fitness) // 2)
+        best = np.argsort(-children_fitness, kind="stable")[:mu]
+        weights = np.log(mu + 0.5) - np.log(np.arange(1, mu + 1))
+        weights /= weights.sum()
+        mu_eff = 1 / np.sum(weights ** 2)
+        learning_rate = min(1.0, 2 * (mu_eff - 2 + 1 / mu_eff) / ((n_params + 2) ** 2 + mu_eff))
+        steps = self._steps[best]
+        scatter = (steps * weights[:, np.newaxis]).T @ steps
+        covariance = (1 - learning_rate) * self.covariance + learning_rate * scatter
+        covariance *= n_params / np.trace(covariance)
+        try:
+            self._factor = np.linalg.cholesky(covariance)
+            self.covariance = covariance
+        except np.linalg.LinAlgError:
+            pass  # Numerically degenerate: keep the previous shape
+
+    def mutate(self, children, first, second, clone, fitnesses, best_index, rng):
+        """Mutates the children of one generation and lines up the sigmas with the next population.
+
+        Args:
+            children: (P - 1, D) children in pair order (2j and 2j + 1 come from pair j).
+            first, second: Parent row indices of each pair.
+            clone: (n_pairs, 1) bool mask of pairs that were cloned instead of crossed.
+            fitnesses: Fitnesses of the current population.
+            best_index: Row of the elite, which goes to row 0 of the next population.
+        Returns:
+            The mutated children, clipped to the bounds.
+        """
+        n_children = len(children)
+        clone = clone[:, 0]
+        mixed = np.sqrt(self.sigmas[first] * self.sigmas[second])
+        inherited = np.empty(2 * len(first))
+        inherited[0::2] = np.where(clone, self.sigmas[first], mixed)
+        inherited[1::2] = np.where(clone, self.sigmas[second], mixed)
+        parent_fitness = np.empty(2 * len(first))
+        best_parent = np.maximum(fitnesses[first], fitnesses[second])
+        parent_fitness[0::2] = np.where(clone, fitnesses[first], best_parent)
+        parent_fitness[1::2] = np.where(clone, fitnesses[second], best_parent)
+        inherited, parent_fitness = inherited[:n_children], parent_fitness[:n_children]
+        cloned = np.repeat(clone, 2)[:n_children]
+
+        if self.method == "lognormal":
+            inherited *= np.exp(self.tau * rng.standard_normal(n_children))
+            np.clip(inherited, MIN_SIGMA, self.max_sigma, out=inherited)
+
+        steps = rng.standard_normal(children.shape)
+        if self.covariance is not None:
+            steps = steps @ self._factor.T
+        mutated = np.clip(children + inherited[:, np.newaxis] * steps, self.lower_bound, self.upper_bound)
+
+        sigmas = np.empty_like(self.sigmas)
+        sigmas[0] = self.sigmas[best_index]
+        sigmas[1:] = inherited
+        self.sigmas = sigmas
+        self._parent_fitness = parent_fitness
+        self._cloned = cloned
+        self._steps = steps
+        return mutated
@@ -0,0 +1,154 @@
+# benchmark.py
+
+import argparse
+import json
+import time
+import timeit
+
+import numpy as np
+from prettytable import PrettyTable
+
+from adaptive_mutation import ADAPTATION_METHODS
+from genetic_algorithm import genetic_algorithm
+from problems import PROBLEMS, get_problem, as_fitness, problem_dimension
+
+DIMENSIONS = (2, 10, 30)
+POPULATION_SIZES = (100, 1000, 10000)
+GENERATIONS = 200
+EPSILON = 1e-2          # A run "reaches the optimum" once best value - optimum <= EPSILON
+TOURNAMENT_SIZE = 4
+CROSSOVER_RATE = 0.7
+MIN_TIME = 0.2          # Seconds per evaluation-throughput measurement
+
+def measure_evaluations(problem, dimension, population_size, min_time=MIN_TIME, seed=0):
+    """Objective evaluations per second on a random (population_size, dimension) batch."""
+    rng = np.random.default_rng(seed)
+    population = rng.uniform(problem.lower_bound, problem.upper_bound, (population_size, dimension))
+    timer = timeit.Timer(lambda: problem.function(population))
+    number, _ = timer.autorange()
+    number = max(1, int(number * min_time / 0.2))
+    best = min(timer.repeat(3, number))
+    return number * population_size / best
+
+def measure_run(problem, dimension, population_size, generations=GENERATIONS, epsilon=EPSILON, seed=0,
+                mutation_rate=None, tournament_size=TOURNAMENT_SIZE, crossover_rate=CROSSOVER_RATE,
+                adaptation=None, covariance=False):
+    """Runs the GA on `problem` until it gets within `epsilon` of the optimum or runs out of generations.
+
+    `mutation_rate` defaults to 1 / dimension (one mutated gene per child on
+    average); `adaptation` and `covariance` are passed to `genetic_algorithm`.
+
+    Returns:
+        dict: Generations run, GA throughput and, if the target was reached,
+        the time and generations it took (None otherwise).
+    """
+    mutation_rate = 1 / dimension if mutation_rate is None else mutation_rate
+    state = {"generations": 0, "best_error": np.inf, "time_to_epsilon": None, "generations_to_epsilon": None}
+
+    def observer(generation, best_individual, best_fitness):
+        state["generations"] = generation
+        state["best_error"] = -best_fitness - problem.optimum
+        if state["best_error"] <= epsilon:
+            state["time_to_epsilon"] = time.perf_counter() - start_time
+            state["generations_to_epsilon"] = generation
+            return False
+        return True
+
+    start_time = time.perf_counter()
+    genetic_algorithm(population_size, problem.lower_bound, problem.upper_bound, generations, mutation_rate,
+                      tournament_size, crossover_rate, plot_all=False, seed=seed, objective=as_fitness(problem),
+                      n_params=dimension, observer=observer, verbose=False, adaptation=adaptation,
+                      covariance=covariance)
+    elapsed = time.perf_counter() - start_time
+    return {
+        "generations": state["generations"],
+        "generations_per_second": state["generations"] / elapsed,
+        "ga_evaluations_per_second": state["generations"] * population_size / elapsed,
+        "best_error": float(state["best_error"]),
+        "time_to_epsilon_seconds": state["time_to_epsilon"],
+        "generations_to_epsilon": state["generations_to_epsilon"],
+    }
+
+def run_scaling(problem_names=tuple(PROBLEMS), dimensions=DIMENSIONS, population_sizes=POPULATION_SIZES,
+                generations=GENERATIONS, epsilon=EPSILON, seed=0, mutation_rate=None, adaptation=None,
+                covariance=False):
+    """Measures every (problem, D, P) combination; problems with a fixed D use only that one."""
+    rows = []
+    for name in problem_names:
+        problem = get_problem(name)
+        for dimension in sorted({problem_dimension(problem, d) for d in dimensions}):
+            for population_size in population_sizes:
+                row = {"problem": name, "dimension": dimension, "population_size": population_size,
+                       "evaluations_per_second": measure_evaluations(problem, dimension, population_size, seed=seed)}
+                row.update(measure_run(problem, dimension, population_size, generations, epsilon, seed,
+                                       mutation_rate, adaptation=adaptation, covariance=covariance))
+                rows.append(row)
+    return rows
+
+def format_rows(rows):
+    """Results as a PrettyTable."""
+    table = PrettyTable()
+    table.field_names = ["Problem", "D", "P", "Evals/s", "GA evals/s", "Gens", "Best error", "Time to eps (s)"]
+    for row in rows:
+        time_to_epsilon = row["time_to_epsilon_seconds"]
+        table.add_row([row["problem"], row["dimension"], row["population_size"],
+                       f"{row['evaluations_per_second']:.3g}", f"{row['ga_evaluations_per_second']:.3g}",
+                       row["generations"], f"{row['best_error']:.3g}",
+                       "-" if time_to_epsilon is None else f"{time_to_epsilon:.3f}"])
+    return table
+
+def plot_scaling(rows):
+    """Throughput and time to epsilon against D, one line per (problem, P)."""
+    import matplotlib.pyplot as plt
+
+    fig, (ax_speed, ax_target) = plt.subplots(1, 2, figsize=(14, 6))
+    for name in dict.fromkeys(row["problem"] for row in rows):
+        for population_size in sorted({row["population_size"] for row in rows}):
+            series = [row for row in rows if row["problem"] == name and row["population_size"] == population_size]
+            dimensions = [row["dimension"] for row in series]
+            label = f"{name}, P={population_size}"
+            ax_speed.plot(dimensions, [row["ga_evaluations_per_second"] for row in series], marker='o', label=label)
+            reached = [row for row in series if row["time_to_epsilon_seconds"] is not None]
+            if reached:
+                ax_target.plot([row["dimension"] for row in reached],
+                               [row["time_to_epsilon_seconds"] for row in reached], marker='o', label=label)
+    ax_speed.set_xlabel('Dimension D')
+    ax_speed.set_ylabel('GA evaluations per second')
+    ax_speed.set_yscale('log')
+    ax_speed.set_title('Throughput')
+    ax_target.set_xlabel('Dimension D')
+    ax_target.set_ylabel('Seconds')
+    ax_target.set_yscale('log')
+    ax_target.set_title('Time to reach epsilon')
+    ax_speed.legend(fontsize='small')
+    plt.show()
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the real-valued GA on the registered problems.")
+    parser.add_argument("--problems", nargs="+", default=list(PROBLEMS), choices=list(PROBLEMS))
+    parser.add_argument("--dimensions", type=int, nargs="+", default=list(DIMENSIONS))
+    parser.add_argument("--population-sizes", type=int, nargs="+", default=list(POPULATION_SIZES))
+    parser.add_argument("--generations", type=int, default=GENERATIONS)
+    parser.add_argument("--epsilon", type=float, default=EPSILON)
+    parser.add_argument("--mutation-rate", type=float, default=None, help="default: 1 / D")
+    parser.add_argument("--adaptation", choices=ADAPTATION_METHODS, default=None,
+                        help="self-adaptive step sizes instead of the fixed uniform mutation")
+    parser.add_argument("--covariance", action="store_true",
+                        help="CMA-ES-style covariance update (requires --adaptation)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--plot", action="store_true", help="plot the scaling curves")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.covariance and args.adaptation is None:
+        raise SystemExit("--covariance requires --adaptation")
+    rows = run_scaling(args.problems, args.dimensions, args.population_sizes, args.generations, args.epsilon,
+                       args.seed, args.mutation_rate, args.adaptation, args.covariance)
+    print(format_rows(rows))
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(rows, output_file, indent=1)
+    if args.plot:
+        plot_scaling(rows)
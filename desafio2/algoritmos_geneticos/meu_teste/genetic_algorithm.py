@@ -1,108 +1,258 @@
 # genetic_algorithm.py
 
-import random
+import numpy as np
 from prettytable import PrettyTable
 import matplotlib.pyplot as plt
 
+from adaptive_mutation import SelfAdaptiveMutation
+
 # Placeholder functions for the genetic algorithm.
 # You will need to define these in your main script.
+# Individuals are rows of a (P, D) float array; every operator below works on
+# the whole population (or a whole batch of parents) at once.
 def fitness_function(params):
-    a, b, c = params
-    if a <= 0:
-        return -float('inf')  # Penalize downward facing u-shapes heavily
-    vertex_x = -b / (2 * a) #x value at vertex
-    vertex_y = a * (vertex_x ** 2) + b * vertex_x + c #y value at vertex
-    y_left = a * (-1) ** 2 + b * (-1) + c #y-coordinate at x = -1
-    y_right = a * (1) ** 2 + b * (1) + c #y-coordinate at x = 1
-    curviness = abs(y_left - vertex_y) + abs(y_right - vertex_y)
-    return -curviness  # Negate to minimize curviness
-
-def selection(population, fitnesses, tournament_size=3):
-    selected = []
-    for _ in range(len(population)):
-        tournament = random.sample(list(zip(population, fitnesses)), tournament_size)
-        winner = max(tournament, key=lambda x: x[1])[0]
-        selected.append(winner)
-    return selected
-
-def crossover(parent1, parent2):
-    alpha = random.random()
-    child1 = tuple(alpha * p1 + (1 - alpha) * p2 for p1, p2 in zip(parent1, parent2))
-    child2 = tuple(alpha * p2 + (1 - alpha) * p1 for p1, p2 in zip(parent1, parent2))
+    """Negated curviness of y = a*x^2 + b*x + c on [-1, 1].
+
+    Args:
+        params: Array of shape (..., 3) holding (a, b, c); a single individual
+            or a whole population.
+    Returns:
+        Fitness array of shape (...); -inf where a <= 0.
+    """
+    params = np.asarray(params, dtype=float)
+    a, b, c = params[..., 0], params[..., 1], params[..., 2]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        vertex_x = -b / (2 * a) #x value at vertex
+        vertex_y = a * (vertex_x ** 2) + b * vertex_x + c #y value at vertex
+    y_left = a - b + c #y-coordinate at x = -1
+    y_right = a + b + c #y-coordinate at x = 1
+    curviness = np.abs(y_left - vertex_y) + np.abs(y_right - vertex_y)
+    # Penalize downward facing u-shapes heavily; negate to minimize curviness
+    return np.where(a > 0, -curviness, -np.inf)
+
+def sample_distinct_indices(population_size, n_rows, row_size, rng=None):
+    """Draws `n_rows` rows of `row_size` distinct indices in [0, population_size).
+
+    Each row is distributed like `rng.choice(population_size, row_size,
+    replace=False)`, but all rows are drawn at once: rows are sampled with
+    replacement and only those containing a repeat are redrawn (rejection
+    sampling). When repeats would be common (small populations), each row is
+    taken from a random permutation instead.
+
+    Returns:
+        Int array of shape (n_rows, row_size).
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    if row_size > population_size:
+        raise ValueError(f"cannot draw {row_size} distinct indices from {population_size}")
+    if row_size * (row_size - 1) > population_size:
+        # Chance of a repeat-free row below ~60%: order random keys instead
+        return np.argsort(rng.random((n_rows, population_size)), axis=1)[:, :row_size]
+    indices = rng.integers(population_size, size=(n_rows, row_size))
+    pending = np.arange(n_rows)
+    while pending.size:
+        rows = np.sort(indices[pending], axis=1)
+        pending = pending[(rows[:, 1:] == rows[:, :-1]).any(axis=1)]
+        indices[pending] = rng.integers(population_size, size=(pending.size, row_size))
+    return indices
+
+def tournament_winners(fitnesses, contestants):
+    """Index of the fittest contestant of each row (the first one on ties)."""
+    best = np.asarray(fitnesses)[contestants].argmax(axis=-1)
+    return np.take_along_axis(contestants, best[..., np.newaxis], axis=-1)[..., 0]
+
+def tournament_parents(fitnesses, n_pairs, tournament_size, rng=None):
+    """Picks `n_pairs` parent pairs by tournament, returning row indices.
+
+    Each pair comes from 2 * tournament_size distinct contestants: the first
+    half yields the first parent and the second half the second parent. All
+    pairs of a generation are drawn in one batch. In populations smaller than
+    2 * tournament_size the tournaments shrink to half the population.
+
+    Returns:
+        Two int arrays of shape (n_pairs,).
+    """
+    tournament_size = max(1, min(tournament_size, len(fitnesses) // 2))
+    if n_pairs == 0:
+        return np.empty(0, dtype=int), np.empty(0, dtype=int)
+    contestants = sample_distinct_indices(len(fitnesses), n_pairs, 2 * tournament_size, rng)
+    winners = tournament_winners(fitnesses, contestants.reshape(n_pairs, 2, tournament_size))
+    return winners[:, 0], winners[:, 1]
+
+def selection(population, fitnesses, tournament_size=3, rng=None):
+    population = np.asarray(population)
+    contestants = sample_distinct_indices(len(population), len(population), tournament_size, rng)
+    return population[tournament_winners(fitnesses, contestants)]
+
+def crossover(parents1, parents2, rng=None):
+    """Blend crossover with one random weight per pair of parents.
+
+    Args:
+        parents1, parents2: Arrays of shape (K, D) (or (D,) for a single pair).
+    Returns:
+        Two children arrays with the parents' shape.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    parents1, parents2 = np.asarray(parents1, dtype=float), np.asarray(parents2, dtype=float)
+    alpha = rng.random(parents1.shape[:-1])[..., np.newaxis]
+    child1 = alpha * parents1 + (1 - alpha) * parents2
+    child2 = alpha * parents2 + (1 - alpha) * parents1
     return child1, child2
 
 # Mutation function
-def mutation(individual, mutation_rate, lower_bound, upper_bound):
-    individual = list(individual)
-    for i in range(len(individual)):
-        if random.random() < mutation_rate:
-            mutation_amount = random.uniform(-1, 1)
-            individual[i] += mutation_amount
-            # Ensure the individual stays within bounds
-            individual[i] = max(min(individual[i], upper_bound), lower_bound)
-    return tuple(individual)
+def mutation(population, mutation_rate, lower_bound, upper_bound, rng=None):
+    """Adds a uniform(-1, 1) step to each gene with probability `mutation_rate`.
+
+    Works on a single individual or a whole (P, D) population; the result is
+    clipped to [lower_bound, upper_bound].
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    population = np.asarray(population, dtype=float)
+    mutate = rng.random(population.shape) < mutation_rate
+    steps = rng.uniform(-1, 1, population.shape)
+    # Ensure the individuals stay within bounds
+    return np.clip(np.where(mutate, population + steps, population), lower_bound, upper_bound)
 
 # Main genetic algorithm function
-def create_initial_population(size, lower_bound, upper_bound):
-    """Creates the initial population of individuals."""
-    population = []
-    for _ in range(size):
-        individual = (random.uniform(lower_bound, upper_bound),
-                      random.uniform(lower_bound, upper_bound),
-                      random.uniform(lower_bound, upper_bound))
-        population.append(individual)
-    print(population)
-    return population
-
-def genetic_algorithm(population_size, lower_bound, upper_bound, generations, mutation_rate, tournament_size,crossover_rate, plot_all=True):
-    """Runs the genetic algorithm and returns the best solution."""
+def create_initial_population(size, lower_bound, upper_bound, rng=None, n_params=3):
+    """Creates the initial (size, n_params) population, uniform within the bounds."""
+    rng = np.random.default_rng() if rng is None else rng
+    return rng.uniform(lower_bound, upper_bound, (size, n_params))
+
+def breed(population, fitnesses, best_individual, mutation_rate, tournament_size, crossover_rate,
+          lower_bound, upper_bound, rng, adaptation=None):
+    """Builds the next generation: the elite plus mutated children of tournament winners.
+
+    With an `adaptation` (a `SelfAdaptiveMutation`), children get its
+    Gaussian self-adaptive mutation instead of `mutation`.
+    """
+    population_size = len(population)
+    n_pairs = population_size // 2
+    first, second = tournament_parents(fitnesses, n_pairs, tournament_size, rng)
+    parents1, parents2 = population[first], population[second]
+
+    # Perform crossover or cloning, decided once per pair
+    child1, child2 = crossover(parents1, parents2, rng)
+    clone = (rng.random(n_pairs) >= crossover_rate)[:, np.newaxis]
+    children = np.empty((2 * n_pairs, population.shape[1]))
+    children[0::2] = np.where(clone, parents1, child1)
+    children[1::2] = np.where(clone, parents2, child2)
+
+    # Elitism: the best individual goes through unchanged
+    next_population = np.empty_like(population)
+    next_population[0] = best_individual
+    if adaptation is None:
+        next_population[1:] = mutation(children[:population_size - 1], mutation_rate, lower_bound, upper_bound, rng)
+    else:
+        best_index = int(np.argmax(fitnesses))
+        next_population[1:] = adaptation.mutate(children[:population_size - 1], first, second, clone, fitnesses,
+                                                best_index, rng)
+    return next_population
+
+class GenerationHistory:
+    """Per-generation summaries kept in fixed-size arrays while the GA runs.
+
+    Each generation costs O(P) to summarize and O(D) to store, so memory no
+    longer grows with generations x population. Full populations (with their
+    fitnesses) are only kept every `snapshot_stride` generations, and always
+    for the last recorded one.
+    """
+
+    def __init__(self, generations, n_params, snapshot_stride=None):
+        self.snapshot_stride = snapshot_stride
+        self.best_individuals = np.empty((generations, n_params))
+        self.best_fitness = np.empty(generations)
+        self.min_fitness = np.empty(generations)
+        self.max_fitness = np.empty(generations)
+        self.mean_fitness = np.empty(generations)
+        self.std_fitness = np.empty(generations)
+        self.snapshots = {}
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def record(self, population, fitnesses, best_index):
+        """Stores the summary of the next generation (and its snapshot, if due)."""
+        g = self.count
+        self.best_individuals[g] = population[best_index]
+        self.best_fitness[g] = fitnesses[best_index]
+        self.min_fitness[g] = fitnesses.min()
+        self.max_fitness[g] = fitnesses.max()
+        # Mean/std over finite values only: -inf marks infeasible individuals
+        finite = fitnesses[np.isfinite(fitnesses)]
+        self.mean_fitness[g] = finite.mean() if finite.size else -np.inf
+        self.std_fitness[g] = finite.std() if finite.size else 0.0
+        # The previous snapshot stays only if it falls on the stride
+        if g - 1 in self.snapshots and not self._on_stride(g - 1):
+            del self.snapshots[g - 1]
+        self.snapshots[g] = (population, fitnesses)
+        self.count += 1
+
+    def _on_stride(self, generation):
+        return self.snapshot_stride is not None and generation % self.snapshot_stride == 0
+
+    def final_snapshot(self):
+        """Population, fitnesses and best index of the last recorded generation."""
+        population, fitnesses = self.snapshots[self.count - 1]
+        return population, fitnesses, int(np.argmax(fitnesses))
+
+def genetic_algorithm(population_size, lower_bound, upper_bound, generations, mutation_rate, tournament_size,crossover_rate, plot_all=True, seed=None, objective=fitness_function, n_params=3, snapshot_stride=None, observer=None, verbose=True, adaptation=None, covariance=False):
+    """Runs the genetic algorithm and returns the best solution.
+
+    Every random draw comes from a single generator built from `seed`, so a
+    fixed seed reproduces the run exactly. `objective` maps a (P, n_params)
+    array to P fitness values (higher is better) in one call. Full
+    populations are kept only every `snapshot_stride` generations and for the
+    last one (see `GenerationHistory`).
+
+    If given, `observer(generation, best_individual, best_fitness)` is called
+    once per generation; returning False stops the run early. With
+    `verbose=False` nothing is printed.
+
+    Tournaments larger than half the population are shrunk to fit, so any
+    population size runs (a single individual is just the elite).
+
+    `adaptation` ("one_fifth" or "lognormal") replaces the fixed uniform
+    mutation with self-adaptive per-individual step sizes, optionally with a
+    CMA-ES-style covariance (`covariance=True`); see `SelfAdaptiveMutation`.
+    """
+    rng = np.random.default_rng(seed)
     
-    population = create_initial_population(population_size, lower_bound, upper_bound)
+    population = create_initial_population(population_size, lower_bound, upper_bound, rng, n_params)
+    if verbose:
+        print(population)
     
-    best_performers = []
-    all_populations = []
+    if adaptation is not None:
+        adaptation = SelfAdaptiveMutation(population_size, n_params, lower_bound, upper_bound, adaptation,
+                                          covariance)
+    history = GenerationHistory(generations, n_params, snapshot_stride)
     table = PrettyTable()
-    table.field_names = ["Generation", "a", "b", "c", "Fitness"]
+    param_names = ["a", "b", "c"] if n_params == 3 else [f"x{i + 1}" for i in range(n_params)]
+    table.field_names = ["Generation", *param_names, "Fitness"]
 
     for generation in range(generations):
-        fitnesses = [fitness_function(ind) for ind in population]
-        best_individual = max(population, key=fitness_function)
-        best_fitness = fitness_function(best_individual)
+        fitnesses = objective(population)
+        if adaptation is not None:
+            adaptation.update(fitnesses)
+        best_index = int(np.argmax(fitnesses))
+        best_individual = population[best_index].copy()
+        best_fitness = float(fitnesses[best_index])
         
-        best_performers.append((best_individual, best_fitness))
-        all_populations.append(population[:])
-        table.add_row([generation + 1, round(best_individual[0], 4), round(best_individual[1], 4), round(best_individual[2], 4), round(best_fitness, 4)])
+        history.record(population, fitnesses, best_index)
+        table.add_row([generation + 1, *np.round(best_individual, 4), round(best_fitness, 4)])
+        if observer is not None and observer(generation + 1, best_individual, best_fitness) is False:
+            break
 
-        next_population = []
-        
-        # Elitism: Add the best individual to the new population
-        next_population.append(best_individual)
-
-        # Fill the rest of the new population
-        while len(next_population) < population_size:
-            # Select two parents to create offspring
-            tournament = random.sample(list(zip(population, fitnesses)), 2 * tournament_size)
-            parent1 = max(tournament[:tournament_size], key=lambda x: x[1])[0]
-            parent2 = max(tournament[tournament_size:], key=lambda x: x[1])[0]
-
-            # Perform crossover or cloning
-            if random.random() < crossover_rate:
-                child1, child2 = crossover(parent1, parent2)
-                next_population.append(mutation(child1, mutation_rate, lower_bound, upper_bound))
-                if len(next_population) < population_size:
-                    next_population.append(mutation(child2, mutation_rate, lower_bound, upper_bound))
-            else:
-                next_population.append(mutation(parent1, mutation_rate, lower_bound, upper_bound))
-                if len(next_population) < population_size:
-                    next_population.append(mutation(parent2, mutation_rate, lower_bound, upper_bound))
-        
-        population = next_population
+        population = breed(population, fitnesses, best_individual, mutation_rate, tournament_size, crossover_rate,
+                           lower_bound, upper_bound, rng, adaptation)
 
-    print(table)
+    if verbose:
+        print(table)
     
     if plot_all:
         # Assuming you've defined plot_all_results in another file
         from plot_functions import plot_all_results
-        plot_all_results(best_performers, all_populations, generations, lower_bound, upper_bound, fitness_function)
+        plot_all_results(history, lower_bound, upper_bound)
 
-    return max(population, key=fitness_function)
\ No newline at end of file
+    return population[np.argmax(objective(population))]
\ No newline at end of file
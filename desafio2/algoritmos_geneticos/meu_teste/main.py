@@ -9,11 +9,15 @@ lower_bound = -50
 upper_bound = 50
 tournament_size=4
 generations = 20
-mutation_rate = 2
+mutation_rate = 2  # only used by the fixed uniform mutation (adaptation = None)
 crossover_rate= 0.7
+seed = None  # set an int to reproduce a run
+adaptation = None  # opt-in self-adaptive step sizes: "lognormal" or "one_fifth"
+covariance = False  # CMA-ES-style covariance update of the mutation steps
 
 def main():
-    best_solution = genetic_algorithm(population_size, lower_bound, upper_bound, generations, mutation_rate,tournament_size,crossover_rate)
+    best_solution = genetic_algorithm(population_size, lower_bound, upper_bound, generations, mutation_rate,tournament_size,crossover_rate, seed=seed,
+                                     adaptation=adaptation, covariance=covariance)
     print(f"Melhor solução encontrada: a = {best_solution[0]}, b = {best_solution[1]}, c = {best_solution[2]}")
 
 if __name__ == "__main__":
@@ -0,0 +1,65 @@
+# problems.py
+
+from collections import namedtuple
+
+import numpy as np
+
+from genetic_algorithm import fitness_function
+
+# A continuous benchmark problem. `function` maps a (P, D) array to P values to
+# be MINIMIZED; `optimum` is its known minimum value. `dimension` is None when
+# the problem accepts any D, otherwise the only D it is defined for.
+Problem = namedtuple("Problem", ["name", "function", "lower_bound", "upper_bound", "optimum", "dimension"])
+
+def sphere(x):
+    """Sum of squares; minimum 0 at the origin."""
+    return np.sum(x ** 2, axis=-1)
+
+def rastrigin(x):
+    """Highly multimodal; minimum 0 at the origin."""
+    return 10 * x.shape[-1] + np.sum(x ** 2 - 10 * np.cos(2 * np.pi * x), axis=-1)
+
+def rosenbrock(x):
+    """Narrow curved valley; minimum 0 at (1, ..., 1)."""
+    return np.sum(100 * (x[..., 1:] - x[..., :-1] ** 2) ** 2 + (1 - x[..., :-1]) ** 2, axis=-1)
+
+def ackley(x):
+    """Nearly flat outer region with a deep hole; minimum 0 at the origin."""
+    d = x.shape[-1]
+    return (-20 * np.exp(-0.2 * np.sqrt(np.sum(x ** 2, axis=-1) / d))
+            - np.exp(np.sum(np.cos(2 * np.pi * x), axis=-1) / d) + 20 + np.e)
+
+def curviness(x):
+    """Curviness of y = a*x^2 + b*x + c on [-1, 1] (see `fitness_function`); infimum 0 as a -> 0+."""
+    return -fitness_function(x)
+
+PROBLEMS = {
+    problem.name: problem for problem in (
+        Problem("sphere", sphere, -5.12, 5.12, 0.0, None),
+        Problem("rastrigin", rastrigin, -5.12, 5.12, 0.0, None),
+        Problem("rosenbrock", rosenbrock, -5.0, 10.0, 0.0, None),
+        Problem("ackley", ackley, -32.768, 32.768, 0.0, None),
+        Problem("curviness", curviness, -50.0, 50.0, 0.0, 3),
+    )
+}
+
+def get_problem(name):
+    """Looks up a registered problem by name."""
+    try:
+        return PROBLEMS[name]
+    except KeyError:
+        raise ValueError(f"unknown problem {name!r}; choose from {', '.join(PROBLEMS)}") from None
+
+def register_problem(problem):
+    """Adds (or replaces) a problem in the registry."""
+    PROBLEMS[problem.name] = problem
+    return problem
+
+def as_fitness(problem):
+    """Vectorized fitness for `genetic_algorithm` (higher is better): the negated objective."""
+    function = problem.function
+    return lambda population: -function(population)
+
+def problem_dimension(problem, dimension):
+    """The D to run `problem` with: its fixed dimension, if any, else `dimension`."""
+    return dimension if problem.dimension is None else problem.dimension
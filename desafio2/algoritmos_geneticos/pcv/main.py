@@ -1,9 +1,11 @@
 # genetic_algorithm_tsp.py
 
 import itertools
+import queue
+import threading
+from functools import lru_cache
 import numpy as np
 import pygame
-import random
 import sys
 import matplotlib.pyplot as plt
 from pygame.locals import *
@@ -13,12 +15,14 @@ WIDTH, HEIGHT = 800, 600
 NODE_RADIUS = 8
 FPS = 30
 TSP_DISPLAY_OFFSET = 50
+PLOT_UPDATE_INTERVAL = 10  # Gerações entre redesenhos do gráfico do Matplotlib (o mais caro do laço)
 
 N_CITIES = 30
 POPULATION_SIZE = 100
 N_GENERATIONS = 500
 MUTATION_PROBABILITY = 0.3
 CROSSOVER_PROBABILITY = 0.8
+SEED = None  # Semente do gerador (None = execução não reproduzível)
 
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
@@ -31,47 +35,86 @@ GRAY = (128, 128, 128)
 def calculate_distance(city1, city2):
     return np.sqrt((city1[0] - city2[0])**2 + (city1[1] - city2[1])**2)
 
+class DistanceMatrix:
+    """Matriz de distâncias entre todas as cidades, calculada uma única vez.
+
+    A matriz é guardada como um array NumPy float64 contíguo, de forma que o
+    comprimento de uma rota vira uma única leitura vetorizada
+    (``matrix[path, np.roll(path, -1)]``) seguida de uma soma.
+    """
+
+    def __init__(self, cities):
+        coords = np.asarray(cities, dtype=np.float64)
+        diff = coords[:, np.newaxis, :] - coords[np.newaxis, :, :]
+        self.matrix = np.ascontiguousarray(np.sqrt((diff ** 2).sum(axis=-1)))
+        self.n_cities = len(coords)
+
+    def route_length(self, path):
+        """Calcula o comprimento total (fechado) de uma rota."""
+        path = np.asarray(path, dtype=np.intp)
+        return float(self.matrix[path, np.roll(path, -1)].sum())
+
+# Cache da última matriz construída, indexado pela identidade da lista de cidades
+_distance_matrix_cache = {"cities": None, "matrix": None}
+
+def get_distance_matrix(cities):
+    """Retorna a DistanceMatrix de `cities`, construindo-a apenas na primeira chamada.
+
+    Aceita também uma DistanceMatrix já pronta, que é devolvida sem alterações.
+    """
+    if isinstance(cities, DistanceMatrix):
+        return cities
+    if _distance_matrix_cache["cities"] is not cities:
+        _distance_matrix_cache["cities"] = cities
+        _distance_matrix_cache["matrix"] = DistanceMatrix(cities)
+    return _distance_matrix_cache["matrix"]
+
 def calculate_total_distance(path, cities):
-    distance = 0
-    for i in range(len(path)):
-        city1_index = path[i]
-        city2_index = path[(i + 1) % len(path)]
-        distance += calculate_distance(cities[city1_index], cities[city2_index])
-    return distance
-
-def create_initial_population(n_cities, pop_size):
-    population = []
-    for _ in range(pop_size):
-        individual = list(range(n_cities))
-        random.shuffle(individual)
-        population.append(individual)
-    return population
+    return get_distance_matrix(cities).route_length(path)
+
+def create_initial_population(n_cities, pop_size, rng):
+    return [rng.permutation(n_cities).tolist() for _ in range(pop_size)]
 
 def calculate_fitness(path, cities):
     distance = calculate_total_distance(path, cities)
     return 1 / (distance + 1e-10)
 
-def order_crossover(parent1, parent2):
+def sorted_cut_points(size, rng):
+    # Mesma regra de `ga_logic.sorted_cut_points` das pastas pvc-*: o primeiro corte
+    # em [0, size), o segundo em [0, size-1) deslocado para não repetir o primeiro
+    first = int(rng.integers(size))
+    second = int(rng.integers(size - 1))
+    if second >= first:
+        second += 1
+    return (first, second) if first < second else (second, first)
+
+def order_crossover(parent1, parent2, rng):
     size = len(parent1)
-    start, end = sorted(random.sample(range(size), 2))
+    start, end = sorted_cut_points(size, rng)
     
-    child = [-1] * size
-    sublist1 = parent1[start:end+1]
-    child[start:end+1] = sublist1
+    # Vetor de pertinência indexado pela cidade: teste O(1) em vez de `gene in sublist1`
+    sublist1 = list(parent1[start:end+1])
+    in_child = [False] * size
+    for gene in sublist1:
+        in_child[gene] = True
+    remaining = [gene for gene in parent2 if not in_child[gene]]
     
-    current_index = 0
-    for gene in parent2:
-        if gene not in sublist1:
-            while child[current_index] != -1:
-                current_index = (current_index + 1) % size
-            child[current_index] = gene
-            
-    return child
+    return remaining[:start] + sublist1 + remaining[start:]
 
-def swap_mutation(individual, mutation_prob):
+def canonical_route_key(route):
+    # Gira a rota para começar na cidade 0 e fixa o sentido, para que rotas
+    # equivalentes (mesmo ciclo) gerem a mesma chave
+    route = tuple(route)
+    start = route.index(0)
+    rotated = route[start:] + route[:start]
+    if len(rotated) > 2 and rotated[-1] < rotated[1]:
+        rotated = rotated[:1] + rotated[:0:-1]
+    return rotated
+
+def swap_mutation(individual, mutation_prob, rng):
     mutated_individual = list(individual)
-    if random.random() < mutation_prob:
-        idx1, idx2 = random.sample(range(len(mutated_individual)), 2)
+    if rng.random() < mutation_prob:
+        idx1, idx2 = rng.choice(len(mutated_individual), 2, replace=False).tolist()
         mutated_individual[idx1], mutated_individual[idx2] = mutated_individual[idx2], mutated_individual[idx1]
     return tuple(mutated_individual)
 
@@ -81,17 +124,15 @@ def draw_cities(screen, cities, color, radius):
         pygame.draw.circle(screen, color, city, radius)
 
 def draw_paths(screen, path, cities, color, width=1):
-    n = len(path)
-    for i in range(n):
-        city1_index = path[i]
-        city2_index = path[(i + 1) % n]
-        city1 = cities[city1_index]
-        city2 = cities[city2_index]
-        pygame.draw.line(screen, color, city1, city2, width)
-
-def draw_text(screen, text, x, y, color):
-    font = pygame.font.Font(None, 36)
-    text_surface = font.render(text, True, color)
+    # Rota fechada em uma única chamada, em vez de uma `draw.line` por aresta
+    pygame.draw.lines(screen, color, True, [cities[i] for i in path], width)
+
+@lru_cache(maxsize=None)
+def get_font(size):
+    return pygame.font.Font(None, size)
+
+def draw_text(screen, text, x, y, color, size=36):
+    text_surface = get_font(size).render(text, True, color)
     screen.blit(text_surface, (x, y))
 
 # --- Inicialização Pygame ---
@@ -101,15 +142,87 @@ screen = pygame.display.set_mode((WIDTH, HEIGHT))
 pygame.display.set_caption("Otimização de Rotas com Algoritmo Genético")
 clock = pygame.time.Clock()
 
+# --- Gerador de Números Aleatórios (toda a aleatoriedade do AG passa por ele) ---
+rng = np.random.default_rng(SEED)
+# O desenho (quais rotas cinzas aparecem) usa outro gerador: o resultado de uma
+# semente não depende de quantos quadros foram desenhados
+render_rng = np.random.default_rng()
+
 # --- Criação das Cidades ---
-cities_locations = [(random.randint(TSP_DISPLAY_OFFSET, WIDTH - TSP_DISPLAY_OFFSET),
-                     random.randint(TSP_DISPLAY_OFFSET, HEIGHT - TSP_DISPLAY_OFFSET))
+cities_locations = [(int(rng.integers(TSP_DISPLAY_OFFSET, WIDTH - TSP_DISPLAY_OFFSET + 1)),
+                     int(rng.integers(TSP_DISPLAY_OFFSET, HEIGHT - TSP_DISPLAY_OFFSET + 1)))
                     for _ in range(N_CITIES)]
 
-# --- Inicialização da População ---
-population = create_initial_population(N_CITIES, POPULATION_SIZE)
-best_fitness_history = []
-generation = 0
+# --- Comunicação entre o AG e o desenho ---
+# O AG roda em outra thread e publica, a cada geração, um snapshot
+# (geração, melhor rota, melhores rotas, duplicatas rejeitadas). A fila guarda só
+# o mais recente: o AG nunca espera pela tela, e a tela desenha só o último estado.
+snapshots = queue.Queue(maxsize=1)
+stop_event = threading.Event()
+best_fitness_history = []  # Escrito só pela thread do AG
+
+def publish(snapshot):
+    """Publica o snapshot sem bloquear, descartando o anterior se ainda não foi desenhado."""
+    while True:
+        try:
+            snapshots.put_nowait(snapshot)
+            return
+        except queue.Full:
+            try:
+                snapshots.get_nowait()
+            except queue.Empty:
+                pass
+
+def latest_snapshot():
+    """Retorna o snapshot mais recente (ou None, se nenhum chegou desde o último quadro)."""
+    snapshot = None
+    while True:
+        try:
+            snapshot = snapshots.get_nowait()
+        except queue.Empty:
+            return snapshot
+
+def evolve():
+    """Laço do AG (thread do otimizador): roda até N_GENERATIONS ou até `stop_event`."""
+    population = create_initial_population(N_CITIES, POPULATION_SIZE, rng)
+    rejected_duplicates = 0
+    for generation in range(1, N_GENERATIONS + 1):
+        if stop_event.is_set():
+            return
+
+        # --- Lógica do Algoritmo Genético ---
+        population_fitness = [calculate_fitness(ind, cities_locations) for ind in population]
+        sorted_population = [population[i] for i in np.argsort(population_fitness)[::-1]]
+        best_individual = sorted_population[0]
+        best_fitness = calculate_fitness(best_individual, cities_locations)
+        best_fitness_history.append(best_fitness)
+        publish((generation, best_individual, sorted_population[:5], rejected_duplicates))
+
+        # --- Próxima Geração (Criação de Descendentes) ---
+        next_population = [list(best_individual)]
+        seen_routes = {canonical_route_key(best_individual)}
+        rejected_duplicates = 0
+        while len(next_population) < POPULATION_SIZE:
+            tournament = [sorted_population[i] for i in rng.choice(20, 5, replace=False)]
+            parent1 = max(tournament, key=lambda ind: calculate_fitness(ind, cities_locations))
+            tournament = [sorted_population[i] for i in rng.choice(20, 5, replace=False)]
+            parent2 = max(tournament, key=lambda ind: calculate_fitness(ind, cities_locations))
+            
+            if rng.random() < CROSSOVER_PROBABILITY:
+                child = order_crossover(list(parent1), list(parent2), rng)
+            else:
+                child = list([list(parent1), list(parent2)][rng.integers(2)])
+                
+            child = swap_mutation(tuple(child), MUTATION_PROBABILITY, rng)
+            
+            route_key = canonical_route_key(child)
+            if route_key not in seen_routes:
+                seen_routes.add(route_key)
+                next_population.append(list(child))
+            else:
+                rejected_duplicates += 1
+        
+        population = [tuple(ind) for ind in next_population]
 
 # --- Configuração do Matplotlib ---
 plt.ion() # Modo interativo para que o gráfico não bloqueie o programa
@@ -117,8 +230,14 @@ fig, ax = plt.subplots()
 ax.set_title("Evolução da Aptidão por Geração")
 ax.set_xlabel("Geração")
 ax.set_ylabel("Aptidão (1/Distância)")
+# Linha criada uma vez; a cada atualização só os dados mudam
+fitness_line, = ax.plot([], [], color='blue')
+plotted_generation = 0
 
-# --- Loop Principal ---
+optimizer = threading.Thread(target=evolve, name="optimizer", daemon=True)
+optimizer.start()
+
+# --- Loop Principal (desenho) ---
 running = True
 while running:
     # --- Verificação de Eventos ---
@@ -131,63 +250,41 @@ while running:
             if event.key == pygame.K_ESCAPE:
                 running = False
 
-    if generation >= N_GENERATIONS:
-        # Se as gerações terminarem, o loop continua só para esperar por um evento de saída
-        continue
-
-    # --- Lógica do Algoritmo Genético ---
-    generation += 1
-    population_fitness = [calculate_fitness(ind, cities_locations) for ind in population]
-    sorted_population = [population[i] for i in np.argsort(population_fitness)[::-1]]
-    best_individual = sorted_population[0]
-    best_fitness = calculate_fitness(best_individual, cities_locations)
-    best_fitness_history.append(best_fitness)
-
-    # --- Atualizar Gráfico do Matplotlib ---
-    ax.clear()
-    ax.set_title(f"Evolução da Aptidão (Geração {generation}/{N_GENERATIONS})")
-    ax.set_xlabel("Geração")
-    ax.set_ylabel("Aptidão (1/Distância)")
-    ax.plot(range(1, len(best_fitness_history) + 1), best_fitness_history, color='blue')
-    fig.canvas.draw()
-    fig.canvas.flush_events()
-
-    # --- Desenhar na Tela do Pygame ---
-    screen.fill(WHITE)
-    draw_cities(screen, cities_locations, RED, NODE_RADIUS)
-    draw_paths(screen, best_individual, cities_locations, BLUE, 2)
-    
-    # Desenhar algumas outras rotas da população para diversidade
-    num_to_draw = min(5, POPULATION_SIZE)
-    for i in range(1, num_to_draw):
-        if random.random() < 0.3:
-            draw_paths(screen, sorted_population[i], cities_locations, GRAY, 1)
-
-    # Exibir a geração atual na tela do Pygame
-    draw_text(screen, f"Geração: {generation}/{N_GENERATIONS}", 10, 10, BLACK)
-
-    pygame.display.flip()
-
-    # --- Próxima Geração (Criação de Descendentes) ---
-    next_population = [list(best_individual)]
-    while len(next_population) < POPULATION_SIZE:
-        tournament = random.sample(sorted_population[:20], 5)
-        parent1 = max(tournament, key=lambda ind: calculate_fitness(ind, cities_locations))
-        tournament = random.sample(sorted_population[:20], 5)
-        parent2 = max(tournament, key=lambda ind: calculate_fitness(ind, cities_locations))
-        
-        if random.random() < CROSSOVER_PROBABILITY:
-            child = order_crossover(list(parent1), list(parent2))
-        else:
-            child = list(random.choice([list(parent1), list(parent2)]))
-            
-        child = swap_mutation(tuple(child), MUTATION_PROBABILITY)
+    snapshot = latest_snapshot()
+    if snapshot is not None:
+        # Terminadas as gerações, o loop continua só para esperar por um evento de saída
+        generation, best_individual, top_routes, rejected_duplicates = snapshot
+
+        # --- Atualizar Gráfico do Matplotlib ---
+        if generation - plotted_generation >= PLOT_UPDATE_INTERVAL or generation == N_GENERATIONS:
+            ax.set_title(f"Evolução da Aptidão (Geração {generation}/{N_GENERATIONS})")
+            fitness_line.set_data(range(1, generation + 1), best_fitness_history[:generation])
+            ax.relim()
+            ax.autoscale_view()
+            fig.canvas.draw_idle()
+            fig.canvas.flush_events()
+            plotted_generation = generation
+
+        # --- Desenhar na Tela do Pygame ---
+        screen.fill(WHITE)
+        draw_cities(screen, cities_locations, RED, NODE_RADIUS)
+        draw_paths(screen, best_individual, cities_locations, BLUE, 2)
         
-        if list(child) not in next_population:
-            next_population.append(list(child))
-    
-    population = [tuple(ind) for ind in next_population]
+        # Desenhar algumas outras rotas da população para diversidade
+        for route in top_routes[1:]:
+            if render_rng.random() < 0.3:
+                draw_paths(screen, route, cities_locations, GRAY, 1)
+
+        # Exibir a geração atual na tela do Pygame
+        draw_text(screen, f"Geração: {generation}/{N_GENERATIONS}", 10, 10, BLACK)
+        draw_text(screen, f"Duplicatas rejeitadas: {rejected_duplicates}", 10, 40, BLACK)
+
+        pygame.display.flip()
+
+    clock.tick(FPS)
     
 # --- Finalização ---
+stop_event.set()
+optimizer.join()
 pygame.quit()
-sys.exit()
\ No newline at end of file
+sys.exit()
@@ -1,79 +1,734 @@
 # ga_logic.py
 
-import random
+import math
 import numpy as np
 
-def create_initial_population(n_cities, pop_size):
-    """Cria a população inicial de rotas aleatórias."""
-    population = []
-    for _ in range(pop_size):
-        individual = list(range(n_cities))
-        random.shuffle(individual)
-        population.append(individual)
+# Gerador usado quando nenhum é injetado. Para execuções reproduzíveis, crie um
+# `np.random.default_rng(seed)` e passe-o como `rng` a todas as funções.
+_default_rng = np.random.default_rng()
+
+# Acima deste número de cidades, a matriz N×N não é construída: as distâncias
+# são calculadas sob demanda a partir das coordenadas (ver `CoordinateDistances`)
+DENSE_MATRIX_MAX_CITIES = 2000
+
+# Filhos duplicados recusados por geração (em múltiplos do tamanho da população)
+# antes de a população passar a aceitar duplicatas para conseguir se completar
+DUPLICATE_REJECTION_LIMIT = 10
+
+def resolve_rng(rng=None):
+    """Retorna `rng`, ou o gerador padrão do módulo se nenhum foi informado."""
+    return _default_rng if rng is None else rng
+
+def sorted_cut_points(size, rng=None):
+    """Sorteia dois índices distintos em `[0, size)` e os retorna em ordem crescente."""
+    rng = resolve_rng(rng)
+    first = int(rng.integers(size))
+    second = int(rng.integers(size - 1))
+    if second >= first:
+        second += 1
+    return (first, second) if first < second else (second, first)
+
+def canonical_route_key(route):
+    """Gera uma chave única para a rota, independente de rotação e de sentido.
+
+    A rota é girada para começar pela cidade 0 e, se necessário, invertida para
+    que a segunda cidade seja menor que a última. Rotas que descrevem o mesmo
+    ciclo recebem, portanto, a mesma chave.
+    """
+    route = np.asarray(route, dtype=np.int32)
+    n = len(route)
+    start = int(route.argmin())
+    if n > 2 and route[start - 1] < route[(start + 1) % n]:
+        route = route[::-1]
+        start = n - 1 - start
+    return route[start:].tobytes() + route[:start].tobytes()
+
+def distinct_tour_count(n_cities, limit):
+    """Número de ciclos distintos com `n_cities` cidades, (N-1)!/2, saturado em `limit`."""
+    count = 1
+    for factor in range(3, n_cities):
+        count *= factor
+        if count >= limit:
+            return limit
+    return count
+
+class RouteIndex:
+    """Índice por hash das rotas já aceitas, com detecção de duplicatas em O(1).
+
+    Rotas equivalentes (mesmo ciclo com outra cidade inicial ou no sentido
+    inverso) são tratadas como duplicatas. `rejected` conta quantas rotas foram
+    recusadas desde o último `clear()`.
+    """
+
+    def __init__(self):
+        self._keys = set()
+        self.rejected = 0
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, route):
+        return canonical_route_key(route) in self._keys
+
+    def add(self, route):
+        """Registra a rota. Retorna False (e conta a rejeição) se ela já existia."""
+        key = canonical_route_key(route)
+        if key in self._keys:
+            self.rejected += 1
+            return False
+        self._keys.add(key)
+        return True
+
+    def clear(self):
+        self._keys.clear()
+        self.rejected = 0
+
+class Population:
+    """População de rotas guardada em buffers `np.int32` pré-alocados.
+
+    São mantidos dois buffers `(pop_size, n_cities)`: `routes`, com a geração
+    atual, e um buffer de trabalho onde a próxima geração é escrita linha a
+    linha pelos operadores. Ao final da geração os dois são trocados com
+    `swap()`, de modo que nenhuma rota é alocada por filho.
+
+    A unicidade das rotas da próxima geração é controlada por um `RouteIndex`;
+    `rejected_duplicates` guarda quantos filhos foram recusados como duplicatas
+    na última geração construída. Depois de `max_rejections` recusas na mesma
+    geração, duplicatas passam a ser aceitas, para que a geração sempre se
+    complete. Com poucas cidades ((N-1)!/2 ciclos distintos a menos que
+    `pop_size`) não há rotas distintas suficientes, e o limite já começa em 0.
+
+    Cada linha carrega também o comprimento da rota em cache (`lengths`, NaN
+    quando desconhecido). Filhos gerados só por mutação herdam o comprimento
+    do pai somado ao delta da mutação, sem reavaliar a rota inteira.
+    """
+
+    def __init__(self, n_cities, pop_size, max_rejections=None):
+        if max_rejections is None:
+            enough_routes = distinct_tour_count(n_cities, pop_size) >= pop_size
+            max_rejections = DUPLICATE_REJECTION_LIMIT * pop_size if enough_routes else 0
+        self.max_rejections = max_rejections
+        self.routes = np.empty((pop_size, n_cities), dtype=np.int32)
+        self._next_routes = np.empty_like(self.routes)
+        self.lengths = np.full(pop_size, np.nan)
+        self._next_lengths = np.full(pop_size, np.nan)
+        self.n_next = 0
+        self.next_index = RouteIndex()
+        self.rejected_duplicates = 0
+
+    def __len__(self):
+        return len(self.routes)
+
+    def __getitem__(self, index):
+        return self.routes[index]
+
+    def __iter__(self):
+        return iter(self.routes)
+
+    def __array__(self, dtype=None, copy=None):
+        return self.routes if dtype is None else self.routes.astype(dtype)
+
+    def next_row(self):
+        """Retorna a próxima linha livre do buffer de trabalho, para ser escrita no lugar."""
+        return self._next_routes[self.n_next]
+
+    def add(self, individual, length=np.nan):
+        """Copia `individual` (e seu comprimento, se conhecido) para a próxima linha livre e a aceita."""
+        self._next_routes[self.n_next] = individual
+        self._next_lengths[self.n_next] = length
+        self.next_index.add(individual)
+        self.n_next += 1
+
+    def accept_next(self, length=np.nan):
+        """Tenta aceitar a linha retornada por `next_row()` na próxima geração.
+
+        Args:
+            length (float): Comprimento da rota, se já conhecido (NaN força a
+                avaliação completa na próxima geração).
+
+        Returns:
+            bool: False se a rota é equivalente a uma já aceita (a linha é
+            então reaproveitada pelo próximo filho). Esgotado o limite de
+            recusas da geração, a rota é aceita sem consultar o índice.
+        """
+        if (self.next_index.rejected < self.max_rejections
+                and not self.next_index.add(self._next_routes[self.n_next])):
+            return False
+        self._next_lengths[self.n_next] = length
+        self.n_next += 1
+        return True
+
+    def is_next_full(self):
+        return self.n_next >= len(self._next_routes)
+
+    def swap(self):
+        """Torna a geração em construção a geração atual e recicla o buffer antigo."""
+        self.routes, self._next_routes = self._next_routes, self.routes
+        self.lengths, self._next_lengths = self._next_lengths, self.lengths
+        self.n_next = 0
+        self.rejected_duplicates = self.next_index.rejected
+        self.next_index.clear()
+
+def create_initial_population(n_cities, pop_size, rng=None):
+    """Cria a população inicial de rotas aleatórias (todas as permutações sorteadas de uma vez)."""
+    population = Population(n_cities, pop_size)
+    population.routes[:] = np.arange(n_cities, dtype=np.int32)
+    resolve_rng(rng).permuted(population.routes, axis=1, out=population.routes)
     return population
 
 def calculate_distance(city1, city2):
     """Calcula a distância euclidiana entre duas cidades."""
     return np.sqrt((city1[0] - city2[0])**2 + (city1[1] - city2[1])**2)
 
+class DistanceMatrix:
+    """Matriz de distâncias entre todas as cidades, calculada uma única vez.
+
+    A matriz é guardada como um array NumPy float64 contíguo, de forma que o
+    comprimento de uma rota vira uma única leitura vetorizada
+    (``matrix[path, np.roll(path, -1)]``) seguida de uma soma.
+    """
+
+    def __init__(self, cities):
+        coords = np.asarray(cities, dtype=np.float64)
+        diff = coords[:, np.newaxis, :] - coords[np.newaxis, :, :]
+        self.matrix = np.ascontiguousarray(np.sqrt((diff ** 2).sum(axis=-1)))
+        self.n_cities = len(coords)
+        self._neighbor_cache = {}
+
+    @classmethod
+    def from_matrix(cls, matrix):
+        """Cria a DistanceMatrix a partir de uma matriz já calculada (por exemplo, de uma instância TSPLIB).
+
+        A matriz não é copiada: um array mapeado em memória continua compartilhado.
+        """
+        distance_matrix = cls.__new__(cls)
+        distance_matrix.matrix = np.asarray(matrix)
+        distance_matrix.n_cities = len(distance_matrix.matrix)
+        distance_matrix._neighbor_cache = {}
+        return distance_matrix
+
+    def pair_distances(self, cities1, cities2):
+        """Distâncias entre `cities1[i]` e `cities2[i]` (arrays de índices, com broadcasting)."""
+        return self.matrix[cities1, cities2]
+
+    def distance(self, city1, city2):
+        """Distância entre duas cidades."""
+        return float(self.matrix[city1, city2])
+
+    def route_length(self, path):
+        """Calcula o comprimento total (fechado) de uma rota."""
+        path = np.asarray(path, dtype=np.intp)
+        return float(self.matrix[path, np.roll(path, -1)].sum())
+
+    def edge_lengths(self, path, positions):
+        """Soma as arestas `path[i] -> path[i + 1]` (circulares) para cada `i` em `positions`."""
+        n = len(path)
+        return sum(self.matrix[path[i], path[(i + 1) % n]] for i in positions)
+
+    def route_lengths(self, routes):
+        """Calcula o comprimento de várias rotas de uma vez (array `(n_rotas, n_cidades)`)."""
+        routes = np.asarray(routes, dtype=np.intp)
+        return self.matrix[routes, np.roll(routes, -1, axis=1)].sum(axis=1)
+
+    def nearest_neighbors(self, k):
+        """Listas dos `k` vizinhos mais próximos de cada cidade, em ordem crescente de distância.
+
+        Calculadas uma única vez para cada `k`.
+        """
+        if k not in self._neighbor_cache:
+            self._neighbor_cache[k] = nearest_neighbor_lists(self.matrix, k).tolist()
+        return self._neighbor_cache[k]
+
+class CoordinateDistances:
+    """Distâncias calculadas sob demanda a partir das coordenadas, sem matriz N×N.
+
+    Tem a mesma interface de `DistanceMatrix` (exceto o atributo `matrix`) e
+    é usada em instâncias grandes: a memória fica O(N), mais O(N·K) para as
+    listas de vizinhos, que são obtidas por uma grade uniforme
+    (`grid_nearest_neighbors`).
+    """
+
+    # Elementos (rotas × cidades) avaliados por bloco em `route_lengths`
+    ROUTE_BLOCK_SIZE = 1 << 20
+
+    def __init__(self, cities, metric=None):
+        """
+        Args:
+            cities: Coordenadas `(x, y)` das cidades.
+            metric (callable | None): `metric(points1, points2)` vetorizada sobre
+                arrays `(..., 2)` de coordenadas; None usa a distância euclidiana.
+        """
+        self.coords = np.ascontiguousarray(cities, dtype=np.float64)
+        self.n_cities = len(self.coords)
+        self.metric = metric
+        # Lista Python para o caminho escalar (bem mais rápido que indexar o array)
+        self._points = self.coords.tolist()
+        self._neighbor_cache = {}
+
+    def pair_distances(self, cities1, cities2):
+        """Distâncias entre `cities1[i]` e `cities2[i]` (arrays de índices, com broadcasting)."""
+        points1 = self.coords[cities1]
+        points2 = self.coords[cities2]
+        if self.metric is not None:
+            return self.metric(points1, points2)
+        return np.sqrt(((points1 - points2) ** 2).sum(axis=-1))
+
+    def distance(self, city1, city2):
+        """Distância entre duas cidades."""
+        if self.metric is not None:
+            return float(self.pair_distances(city1, city2))
+        x1, y1 = self._points[city1]
+        x2, y2 = self._points[city2]
+        return math.sqrt((x1 - x2) ** 2 + (y1 - y2) ** 2)
+
+    def route_length(self, path):
+        """Calcula o comprimento total (fechado) de uma rota."""
+        path = np.asarray(path, dtype=np.intp)
+        return float(self.pair_distances(path, np.roll(path, -1)).sum())
+
+    def edge_lengths(self, path, positions):
+        """Soma as arestas `path[i] -> path[i + 1]` (circulares) para cada `i` em `positions`."""
+        n = len(path)
+        return sum(self.distance(path[i], path[(i + 1) % n]) for i in positions)
+
+    def route_lengths(self, routes):
+        """Calcula o comprimento de várias rotas, em blocos de linhas para limitar a memória temporária."""
+        routes = np.asarray(routes, dtype=np.intp)
+        lengths = np.empty(len(routes))
+        block = max(1, self.ROUTE_BLOCK_SIZE // max(1, self.n_cities))
+        for start in range(0, len(routes), block):
+            rows = routes[start:start + block]
+            lengths[start:start + block] = self.pair_distances(rows, np.roll(rows, -1, axis=1)).sum(axis=1)
+        return lengths
+
+    def nearest_neighbors(self, k):
+        """Listas dos `k` vizinhos mais próximos de cada cidade (nas coordenadas), calculadas uma vez por `k`."""
+        if k not in self._neighbor_cache:
+            self._neighbor_cache[k] = grid_nearest_neighbors(self.coords, k).tolist()
+        return self._neighbor_cache[k]
+
+def nearest_neighbor_lists(matrix, n_neighbors):
+    """Retorna, para cada cidade, as `n_neighbors` cidades mais próximas em ordem crescente de distância.
+
+    Args:
+        matrix (np.ndarray): Matriz de distâncias `(n_cities, n_cities)`.
+        n_neighbors (int): Tamanho de cada lista de vizinhos.
+
+    Returns:
+        np.ndarray: Array `(n_cities, n_neighbors)` de índices de cidades.
+    """
+    n_cities = len(matrix)
+    n_neighbors = min(n_neighbors, n_cities - 1)
+    # A própria cidade é excluída colocando distância infinita na diagonal
+    distances = matrix.astype(np.float64, copy=True)
+    np.fill_diagonal(distances, np.inf)
+    nearest = np.argpartition(distances, n_neighbors - 1, axis=1)[:, :n_neighbors]
+    order = np.argsort(np.take_along_axis(distances, nearest, axis=1), axis=1, kind='stable')
+    return np.take_along_axis(nearest, order, axis=1)
+
+def grid_nearest_neighbors(coords, k):
+    """K vizinhos mais próximos (euclidianos) de cada ponto, sem nenhuma matriz N×N.
+
+    Os pontos são distribuídos em uma grade uniforme com cerca de `k` pontos
+    por célula. Os vizinhos dos pontos de uma célula são procurados em
+    quadrados de células cada vez maiores ao seu redor, até que o k-ésimo
+    vizinho esteja garantidamente mais perto que qualquer ponto fora do
+    quadrado examinado; o resultado é exato.
+
+    Returns:
+        np.ndarray: Array `(n_points, k)` de índices, em ordem crescente de distância.
+    """
+    coords = np.asarray(coords, dtype=np.float64)
+    n_points = len(coords)
+    k = min(k, n_points - 1)
+    if k <= 0:
+        return np.empty((n_points, 0), dtype=np.intp)
+
+    # 1. Grade: células quadradas com cerca de k pontos cada
+    low = coords.min(axis=0)
+    span = np.maximum(coords.max(axis=0) - low, 1e-12)
+    cell_size = max(np.sqrt(span[0] * span[1] * k / n_points), span.max() * k / n_points)
+    grid_shape = (span // cell_size).astype(np.intp) + 1
+    cells = np.minimum(((coords - low) // cell_size).astype(np.intp), grid_shape - 1)
+    cell_ids = cells[:, 0] * grid_shape[1] + cells[:, 1]
+    order = np.argsort(cell_ids, kind='stable')
+    # starts[c]:starts[c + 1] são as posições (em `order`) dos pontos da célula c
+    starts = np.searchsorted(cell_ids[order], np.arange(grid_shape[0] * grid_shape[1] + 1))
+
+    neighbors = np.empty((n_points, k), dtype=np.intp)
+    for cell_id in np.unique(cell_ids):
+        cell_x, cell_y = divmod(int(cell_id), int(grid_shape[1]))
+        pending = order[starts[cell_id]:starts[cell_id + 1]]
+        radius = 1
+        while pending.size:
+            # 2. Candidatos: pontos do quadrado de (2·radius + 1)² células ao redor
+            x_range = range(max(cell_x - radius, 0), min(cell_x + radius, grid_shape[0] - 1) + 1)
+            y_low = max(cell_y - radius, 0)
+            y_high = min(cell_y + radius, grid_shape[1] - 1)
+            candidates = np.concatenate([order[starts[x * grid_shape[1] + y_low]:starts[x * grid_shape[1] + y_high + 1]]
+                                         for x in x_range])
+            covers_grid = (len(x_range) == grid_shape[0] and y_low == 0 and y_high == grid_shape[1] - 1)
+            if len(candidates) <= k and not covers_grid:
+                radius += 1
+                continue
+
+            diff = coords[pending, np.newaxis, :] - coords[np.newaxis, candidates, :]
+            distances = np.sqrt((diff ** 2).sum(axis=-1))
+            distances[pending[:, np.newaxis] == candidates[np.newaxis, :]] = np.inf
+            nearest = np.argpartition(distances, k - 1, axis=1)[:, :k]
+            nearest_distances = np.take_along_axis(distances, nearest, axis=1)
+
+            # 3. Um ponto fora do quadrado está, no mínimo, à distância da borda mais
+            #    próxima do quadrado (bordas no limite da grade não contam)
+            points = coords[pending] - low
+            bounds = np.full(len(pending), np.inf)
+            if cell_x - radius > 0:
+                bounds = np.minimum(bounds, points[:, 0] - (cell_x - radius) * cell_size)
+            if cell_x + radius < grid_shape[0] - 1:
+                bounds = np.minimum(bounds, (cell_x + radius + 1) * cell_size - points[:, 0])
+            if cell_y - radius > 0:
+                bounds = np.minimum(bounds, points[:, 1] - (cell_y - radius) * cell_size)
+            if cell_y + radius < grid_shape[1] - 1:
+                bounds = np.minimum(bounds, (cell_y + radius + 1) * cell_size - points[:, 1])
+            resolved = nearest_distances.max(axis=1) <= bounds
+
+            ranked = np.argsort(nearest_distances[resolved], axis=1, kind='stable')
+            neighbors[pending[resolved]] = candidates[np.take_along_axis(nearest[resolved], ranked, axis=1)]
+            pending = pending[~resolved]
+            radius += 1
+    return neighbors
+
+# Cache da última matriz construída, indexado pela identidade da lista de cidades
+_distance_matrix_cache = {"cities": None, "matrix": None}
+
+def get_distance_matrix(cities):
+    """Retorna a DistanceMatrix de `cities`, construindo-a apenas na primeira chamada.
+
+    Com mais de `DENSE_MATRIX_MAX_CITIES` cidades, retorna uma
+    `CoordinateDistances` no lugar. Aceita também uma DistanceMatrix (ou
+    CoordinateDistances) já pronta, que é devolvida sem alterações.
+    """
+    if isinstance(cities, (DistanceMatrix, CoordinateDistances)):
+        return cities
+    if _distance_matrix_cache["cities"] is not cities:
+        _distance_matrix_cache["cities"] = cities
+        if len(cities) > DENSE_MATRIX_MAX_CITIES:
+            _distance_matrix_cache["matrix"] = CoordinateDistances(cities)
+        else:
+            _distance_matrix_cache["matrix"] = DistanceMatrix(cities)
+    return _distance_matrix_cache["matrix"]
+
+def register_distance_matrix(cities, distance_matrix):
+    """Faz `get_distance_matrix(cities)` devolver `distance_matrix` em vez de calculá-la.
+
+    Usado quando as distâncias não são euclidianas nas coordenadas desenhadas
+    (instâncias TSPLIB em coordenadas de tela, métricas ATT ou GEO).
+    """
+    _distance_matrix_cache["cities"] = cities
+    _distance_matrix_cache["matrix"] = distance_matrix
+
 def calculate_total_distance(path, cities):
     """Calcula o comprimento total de uma rota."""
-    distance = 0
-    for i in range(len(path)):
-        city1_index = path[i]
-        city2_index = path[(i + 1) % len(path)]
-        distance += calculate_distance(cities[city1_index], cities[city2_index])
-    return distance
+    return get_distance_matrix(cities).route_length(path)
 
 def calculate_fitness(path, cities):
     """Calcula a aptidão de uma rota (inverso da distância total)."""
     distance = calculate_total_distance(path, cities)
     return 1 / (distance + 1e-10)
 
-def order_crossover(parent1, parent2):
-    """Realiza o crossover de ordem."""
+def evaluate_population(population, cities):
+    """Avalia a população inteira em uma única passada vetorizada.
+
+    Para uma `Population`, apenas as rotas sem comprimento em cache são
+    avaliadas, e o cache é atualizado.
+
+    Args:
+        population: `Population` ou rotas da população, como array
+            `(pop_size, n_cities)` de inteiros (ou sequência convertível para ele).
+        cities: Lista de cidades ou DistanceMatrix já construída.
+
+    Returns:
+        tuple: `(distances, fitnesses)`, dois arrays float64 de tamanho `pop_size`.
+    """
+    distance_matrix = get_distance_matrix(cities)
+    if isinstance(population, Population):
+        stale = np.isnan(population.lengths)
+        if stale.any():
+            population.lengths[stale] = distance_matrix.route_lengths(population.routes[stale])
+        distances = population.lengths.copy()
+    else:
+        distances = distance_matrix.route_lengths(population)
+    fitnesses = 1 / (distances + 1e-10)
+    return distances, fitnesses
+
+def order_crossover(parent1, parent2, out=None, rng=None):
+    """Realiza o crossover de ordem (OX1) em O(N).
+
+    Um vetor booleano indexado pela cidade marca os genes já copiados de
+    `parent1`, de forma que o teste de pertinência custa O(1) por gene. Os genes
+    restantes de `parent2` ocupam as posições livres da esquerda para a direita.
+
+    Se `out` (por exemplo, `Population.next_row()`) for informado, o filho é
+    escrito diretamente nele; caso contrário, é retornado como uma nova lista.
+    """
     size = len(parent1)
-    start, end = sorted(random.sample(range(size), 2))
+    start, end = sorted_cut_points(size, rng)
+    
+    parent1 = np.asarray(parent1)
+    parent2 = np.asarray(parent2)
     
-    child = [-1] * size
+    in_child = np.zeros(size, dtype=bool)
+    in_child[parent1[start:end+1]] = True
+    remaining = parent2[~in_child[parent2]]
+    
+    child = np.empty(size, dtype=np.int32) if out is None else out
+    child[:start] = remaining[:start]
     child[start:end+1] = parent1[start:end+1]
+    child[end+1:] = remaining[start:]
+    
+    return child.tolist() if out is None else child
+
+def order_crossover_batch(parents1, parents2, out=None, rng=None):
+    """Realiza K crossovers de ordem de uma só vez.
+
+    Os K pares de pontos de corte são sorteados em uma única chamada ao
+    gerador, com a mesma distribuição de `order_crossover`.
+
+    Args:
+        parents1, parents2: Arrays `(K, n_cities)` com os pares de pais.
+        out: Array `(K, n_cities)` opcional onde os filhos são escritos
+            (por exemplo, um bloco de linhas do buffer da próxima geração).
+
+    Returns:
+        np.ndarray: Os K filhos.
+    """
+    parents1 = np.asarray(parents1)
+    parents2 = np.asarray(parents2)
+    n_children, size = parents1.shape
+    rng = resolve_rng(rng)
+    first = rng.integers(size, size=n_children)
+    second = rng.integers(size - 1, size=n_children)
+    second += second >= first
+    cuts = np.sort(np.stack([first, second], axis=1), axis=1)
+    
+    # 1. Máscara das posições do segmento herdado de parents1 em cada filho
+    positions = np.arange(size)
+    in_segment = (positions >= cuts[:, :1]) & (positions <= cuts[:, 1:])
     
-    current_index = 0
-    for gene in parent2:
-        if gene not in child:
-            while child[current_index] != -1:
-                current_index = (current_index + 1) % size
-            child[current_index] = gene
-            
-    return child
-
-def swap_mutation(individual, mutation_prob):
+    # 2. Vetor de pertinência por cidade (uma linha por filho)
+    rows = np.arange(n_children)[:, np.newaxis]
+    in_child = np.zeros((n_children, size), dtype=bool)
+    in_child[rows, parents1] = in_segment
+    
+    # 3. A indexação booleana percorre as linhas em ordem, então os genes
+    #    restantes de cada linha de parents2 caem nas posições livres da mesma linha
+    if out is None:
+        out = np.empty((n_children, size), dtype=np.int32)
+    out[in_segment] = parents1[in_segment]
+    out[~in_segment] = parents2[~in_child[rows, parents2]]
+    return out
+
+def greedy_crossover(parent1, parent2, distances, out=None, rng=None, n_candidates=8):
+    """Crossover guloso restrito a arestas candidatas, em O(N·K).
+
+    Partindo de uma cidade sorteada, o filho segue a mais curta das arestas que
+    os pais usam a partir da cidade atual (o sucessor em `parent1` e em
+    `parent2`). Se as duas levam a cidades já visitadas, usa a cidade livre
+    mais próxima da lista de vizinhos; só se todas já foram visitadas recorre a
+    uma cidade livre qualquer, em ordem aleatória. Nenhuma matriz N×N é usada.
+
+    Args:
+        parent1, parent2: Rotas dos pais.
+        distances (DistanceMatrix | CoordinateDistances): Distâncias e listas de vizinhos.
+        out: Linha opcional (por exemplo, `Population.next_row()`) onde o filho é escrito.
+        rng (np.random.Generator | None): Gerador de números aleatórios.
+        n_candidates (int): Tamanho da lista de vizinhos consultada.
+
+    Returns:
+        O filho (`out`, ou uma nova lista se `out` não for informado).
+    """
+    rng = resolve_rng(rng)
+    parent1 = np.asarray(parent1)
+    parent2 = np.asarray(parent2)
+    n = len(parent1)
+    successor1 = np.empty(n, dtype=np.intp)
+    successor1[parent1] = np.roll(parent1, -1)
+    successor2 = np.empty(n, dtype=np.intp)
+    successor2[parent2] = np.roll(parent2, -1)
+    successor1 = successor1.tolist()
+    successor2 = successor2.tolist()
+    neighbors = distances.nearest_neighbors(n_candidates)
+    distance = distances.distance
+    fallback = rng.permutation(n).tolist()
+    fallback_position = 0
+
+    visited = bytearray(n)
+    current = int(parent1[rng.integers(n)])
+    visited[current] = 1
+    tour = [current]
+    for _ in range(n - 1):
+        next_city = -1
+        best_distance = math.inf
+        for city in (successor1[current], successor2[current]):
+            if not visited[city]:
+                city_distance = distance(current, city)
+                if city_distance < best_distance:
+                    next_city, best_distance = city, city_distance
+        if next_city < 0:
+            for city in neighbors[current]:
+                if not visited[city]:
+                    next_city = city
+                    break
+        if next_city < 0:
+            while visited[fallback[fallback_position]]:
+                fallback_position += 1
+            next_city = fallback[fallback_position]
+        visited[next_city] = 1
+        tour.append(next_city)
+        current = next_city
+
+    if out is None:
+        return tour
+    out[:] = tour
+    return out
+
+def swap_mutation(individual, mutation_prob, rng=None):
     """Aplica mutação por troca de genes."""
+    rng = resolve_rng(rng)
     mutated_individual = list(individual)
-    if random.random() < mutation_prob:
-        idx1, idx2 = random.sample(range(len(mutated_individual)), 2)
+    if rng.random() < mutation_prob:
+        idx1, idx2 = sorted_cut_points(len(mutated_individual), rng)
         mutated_individual[idx1], mutated_individual[idx2] = mutated_individual[idx2], mutated_individual[idx1]
     return tuple(mutated_individual)
 
+def swap_mutation_inplace(individual, mutation_prob, cities, rng=None):
+    """Aplica a mutação por troca diretamente sobre a linha `individual` (array NumPy).
+
+    Returns:
+        tuple: `(individual, delta)`, onde `delta` é a variação do comprimento da
+        rota, calculada em O(1) apenas sobre as (até 4) arestas alteradas.
+    """
+    rng = resolve_rng(rng)
+    if rng.random() < mutation_prob:
+        idx1, idx2 = sorted_cut_points(len(individual), rng)
+        distance_matrix = get_distance_matrix(cities)
+        n = len(individual)
+        changed_edges = {index % n for index in (idx1 - 1, idx1, idx2 - 1, idx2)}
+        before = distance_matrix.edge_lengths(individual, changed_edges)
+        individual[idx1], individual[idx2] = individual[idx2], individual[idx1]
+        return individual, float(distance_matrix.edge_lengths(individual, changed_edges) - before)
+    return individual, 0.0
+
+def _check_tournament_size(n_individuals, k):
+    if k > n_individuals:
+        raise ValueError(f"Torneio com {k} participantes em uma população de {n_individuals} indivíduos")
+
 # Adicione esta função auxiliar dentro de run_simulation():
-def select_parent_by_tournament(population, population_fitness, k):
-    """Seleciona um pai usando o método de Seleção por Torneio (k participantes)."""
-    
-    # 1. Seleciona K índices aleatórios de toda a população
-    participants_indices = random.sample(range(len(population)), k)
+def select_parent_index_by_tournament(population_fitness, k, rng=None):
+    """Retorna o índice do vencedor de um Torneio com k participantes.
+
+    Raises:
+        ValueError: Se k for maior que a população.
+    """
     
-    best_fitness_found = -1 # Fitness é sempre positivo (inverso da distância)
-    winner_index = -1
+    # 1. Seleciona K índices aleatórios (distintos) de toda a população.
+    #    Sorteios com repetição são descartados e refeitos: o resultado segue a
+    #    mesma distribuição de uma amostra sem reposição, mas custa bem menos
+    #    que `rng.choice(..., replace=False)` quando k é pequeno.
+    rng = resolve_rng(rng)
+    n_individuals = len(population_fitness)
+    _check_tournament_size(n_individuals, k)
+    if k * k > n_individuals:
+        # Torneio grande em relação à população: a rejeição quase sempre falharia
+        participants_indices = rng.choice(n_individuals, k, replace=False)
+    else:
+        participants_indices = rng.integers(n_individuals, size=k)
+        while len(set(participants_indices.tolist())) < k:
+            participants_indices = rng.integers(n_individuals, size=k)
     
     # 2. Encontra o vencedor (o indivíduo com o maior fitness)
-    for index in participants_indices:
-        current_fitness = population_fitness[index]
-        if current_fitness > best_fitness_found:
-            best_fitness_found = current_fitness
-            winner_index = index
-            
+    participants_fitness = np.asarray(population_fitness)[participants_indices]
+    return int(participants_indices[np.argmax(participants_fitness)])
+
+def select_parent_by_tournament(population, population_fitness, k, rng=None):
+    """Seleciona um pai usando o método de Seleção por Torneio (k participantes)."""
     # Retorna o indivíduo (rota) vencedor
-    return population[winner_index]
+    return population[select_parent_index_by_tournament(population_fitness, k, rng)]
+
+SELECTION_METHODS = ("tournament", "truncation", "proportional")
+
+def _tournament_contestants(n_individuals, n_parents, k, rng):
+    """Sorteia uma matriz `(n_parents, k)` de índices, sem repetição dentro de cada linha."""
+    _check_tournament_size(n_individuals, k)
+    if k * k > n_individuals:
+        # Torneios grandes em relação à população: a rejeição quase sempre falharia
+        return np.argsort(rng.random((n_parents, n_individuals)), axis=1)[:, :k]
+    contestants = rng.integers(n_individuals, size=(n_parents, k))
+    # Linhas com índices repetidos são sorteadas de novo (mesma distribuição de
+    # uma amostra sem reposição); só as linhas rejeitadas são verificadas outra vez
+    rows = np.arange(n_parents)
+    while rows.size and k > 1:
+        ordered = np.sort(contestants[rows], axis=1)
+        rows = rows[(ordered[:, 1:] == ordered[:, :-1]).any(axis=1)]
+        contestants[rows] = rng.integers(n_individuals, size=(rows.size, k))
+    return contestants
+
+def select_parent_indices(population_fitness, n_parents, method="tournament", tournament_size=3,
+                          truncation_fraction=0.5, rng=None):
+    """Seleciona de uma só vez os índices de `n_parents` pais.
+
+    Args:
+        population_fitness (np.ndarray): Fitness de cada indivíduo (maior é melhor).
+        n_parents (int): Quantidade de índices a sortear.
+        method (str): "tournament" (vencedor de `tournament_size` participantes
+            distintos), "truncation" (sorteio uniforme entre a fração
+            `truncation_fraction` dos melhores) ou "proportional" (roleta,
+            probabilidade proporcional ao fitness).
+        tournament_size (int): Participantes de cada torneio.
+        truncation_fraction (float): Fração da população elegível na truncagem.
+        rng (np.random.Generator | None): Gerador de números aleatórios.
+
+    Returns:
+        np.ndarray: Array `(n_parents,)` de índices da população.
+    """
+    rng = resolve_rng(rng)
+    population_fitness = np.asarray(population_fitness, dtype=np.float64)
+    n_individuals = len(population_fitness)
+
+    if method == "tournament":
+        k = max(1, min(tournament_size, n_individuals))
+        contestants = _tournament_contestants(n_individuals, n_parents, k, rng)
+        # O vencedor de cada linha é o participante de maior fitness
+        winners = np.argmax(population_fitness[contestants], axis=1)
+        return contestants[np.arange(n_parents), winners]
+
+    if method == "truncation":
+        pool_size = max(1, int(n_individuals * truncation_fraction))
+        pool = np.argsort(-population_fitness, kind='stable')[:pool_size]
+        return pool[rng.integers(pool_size, size=n_parents)]
+
+    if method == "proportional":
+        if np.any(population_fitness < 0):
+            raise ValueError("A seleção proporcional exige fitness não negativo")
+        cumulative = np.cumsum(population_fitness)
+        draws = rng.random(n_parents) * cumulative[-1]
+        return np.minimum(np.searchsorted(cumulative, draws, side='right'), n_individuals - 1)
+
+    raise ValueError(f"Método de seleção desconhecido: {method!r}")
+
+def iter_parent_pairs(population_fitness, method="tournament", tournament_size=3,
+                      truncation_fraction=0.5, batch_size=None, rng=None):
+    """Gera pares `(parent1_index, parent2_index)` indefinidamente.
+
+    Os índices são sorteados em lotes de `batch_size` pares com
+    `select_parent_indices`; um novo lote só é sorteado quando o anterior acaba
+    (por exemplo, quando filhos duplicados são rejeitados).
+    """
+    batch_size = batch_size or len(population_fitness)
+    while True:
+        parents = select_parent_indices(population_fitness, 2 * batch_size, method, tournament_size,
+                                        truncation_fraction, rng)
+        yield from parents.reshape(-1, 2).tolist()
 
 # ...
 # O resto do seu código run_simulation
@@ -1,15 +1,19 @@
 # main.py
 
+import argparse
 import itertools
-import pygame
+import json
 import sys
-import matplotlib.pyplot as plt
-import random
+import threading
+import time
 import numpy as np
 
 # Importar as funções dos módulos
-from ga_logic import create_initial_population, calculate_fitness, calculate_total_distance, order_crossover, swap_mutation
-from visualization import setup_pygame_display, draw_all_elements, update_performance_plots_at_end
+from ga_logic import register_distance_matrix, resolve_rng, create_initial_population, evaluate_population, get_distance_matrix, order_crossover, swap_mutation_inplace, iter_parent_pairs, SELECTION_METHODS
+from early_stopping import build_early_stopping
+from tsplib import load_instance
+from seeding import seed_population, SEEDING_METHODS
+from profiling import NullProfiler, build_profiler
 
 # --- Parâmetros ---
 WIDTH, HEIGHT = 1200, 1000
@@ -20,83 +24,253 @@ MUTATION_PROBABILITY = 0.1
 CROSSOVER_PROBABILITY = 0.95
 CONVERGENCE_GENERATIONS = 100
 TSP_DISPLAY_OFFSET = 60
-TOURNAMENT_SIZE = 5 
-def run_simulation():
-    # Inicialização
-    screen, clock = setup_pygame_display(WIDTH, HEIGHT)
-    cities_locations = [(random.randint(TSP_DISPLAY_OFFSET, WIDTH - TSP_DISPLAY_OFFSET),
-                         random.randint(TSP_DISPLAY_OFFSET, HEIGHT - TSP_DISPLAY_OFFSET))
-                        for _ in range(N_CITIES)]
-    
-    population = create_initial_population(N_CITIES, POPULATION_SIZE)
+TOURNAMENT_SIZE = 5
+SELECTION_METHOD = "truncation"     # "tournament", "truncation" ou "proportional"
+TRUNCATION_FRACTION = 0.5           # Fração dos melhores elegível como pai na truncagem
+# Fração da população inicial construída por heurísticas (0 = só rotas aleatórias). As rotas
+# semeadas dão rotas bem melhores logo no início, mas seus descendentes quase idênticos geram mais
+# duplicatas recusadas. Na configuração padrão de pvc-torneio (80 cidades, média de 3 sementes),
+# 0.05 roda 29 gerações/s contra 36 com 0 (cerca de 1.25x mais lento) e chega a 7126 de
+# distância na geração 50, contra 12400 sem semeadura.
+SEEDING_FRACTION = 0.05
+SEEDING_NOISE = 0.1                 # Ruído relativo das variantes aleatorizadas das heurísticas
+
+def create_cities(n_cities, rng=None):
+    """Sorteia as coordenadas das cidades dentro da área útil da janela."""
+    coordinates = resolve_rng(rng).integers(TSP_DISPLAY_OFFSET, (WIDTH - TSP_DISPLAY_OFFSET + 1,
+                                                                 HEIGHT - TSP_DISPLAY_OFFSET + 1),
+                                            size=(n_cities, 2))
+    return [tuple(city) for city in coordinates.tolist()]
+
+def run_ga(cities_locations, population_size=POPULATION_SIZE, n_generations=N_GENERATIONS, observer=None,
+           rng=None, selection=SELECTION_METHOD, early_stopping=None, seeding_fraction=SEEDING_FRACTION,
+           profiler=None):
+    """Executa o laço do algoritmo genético, sem nenhuma dependência de exibição.
+
+    Args:
+        cities_locations (list): Coordenadas `(x, y)` das cidades.
+        population_size (int): Número de indivíduos por geração.
+        n_generations (int): Número máximo de gerações.
+        observer (callable | None): Chamado a cada geração como
+            `observer(generation, best_individual, sorted_population, best_distance)`;
+            se retornar False, a execução é interrompida. `sorted_population`
+            contém apenas as melhores rotas, em ordem.
+        rng (np.random.Generator | None): Gerador de toda a aleatoriedade da execução.
+        early_stopping (EarlyStopping | None): Critérios de parada antecipada
+            (ver `early_stopping.py`); o motivo da parada vai em `stop_reason`.
+        selection (str): Estratégia de seleção de pais (ver `select_parent_indices`).
+        seeding_fraction (float): Fração da população inicial construída pelas
+            heurísticas de `seeding.py` (vizinho mais próximo, gulosa e inserção).
+            Os descendentes das rotas semeadas geram mais duplicatas
+            recusadas, o que deixa cada geração um pouco mais lenta.
+        profiler (PhaseProfiler | None): Mede o tempo de cada fase da geração
+            (ver `profiling.py`); o resumo vai em `phase_profile`.
+
+    Returns:
+        dict: Melhor rota, históricos por geração e estatísticas da execução.
+    """
+    rng = resolve_rng(rng)
+    if early_stopping is None:
+        early_stopping = build_early_stopping(patience=CONVERGENCE_GENERATIONS)
+    if profiler is None:
+        profiler = NullProfiler()
+    n_cities = len(cities_locations)
+    population = create_initial_population(n_cities, population_size, rng)
+    seeded_routes = seed_population(population, get_distance_matrix(cities_locations), seeding_fraction,
+                                    SEEDING_METHODS, SEEDING_NOISE, rng)
     
     # Listas para armazenar dados de performance
     best_fitness_history = []
     best_distance_history = []
     avg_distance_history = []
+    rejected_duplicates_history = []
     
     generation = 0
+    stop_reason = "max_generations"
+    start_time = time.perf_counter()
+    early_stopping.start()
     
     # Loop Principal da Simulação
-    running_simulation = True
-    while running_simulation:
-        # Verificação de eventos
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running_simulation = False
-            if event.type == pygame.KEYDOWN and (event.key == pygame.K_q or event.key == pygame.K_ESCAPE):
-                running_simulation = False
-
-        if generation >= N_GENERATIONS:
-            running_simulation = False
-            continue
-        
+    while generation < n_generations:
         generation += 1
+        profiler.start_generation(generation)
 
         # Avaliação da população e verificação de convergência
-        population_fitness = [calculate_fitness(ind, cities_locations) for ind in population]
-        population_distances = [calculate_total_distance(ind, cities_locations) for ind in population]
+        # Uma única avaliação vetorizada, reaproveitada na ordenação, no elitismo e nas estatísticas
+        population_distances, population_fitness = evaluate_population(population, cities_locations)
+        profiler.lap("evaluation")
         
-        sorted_population = sorted(population, key=lambda ind: calculate_fitness(ind, cities_locations), reverse=True)
-        best_individual = sorted_population[0]
+        ranking = np.argsort(-population_fitness, kind='stable')
+        best_individual = population.routes[ranking[0]].copy()
         
-        best_fitness = calculate_fitness(best_individual, cities_locations)
-        best_distance = calculate_total_distance(best_individual, cities_locations)
+        best_fitness = population_fitness[ranking[0]]
+        best_distance = population_distances[ranking[0]]
         avg_distance = np.mean(population_distances)
         
         best_fitness_history.append(best_fitness)
         best_distance_history.append(best_distance)
         avg_distance_history.append(avg_distance)
 
-        if generation > CONVERGENCE_GENERATIONS:
-            if abs(best_distance_history[generation - 1] - best_distance_history[generation - 1 - CONVERGENCE_GENERATIONS]) < 1e-6:
-                print(f"Convergência detectada na Geração {generation}. Parando a simulação.")
-                running_simulation = False
+        if early_stopping.update(generation, best_distance, avg_distance) is not None:
+            stop_reason = early_stopping.stop_reason
+        profiler.lap("sorting")
                     
-        # Atualiza apenas a visualização do Pygame
-        draw_all_elements(screen, best_individual, sorted_population, cities_locations, generation, N_GENERATIONS)
+        # Notifica o observador (por exemplo, a janela do Pygame)
+        if observer is not None:
+            if observer(generation, best_individual, population.routes[ranking[:5]], best_distance) is False:
+                stop_reason = "observer"
+        profiler.lap("drawing")
+        
+        if stop_reason != "max_generations":
+            profiler.end_generation()
+            break
         
         # Próxima Geração
-        next_population = [list(best_individual)]
-        while len(next_population) < POPULATION_SIZE:
-            parent1 = random.choice(sorted_population[:POPULATION_SIZE//2])
-            parent2 = random.choice(sorted_population[:POPULATION_SIZE//2])
-            
-            if random.random() < CROSSOVER_PROBABILITY:
-                child = order_crossover(list(parent1), list(parent2))
+        # Os filhos são escritos diretamente nas linhas do buffer da próxima geração
+        population.add(best_individual, best_distance)
+        # Todos os pais da geração são sorteados em lote
+        parent_pairs = iter_parent_pairs(population_fitness, selection, TOURNAMENT_SIZE, TRUNCATION_FRACTION,
+                                         rng=rng)
+        retry_duplicate = False
+        while not population.is_next_full():
+            child = population.next_row()
+            if retry_duplicate:
+                # A duplicata recusada continua nesta linha: uma mutação forçada (O(1) com o
+                # delta) a diferencia, em vez de refazer seleção e crossover do zero
+                child, delta = swap_mutation_inplace(child, 1.0, cities_locations, rng)
+                child_distance += delta
+                profiler.lap("mutation")
+                retry_duplicate = not population.accept_next(child_distance)
+                profiler.lap("duplicates")
+                continue
+            parent1_index, parent2_index = next(parent_pairs)
+            profiler.lap("selection")
+            if rng.random() < CROSSOVER_PROBABILITY:
+                order_crossover(population[parent1_index], population[parent2_index], out=child, rng=rng)
+                child_distance = np.nan
             else:
-                child = list(random.choice([list(parent1), list(parent2)]))
+                # Clone de um dos pais: o comprimento em cache é reaproveitado
+                parent_index = (parent1_index, parent2_index)[rng.integers(2)]
+                child[:] = population[parent_index]
+                child_distance = population.lengths[parent_index]
+            profiler.lap("crossover")
             
-            child = swap_mutation(tuple(child), MUTATION_PROBABILITY)
+            child, delta = swap_mutation_inplace(child, MUTATION_PROBABILITY, cities_locations, rng)
+            child_distance += delta
+            profiler.lap("mutation")
             
-            if list(child) not in next_population:
-                next_population.append(list(child))
+            # Rotas equivalentes a uma já aceita são recusadas e contadas pelo índice
+            retry_duplicate = not population.accept_next(child_distance)
+            profiler.lap("duplicates")
         
-        population = [tuple(ind) for ind in next_population]
-        clock.tick(60)
+        population.swap()
+        rejected_duplicates_history.append(population.rejected_duplicates)
+        profiler.lap("replacement")
+        profiler.end_generation()
+
+    elapsed = time.perf_counter() - start_time
+    profiler.finish()
+    results = {
+        "n_cities": n_cities,
+        "population_size": population_size,
+        "generations": generation,
+        "stop_reason": stop_reason,
+        "stop_message": early_stopping.message,
+        "seeded_routes": seeded_routes,
+        "best_distance": float(best_distance),
+        "best_route": best_individual.tolist(),
+        "elapsed_seconds": elapsed,
+        "generations_per_second": generation / elapsed if elapsed > 0 else None,
+        "best_fitness_history": [float(value) for value in best_fitness_history],
+        "best_distance_history": [float(value) for value in best_distance_history],
+        "avg_distance_history": [float(value) for value in avg_distance_history],
+        "rejected_duplicates_history": rejected_duplicates_history,
+    }
+    if profiler.enabled:
+        results["phase_profile"] = profiler.summary()
+    return results
+
+def prepare_run(seed=None, n_cities=N_CITIES, tsplib_path=None):
+    """Cria o gerador e as cidades da execução.
+
+    Com `tsplib_path`, as cidades são as da instância TSPLIB (ajustadas à
+    janela) e as distâncias vêm da matriz da instância, na sua própria métrica.
+
+    Returns:
+        tuple: `(rng, cities_locations, instance)`, com `instance` None sem `tsplib_path`.
+    """
+    rng = np.random.default_rng(seed)
+    if tsplib_path is None:
+        return rng, create_cities(n_cities, rng), None
+    instance = load_instance(tsplib_path)
+    cities_locations = instance.display_coordinates(WIDTH, HEIGHT, TSP_DISPLAY_OFFSET)
+    register_distance_matrix(cities_locations, instance.distance_provider())
+    return rng, cities_locations, instance
+
+def describe_instance(results, instance):
+    """Acrescenta aos resultados o nome da instância TSPLIB e a distância ótima conhecida."""
+    if instance is not None:
+        results["instance"] = instance.name
+        results["optimal_distance"] = instance.optimal_distance
+    return results
+
+def run_headless(seed=None, n_cities=N_CITIES, population_size=POPULATION_SIZE, n_generations=N_GENERATIONS,
+                 selection=SELECTION_METHOD, early_stopping=None, tsplib_path=None,
+                 seeding_fraction=SEEDING_FRACTION, profiler=None):
+    """Executa uma instância completa (cidades + AG) sem abrir nenhuma janela.
+
+    Returns:
+        dict: O resultado de `run_ga`, acrescido da semente e das cidades usadas.
+    """
+    rng, cities_locations, instance = prepare_run(seed, n_cities, tsplib_path)
+    results = run_ga(cities_locations, population_size, n_generations, rng=rng, selection=selection,
+                     early_stopping=early_stopping, seeding_fraction=seeding_fraction,
+                     profiler=profiler)
+    results["seed"] = seed
+    results["cities"] = cities_locations
+    return describe_instance(results, instance)
+
+def run_simulation(seed=None, n_cities=N_CITIES, population_size=POPULATION_SIZE,
+                   n_generations=N_GENERATIONS, fps=60, selection=SELECTION_METHOD, early_stopping=None,
+                   tsplib_path=None, seeding_fraction=SEEDING_FRACTION, profiler=None):
+    """Executa o AG exibindo o progresso na janela do Pygame (limitada a `fps` quadros por segundo)."""
+    import pygame
+    from visualization import (setup_pygame_display, SnapshotQueue, SnapshotPublisher, OptimizerThread,
+                               RouteRenderer, run_render_loop, update_performance_plots_at_end)
+
+    # Inicialização
+    rng, cities_locations, instance = prepare_run(seed, n_cities, tsplib_path)
+    screen, clock = setup_pygame_display(WIDTH, HEIGHT)
+    
+    # O AG roda em outra thread e só publica snapshots; esta thread desenha o mais recente
+    snapshots = SnapshotQueue()
+    stop_event = threading.Event()
+    observer = SnapshotPublisher(snapshots, stop_event)
+    optimizer = OptimizerThread(lambda: run_ga(cities_locations, population_size, n_generations, observer, rng=rng,
+                                               selection=selection, early_stopping=early_stopping,
+                                               seeding_fraction=seeding_fraction, profiler=profiler))
+    optimizer.start()
+    renderer = RouteRenderer(screen, cities_locations, n_generations)
+    run_render_loop(renderer, clock, snapshots, stop_event, optimizer, fps)
+    results = optimizer.join_result()
+    
+    if results["stop_message"] is not None:
+        print(f"Parada antecipada na Geração {results['generations']} ({results['stop_message']}).")
+    if instance is not None and instance.optimal_distance is not None:
+        gap = 100 * (results["best_distance"] / instance.optimal_distance - 1)
+        print(f"{instance.name}: melhor distância {results['best_distance']:.0f}, "
+              f"ótimo {instance.optimal_distance:.0f} ({gap:.2f}% acima)")
+    rejected_duplicates_history = results["rejected_duplicates_history"]
+    if rejected_duplicates_history:
+        print(f"Filhos duplicados rejeitados por geração: média {np.mean(rejected_duplicates_history):.1f}, "
+              f"total {sum(rejected_duplicates_history)}")
+    
+    # Garante que o estado final apareça, mesmo que o último quadro tenha sido pulado
+    renderer.draw(results["generations"], results["best_route"], [results["best_route"]], results["best_distance"])
 
     # **NOVO:** Chamada para a função que plota todos os gráficos de uma vez
-    update_performance_plots_at_end(best_fitness_history, best_distance_history, avg_distance_history)
+    update_performance_plots_at_end(results["best_fitness_history"], results["best_distance_history"],
+                                    results["avg_distance_history"])
 
     # Loop de espera para manter a janela aberta após a simulação
     running_display = True
@@ -108,10 +282,60 @@ def run_simulation():
                 running_display = False
         
         pygame.display.flip()
+        clock.tick(30)
         
     # Finalização
     pygame.quit()
     sys.exit()
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Algoritmo genético para o PCV com parada por convergência.")
+    parser.add_argument("--headless", action="store_true",
+                        help="executa sem janela e escreve os resultados em JSON")
+    parser.add_argument("--seed", type=int, default=None, help="semente do gerador aleatório")
+    parser.add_argument("--cities", type=int, default=N_CITIES, help="número de cidades")
+    parser.add_argument("--population", type=int, default=POPULATION_SIZE, help="tamanho da população")
+    parser.add_argument("--generations", type=int, default=N_GENERATIONS, help="número máximo de gerações")
+    parser.add_argument("--selection", choices=SELECTION_METHODS, default=SELECTION_METHOD,
+                        help="estratégia de seleção de pais")
+    parser.add_argument("--seeding-fraction", type=float, default=SEEDING_FRACTION,
+                        help="fração da população inicial construída por heurísticas (0 desativa); "
+                             "aumenta um pouco as duplicatas recusadas e o tempo por geração")
+    parser.add_argument("--patience", type=int, default=CONVERGENCE_GENERATIONS,
+                        help="gerações sem melhora que encerram a execução")
+    parser.add_argument("--window", type=int, default=None,
+                        help="janela (em gerações) do critério de melhora relativa")
+    parser.add_argument("--min-improvement", type=float, default=None,
+                        help="melhora relativa mínima dentro de --window (ex.: 0.001 = 0,1%%)")
+    parser.add_argument("--time-limit", type=float, default=None, help="tempo máximo de execução em segundos")
+    parser.add_argument("--target", type=float, default=None, help="comprimento de rota alvo")
+    parser.add_argument("--min-diversity", type=float, default=None,
+                        help="para quando (média - melhor) / melhor fica abaixo deste valor")
+    parser.add_argument("--tsplib", help="arquivo .tsp do TSPLIB (substitui as cidades aleatórias)")
+    parser.add_argument("--profile-timeline",
+                        help="grava o tempo de cada fase por geração neste arquivo (.csv ou .json)")
+    parser.add_argument("--profile-window", type=int, nargs=2, metavar=("PRIMEIRA", "ÚLTIMA"),
+                        help="executa estas gerações sob o cProfile")
+    parser.add_argument("--profile-output", default="generations.prof",
+                        help="arquivo pstats gravado com --profile-window")
+    parser.add_argument("--fps", type=int, default=60, help="quadros por segundo da janela (modo gráfico)")
+    parser.add_argument("--output", help="arquivo JSON de saída (padrão: saída padrão)")
+    return parser.parse_args(argv)
+
 if __name__ == '__main__':
-    run_simulation()
\ No newline at end of file
+    args = parse_args()
+    early_stopping = build_early_stopping(args.patience, args.window, args.min_improvement, args.time_limit,
+                                          args.target, args.min_diversity)
+    profiler = build_profiler(args.profile_timeline, args.profile_window, args.profile_output)
+    if args.headless:
+        results = run_headless(args.seed, args.cities, args.population, args.generations, args.selection,
+                               early_stopping, args.tsplib, args.seeding_fraction, profiler)
+        if args.output:
+            with open(args.output, "w") as output_file:
+                json.dump(results, output_file)
+        else:
+            json.dump(results, sys.stdout)
+            print()
+    else:
+        run_simulation(args.seed, args.cities, args.population, args.generations, args.fps, args.selection,
+                       early_stopping, args.tsplib, args.seeding_fraction, profiler)
@@ -0,0 +1,118 @@
+# profiling.py
+
+import cProfile
+import csv
+import json
+import time
+
+# Fases do laço de gerações, na ordem em que aparecem (e nas colunas da linha do tempo)
+PHASES = ("evaluation", "sorting", "drawing", "selection", "crossover", "mutation", "local_search",
+          "duplicates", "replacement")
+
+class NullProfiler:
+    """Perfilador desligado: todos os métodos são vazios, então o custo é só o da chamada."""
+
+    enabled = False
+
+    def start_generation(self, generation):
+        pass
+
+    def lap(self, phase):
+        pass
+
+    def end_generation(self):
+        pass
+
+    def finish(self):
+        pass
+
+class PhaseProfiler:
+    """Mede o tempo de parede e o número de chamadas de cada fase do laço de gerações.
+
+    O laço marca o fim de cada fase com `lap(fase)`: o tempo desde a marca
+    anterior é atribuído à fase. Assim cada marca custa uma leitura do relógio,
+    sem gerenciadores de contexto nem aninhamento. Uso típico::
+
+        profiler.start_generation(generation)
+        ...  # avaliação
+        profiler.lap("evaluation")
+        ...
+        profiler.end_generation()
+
+    Ao fim da execução (`finish()`), a linha do tempo por geração é gravada
+    em `timeline_path`, se informado. Opcionalmente, as gerações de
+    `profile_window` (primeira e última, inclusive) são executadas sob o
+    `cProfile`, e as estatísticas vão para `profile_path` (formato do
+    `pstats`, que o snakeviz ou o flameprof transformam em gráfico de chama).
+    """
+
+    enabled = True
+
+    def __init__(self, timeline_path=None, profile_window=None, profile_path="generations.prof"):
+        self.timeline_path = timeline_path
+        self.profile_window = profile_window
+        self.profile_path = profile_path
+        self.timeline = []
+        self.seconds = dict.fromkeys(PHASES, 0.0)
+        self.calls = dict.fromkeys(PHASES, 0)
+        self._profile = None
+        self._row = None
+
+    def start_generation(self, generation):
+        if self.profile_window is not None and generation == self.profile_window[0]:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        self._row = {"generation": generation, **dict.fromkeys(PHASES, 0.0)}
+        self._start = self._last = time.perf_counter()
+
+    def lap(self, phase):
+        """Atribui a `phase` o tempo decorrido desde a marca anterior."""
+        now = time.perf_counter()
+        elapsed = now - self._last
+        self._row[phase] += elapsed
+        self.seconds[phase] += elapsed
+        self.calls[phase] += 1
+        self._last = now
+
+    def end_generation(self):
+        self._row["total"] = time.perf_counter() - self._start
+        self.timeline.append(self._row)
+        if self._profile is not None and self._row["generation"] >= self.profile_window[1]:
+            self.stop_cprofile()
+
+    def stop_cprofile(self):
+        """Encerra a captura do `cProfile` (se ativa) e grava `profile_path`."""
+        if self._profile is not None:
+            self._profile.disable()
+            self._profile.dump_stats(self.profile_path)
+            self._profile = None
+
+    def finish(self):
+        """Chamado ao fim da execução: fecha a janela do `cProfile` e grava a linha do tempo."""
+        self.stop_cprofile()
+        if self.timeline_path is not None:
+            self.write_timeline(self.timeline_path)
+
+    def summary(self):
+        """Tempo total, número de chamadas e fração do tempo de cada fase."""
+        total = sum(row["total"] for row in self.timeline)
+        return {phase: {"seconds": self.seconds[phase], "calls": self.calls[phase],
+                        "share": self.seconds[phase] / total if total > 0 else 0.0}
+                for phase in PHASES if self.calls[phase]}
+
+    def write_timeline(self, path):
+        """Grava a linha do tempo por geração em CSV ou JSON, conforme a extensão de `path`."""
+        if path.endswith(".json"):
+            with open(path, "w") as timeline_file:
+                json.dump({"timeline": self.timeline, "summary": self.summary()}, timeline_file)
+            return
+        with open(path, "w", newline="") as timeline_file:
+            writer = csv.DictWriter(timeline_file, fieldnames=("generation", "total") + PHASES)
+            writer.writeheader()
+            writer.writerows(self.timeline)
+
+def build_profiler(timeline_path=None, profile_window=None, profile_path="generations.prof"):
+    """Retorna um `PhaseProfiler` se alguma saída foi pedida; caso contrário, um `NullProfiler`."""
+    if timeline_path is None and profile_window is None:
+        return NullProfiler()
+    return PhaseProfiler(timeline_path, profile_window, profile_path)
@@ -0,0 +1,334 @@
+# seeding.py
+
+import numpy as np
+
+from ga_logic import RouteIndex, resolve_rng
+
+# Heurísticas construtivas disponíveis para semear a população inicial
+SEEDING_METHODS = ("nearest_neighbor", "greedy", "insertion")
+
+# Elementos (cidades × arestas) avaliados por bloco quando a inserção precisa varrer a rota inteira
+FAR_BLOCK_SIZE = 1 << 20
+
+def _neighbor_table(distances, n_candidates):
+    """Vizinhos mais próximos de cada cidade e as distâncias correspondentes, como arrays `(N, K)`."""
+    neighbors = np.asarray(distances.nearest_neighbors(n_candidates), dtype=np.intp)
+    cities = np.arange(distances.n_cities)[:, np.newaxis]
+    return neighbors, np.asarray(distances.pair_distances(cities, neighbors), dtype=np.float64)
+
+def _perturb(values, noise, rng):
+    """Multiplica `values` por um ruído uniforme em `[1, 1 + noise)` (variantes aleatorizadas)."""
+    if noise <= 0:
+        return values
+    return values * (1.0 + noise * rng.random(np.shape(values)))
+
+def nearest_neighbor_tours(distances, start_cities, noise=0.0, rng=None, n_candidates=8):
+    """Constrói uma rota do vizinho mais próximo para cada cidade inicial, todas ao mesmo tempo.
+
+    Cada passo avança as S rotas juntas: a próxima cidade é a mais próxima
+    ainda livre na lista de vizinhos da cidade atual, e só as rotas cujos
+    vizinhos já foram todos visitados comparam a cidade atual com todas as
+    cidades livres. O custo é O(N·S·K), mais essas buscas, sem matriz N×N.
+
+    Args:
+        distances (DistanceMatrix | CoordinateDistances): Distâncias e listas de vizinhos.
+        start_cities (array-like): Cidade inicial de cada rota.
+        noise (float): Ruído relativo aplicado às distâncias (0 = heurística pura).
+        rng (np.random.Generator | None): Gerador de números aleatórios.
+        n_candidates (int): Tamanho da lista de vizinhos consultada.
+
+    Returns:
+        np.ndarray: Array `(S, n_cities)` de rotas.
+    """
+    rng = resolve_rng(rng)
+    current = np.asarray(start_cities, dtype=np.intp)
+    n_tours, n_cities = len(current), distances.n_cities
+    neighbors, neighbor_distances = _neighbor_table(distances, n_candidates)
+
+    tours = np.empty((n_tours, n_cities), dtype=np.int32)
+    visited = np.zeros((n_tours, n_cities), dtype=bool)
+    rows = np.arange(n_tours)
+    tours[:, 0] = current
+    visited[rows, current] = True
+    for step in range(1, n_cities):
+        candidates = neighbors[current]
+        candidate_distances = _perturb(neighbor_distances[current], noise, rng)
+        candidate_distances[visited[rows[:, np.newaxis], candidates]] = np.inf
+        choice = candidate_distances.argmin(axis=1)
+        following = candidates[rows, choice]
+
+        # Rotas sem vizinho livre na lista: busca entre todas as cidades ainda livres
+        for row in np.flatnonzero(np.isinf(candidate_distances[rows, choice])).tolist():
+            free = np.flatnonzero(~visited[row])
+            free_distances = _perturb(np.asarray(distances.pair_distances(current[row], free), dtype=np.float64),
+                                      noise, rng)
+            following[row] = free[free_distances.argmin()]
+
+        tours[:, step] = following
+        visited[rows, following] = True
+        current = following
+    return tours
+
+def _join_fragments(fragments, distances, rng):
+    """Liga caminhos disjuntos em uma rota, sempre pelo extremo livre mais próximo do fim atual."""
+    order = rng.permutation(len(fragments))
+    fragments = [fragments[index] for index in order]
+    heads = np.array([fragment[0] for fragment in fragments], dtype=np.intp)
+    tails = np.array([fragment[-1] for fragment in fragments], dtype=np.intp)
+    available = np.ones(len(fragments), dtype=bool)
+    available[0] = False
+    tour = list(fragments[0])
+    for _ in range(len(fragments) - 1):
+        candidates = np.flatnonzero(available)
+        end = tour[-1]
+        to_heads = np.asarray(distances.pair_distances(end, heads[candidates]), dtype=np.float64)
+        to_tails = np.asarray(distances.pair_distances(end, tails[candidates]), dtype=np.float64)
+        best_head, best_tail = int(to_heads.argmin()), int(to_tails.argmin())
+        # Entrando pelo fim, o caminho é percorrido ao contrário
+        if to_tails[best_tail] < to_heads[best_head]:
+            chosen = int(candidates[best_tail])
+            tour.extend(reversed(fragments[chosen]))
+        else:
+            chosen = int(candidates[best_head])
+            tour.extend(fragments[chosen])
+        available[chosen] = False
+    return tour
+
+def greedy_edge_tour(distances, noise=0.0, rng=None, n_candidates=8):
+    """Constrói uma rota pela heurística gulosa de arestas (greedy matching).
+
+    As arestas candidatas (cada cidade com seus `n_candidates` vizinhos) são
+    ordenadas por comprimento e aceitas sempre que nenhuma das pontas já tem
+    grau 2 e a aresta não fecha um ciclo (union-find). Os caminhos resultantes
+    são então ligados pelos extremos mais próximos.
+
+    Args:
+        distances (DistanceMatrix | CoordinateDistances): Distâncias e listas de vizinhos.
+        noise (float): Ruído relativo aplicado aos comprimentos das arestas.
+        rng (np.random.Generator | None): Gerador de números aleatórios.
+        n_candidates (int): Vizinhos considerados por cidade.
+
+    Returns:
+        np.ndarray: A rota, como array `np.int32`.
+    """
+    rng = resolve_rng(rng)
+    n_cities = distances.n_cities
+    neighbors, neighbor_distances = _neighbor_table(distances, n_candidates)
+    weights = _perturb(neighbor_distances, noise, rng).ravel()
+    order = np.argsort(weights, kind='stable')
+    firsts = np.repeat(np.arange(n_cities), neighbors.shape[1])[order].tolist()
+    seconds = neighbors.ravel()[order].tolist()
+
+    degree = [0] * n_cities
+    links = [[] for _ in range(n_cities)]
+    parent = list(range(n_cities))
+
+    def find(city):
+        while parent[city] != city:
+            parent[city] = parent[parent[city]]
+            city = parent[city]
+        return city
+
+    n_edges = 0
+    for city1, city2 in zip(firsts, seconds):
+        if degree[city1] >= 2 or degree[city2] >= 2:
+            continue
+        root1, root2 = find(city1), find(city2)
+        if root1 == root2:
+            continue
+        parent[root1] = root2
+        degree[city1] += 1
+        degree[city2] += 1
+        links[city1].append(city2)
+        links[city2].append(city1)
+        n_edges += 1
+        if n_edges == n_cities - 1:
+            break
+
+    # Percorre cada caminho a partir de um extremo (cidades isoladas são caminhos de uma cidade)
+    fragments = []
+    seen = [False] * n_cities
+    for start in range(n_cities):
+        if seen[start] or degree[start] == 2:
+            continue
+        fragment = [start]
+        seen[start] = True
+        previous, city = -1, start
+        while True:
+            following = [neighbor for neighbor in links[city] if neighbor != previous]
+            if not following:
+                break
+            previous, city = city, following[0]
+            fragment.append(city)
+            seen[city] = True
+        fragments.append(fragment)
+    return np.array(_join_fragments(fragments, distances, rng), dtype=np.int32)
+
+def cheapest_insertion_tour(distances, noise=0.0, rng=None, n_candidates=8):
+    """Constrói uma rota pela inserção mais barata, restrita às listas de vizinhos.
+
+    Partindo de uma cidade sorteada e de seu vizinho mais próximo, insere a
+    cada passo a cidade de menor custo de inserção `d(a, c) + d(c, b) - d(a, b)`.
+    Só as cidades com algum vizinho já na rota são candidatas, e apenas as
+    arestas que tocam esses vizinhos são avaliadas; após cada inserção, só as
+    cidades próximas às arestas alteradas são recalculadas. Cada passo custa,
+    portanto, O(K²), sem matriz N×N. Se nenhuma cidade livre tiver vizinho na
+    rota (grafo de vizinhos desconexo), a próxima é escolhida comparando todas
+    as livres com a rota inteira.
+
+    Args:
+        distances (DistanceMatrix | CoordinateDistances): Distâncias e listas de vizinhos.
+        noise (float): Ruído relativo aplicado aos custos na escolha da cidade inserida.
+        rng (np.random.Generator | None): Gerador de números aleatórios.
+        n_candidates (int): Tamanho da lista de vizinhos consultada.
+
+    Returns:
+        np.ndarray: A rota, como array `np.int32`.
+    """
+    rng = resolve_rng(rng)
+    n_cities = distances.n_cities
+    neighbors = np.asarray(distances.nearest_neighbors(n_candidates), dtype=np.intp)
+    # Listas reversas: reverse[starts[c]:starts[c + 1]] são as cidades que têm c como vizinho
+    owners = np.repeat(np.arange(n_cities), neighbors.shape[1])
+    order = np.argsort(neighbors.ravel(), kind='stable')
+    reverse = owners[order]
+    starts = np.searchsorted(neighbors.ravel()[order], np.arange(n_cities + 1))
+
+    successor = np.full(n_cities, -1, dtype=np.intp)
+    predecessor = np.full(n_cities, -1, dtype=np.intp)
+    in_tour = np.zeros(n_cities, dtype=bool)
+    near_tour = np.zeros(n_cities, dtype=bool)  # Alguma cidade da lista de vizinhos já está na rota
+    # Melhor inserção de cada cidade livre: entre best_after[c] e seu sucessor
+    best_cost = np.full(n_cities, np.inf)
+    best_after = np.zeros(n_cities, dtype=np.intp)
+
+    def insertion_costs(cities, afters):
+        befores = successor[afters]
+        return (np.asarray(distances.pair_distances(afters, cities), dtype=np.float64)
+                + np.asarray(distances.pair_distances(cities, befores), dtype=np.float64)
+                - np.asarray(distances.pair_distances(afters, befores), dtype=np.float64))
+
+    def evaluate_near(cities):
+        # Arestas candidatas: as que saem de cada vizinho na rota e as que chegam nele
+        city_neighbors = neighbors[cities]
+        afters = np.concatenate([city_neighbors, predecessor[city_neighbors]], axis=1)
+        valid = np.tile(in_tour[city_neighbors], 2)
+        costs = np.where(valid, insertion_costs(cities[:, np.newaxis], afters), np.inf)
+        best = costs.argmin(axis=1)
+        best_cost[cities] = costs[np.arange(len(cities)), best]
+        best_after[cities] = afters[np.arange(len(cities)), best]
+
+    def connect_far():
+        # Nenhuma cidade livre tem vizinho na rota (grafo de vizinhos desconexo):
+        # a inserção mais barata entre todas as livres e todas as arestas, em blocos
+        tour_cities = np.flatnonzero(in_tour)
+        far = np.flatnonzero(~in_tour)
+        block = max(1, FAR_BLOCK_SIZE // len(tour_cities))
+        for first in range(0, far.size, block):
+            cities = far[first:first + block]
+            costs = insertion_costs(cities[:, np.newaxis], tour_cities[np.newaxis, :])
+            row, column = np.unravel_index(costs.argmin(), costs.shape)
+            if costs[row, column] < best_cost.min():
+                best_cost[:] = np.inf
+                best_cost[cities[row]] = costs[row, column]
+                best_after[cities[row]] = tour_cities[column]
+
+    def reverse_neighbors(*cities):
+        found = np.concatenate([reverse[starts[city]:starts[city + 1]] for city in cities])
+        return np.unique(found[~in_tour[found]])
+
+    start = int(rng.integers(n_cities))
+    second = int(neighbors[start, 0])
+    successor[start], successor[second] = second, start
+    predecessor[start], predecessor[second] = second, start
+    in_tour[[start, second]] = True
+    near_tour[reverse_neighbors(start, second)] = True
+    evaluate_near(np.flatnonzero(~in_tour & near_tour))
+
+    for _ in range(n_cities - 2):
+        if np.isinf(best_cost).all():
+            connect_far()
+        city = int(_perturb(best_cost, noise, rng).argmin())
+        after = int(best_after[city])
+        before = int(successor[after])
+        successor[after], successor[city] = city, before
+        predecessor[before], predecessor[city] = city, after
+        in_tour[city] = True
+        best_cost[city] = np.inf
+
+        # 1. Cidades que enxergam as arestas alteradas pela lista de vizinhos
+        affected = reverse_neighbors(after, city, before)
+        near_tour[reverse_neighbors(city)] = True
+        if affected.size:
+            evaluate_near(affected)
+
+    tour = np.empty(n_cities, dtype=np.int32)
+    city = start
+    for position in range(n_cities):
+        tour[position] = city
+        city = successor[city]
+    return tour
+
+def seed_routes(distances, n_routes, methods=SEEDING_METHODS, noise=0.1, rng=None, n_candidates=8):
+    """Gera `n_routes` rotas heurísticas, divididas igualmente entre `methods`.
+
+    A primeira rota de cada heurística é a versão pura; as demais são variantes
+    aleatorizadas (outras cidades iniciais e distâncias com ruído `noise`),
+    para manter a diversidade da população.
+
+    Returns:
+        np.ndarray: Array `(n_routes, n_cities)` de rotas.
+    """
+    rng = resolve_rng(rng)
+    for method in methods:
+        if method not in SEEDING_METHODS:
+            raise ValueError(f"Heurística de semeadura desconhecida: {method!r}")
+    n_cities = distances.n_cities
+    counts = [n_routes // len(methods) + (index < n_routes % len(methods)) for index in range(len(methods))]
+
+    routes = []
+    for method, count in zip(methods, counts):
+        if count == 0:
+            continue
+        if method == "nearest_neighbor":
+            starts = rng.choice(n_cities, size=count, replace=count > n_cities)
+            routes.append(nearest_neighbor_tours(distances, starts[:1], 0.0, rng, n_candidates))
+            if count > 1:
+                routes.append(nearest_neighbor_tours(distances, starts[1:], noise, rng, n_candidates))
+        elif method == "greedy":
+            routes.extend(greedy_edge_tour(distances, noise if index else 0.0, rng, n_candidates)[np.newaxis]
+                          for index in range(count))
+        else:
+            routes.extend(cheapest_insertion_tour(distances, noise if index else 0.0, rng, n_candidates)[np.newaxis]
+                          for index in range(count))
+    return np.concatenate(routes) if routes else np.empty((0, n_cities), dtype=np.int32)
+
+def seed_population(population, distances, fraction, methods=SEEDING_METHODS, noise=0.1, rng=None):
+    """Substitui uma fração da população inicial por rotas heurísticas.
+
+    As rotas semeadas ocupam as primeiras linhas de `population`, com seus
+    comprimentos em cache; rotas equivalentes entre si são descartadas e as
+    linhas correspondentes continuam aleatórias.
+
+    Args:
+        population (Population): População inicial (por exemplo, de `create_initial_population`).
+        distances (DistanceMatrix | CoordinateDistances): Distâncias entre as cidades.
+        fraction (float): Fração da população que vem das heurísticas (0 desativa).
+        methods (tuple): Heurísticas usadas (ver `SEEDING_METHODS`).
+        noise (float): Ruído relativo das variantes aleatorizadas.
+        rng (np.random.Generator | None): Gerador de números aleatórios.
+
+    Returns:
+        int: Quantidade de rotas semeadas.
+    """
+    n_routes = min(len(population), int(round(fraction * len(population))))
+    if n_routes <= 0 or population.routes.shape[1] < 3:
+        return 0
+    index = RouteIndex()
+    n_seeded = 0
+    for route in seed_routes(distances, n_routes, methods, noise, rng):
+        if index.add(route):
+            population.routes[n_seeded] = route
+            n_seeded += 1
+    population.lengths[:n_seeded] = distances.route_lengths(population.routes[:n_seeded])
+    return n_seeded
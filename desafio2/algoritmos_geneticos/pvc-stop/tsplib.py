@@ -0,0 +1,270 @@
+# tsplib.py
+
+import hashlib
+import os
+
+import numpy as np
+
+from ga_logic import DENSE_MATRIX_MAX_CITIES, DistanceMatrix, CoordinateDistances
+
+# Formatos de EDGE_WEIGHT_SECTION equivalentes para matrizes simétricas
+_EXPLICIT_FORMAT_ALIASES = {
+    "UPPER_COL": "LOWER_ROW",
+    "LOWER_COL": "UPPER_ROW",
+    "UPPER_DIAG_COL": "LOWER_DIAG_ROW",
+    "LOWER_DIAG_COL": "UPPER_DIAG_ROW",
+}
+
+class TSPInstance:
+    """Instância do PCV lida de um arquivo TSPLIB.
+
+    Attributes:
+        name (str): Nome da instância (campo NAME).
+        dimension (int): Número de cidades.
+        edge_weight_type (str): EUC_2D, CEIL_2D, ATT, GEO ou EXPLICIT.
+        coordinates (np.ndarray | None): Coordenadas `(dimension, 2)` dos nós,
+            ou as de DISPLAY_DATA_SECTION em instâncias explícitas.
+        distances (np.ndarray | None): Matriz de distâncias float64 `(dimension, dimension)`,
+            possivelmente mapeada em memória (somente leitura). None em instâncias
+            com coordenadas e mais de `DENSE_MATRIX_MAX_CITIES` cidades, cujas
+            distâncias são calculadas sob demanda.
+        optimal_tour (np.ndarray | None): Rota ótima (índices a partir de 0), se conhecida.
+    """
+
+    def __init__(self, name, edge_weight_type, coordinates, distances, optimal_tour=None):
+        self.name = name
+        self.edge_weight_type = edge_weight_type
+        self.coordinates = coordinates
+        self.distances = distances
+        self.dimension = len(distances) if distances is not None else len(coordinates)
+        self.optimal_tour = optimal_tour
+        self._distance_provider = None
+
+    def metric(self, points1, points2):
+        """Distâncias na métrica da instância entre arrays `(..., 2)` de coordenadas."""
+        return pair_distances(points1, points2, self.edge_weight_type)
+
+    def distance_provider(self):
+        """`DistanceMatrix` (sobre a matriz em cache) ou `CoordinateDistances` (instâncias grandes)."""
+        if self._distance_provider is None:
+            if self.distances is not None:
+                self._distance_provider = DistanceMatrix.from_matrix(self.distances)
+            else:
+                self._distance_provider = CoordinateDistances(self.coordinates, self.metric)
+        return self._distance_provider
+
+    @property
+    def optimal_distance(self):
+        """Comprimento da rota ótima na métrica da instância (None se desconhecida)."""
+        if self.optimal_tour is None:
+            return None
+        return self.distance_provider().route_length(self.optimal_tour)
+
+    def display_coordinates(self, width, height, margin):
+        """Coordenadas inteiras ajustadas à área `(width, height)` da janela, mantendo a proporção.
+
+        Instâncias explícitas sem DISPLAY_DATA são desenhadas em círculo.
+        """
+        if self.coordinates is None:
+            angles = 2 * np.pi * np.arange(self.dimension) / self.dimension
+            coords = np.column_stack([np.cos(angles), np.sin(angles)])
+        else:
+            coords = np.asarray(self.coordinates, dtype=np.float64)
+        low = coords.min(axis=0)
+        span = np.maximum(coords.max(axis=0) - low, 1e-12)
+        scale = min((width - 2 * margin) / span[0], (height - 2 * margin) / span[1])
+        scaled = margin + (coords - low) * scale
+        return [tuple(city) for city in np.rint(scaled).astype(int).tolist()]
+
+def _read_sections(path):
+    """Separa um arquivo TSPLIB em cabeçalho (`dict`) e seções (`nome -> lista de tokens`)."""
+    header = {}
+    sections = {}
+    current = None
+    with open(path) as tsp_file:
+        for line in tsp_file:
+            line = line.strip()
+            if not line or line == "EOF":
+                continue
+            key = line.split(":", 1)[0].strip().upper()
+            if key.endswith("_SECTION"):
+                current = sections.setdefault(key, [])
+            elif ":" in line and current is None:
+                header[key] = line.split(":", 1)[1].strip()
+            elif current is not None:
+                current.extend(line.split())
+    return header, sections
+
+def _read_header(path):
+    """Lê apenas o cabeçalho (até a primeira seção), sem percorrer os dados."""
+    header = {}
+    with open(path) as tsp_file:
+        for line in tsp_file:
+            line = line.strip()
+            key = line.split(":", 1)[0].strip().upper()
+            if key.endswith("_SECTION") or key == "EOF":
+                break
+            if ":" in line:
+                header[key] = line.split(":", 1)[1].strip()
+    return header
+
+def _nint(values):
+    """Arredondamento do TSPLIB: `(int)(x + 0.5)`."""
+    return np.floor(values + 0.5)
+
+def _geo_radians(coordinates):
+    """Converte coordenadas GEO (graus.minutos) em radianos, como no TSPLIB."""
+    degrees = np.trunc(coordinates)
+    minutes = coordinates - degrees
+    return 3.141592 * (degrees + 5.0 * minutes / 3.0) / 180.0
+
+def pair_distances(points1, points2, edge_weight_type):
+    """Distâncias TSPLIB entre `points1[...]` e `points2[...]` (arrays `(..., 2)`, com broadcasting)."""
+    points1 = np.asarray(points1, dtype=np.float64)
+    points2 = np.asarray(points2, dtype=np.float64)
+    if edge_weight_type == "GEO":
+        latitude1, longitude1 = np.moveaxis(_geo_radians(points1), -1, 0)
+        latitude2, longitude2 = np.moveaxis(_geo_radians(points2), -1, 0)
+        q1 = np.cos(longitude1 - longitude2)
+        q2 = np.cos(latitude1 - latitude2)
+        q3 = np.cos(latitude1 + latitude2)
+        argument = np.clip(0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3), -1.0, 1.0)
+        return np.trunc(6378.388 * np.arccos(argument) + 1.0)
+
+    squared = ((points1 - points2) ** 2).sum(axis=-1)
+    if edge_weight_type == "EUC_2D":
+        return _nint(np.sqrt(squared))
+    if edge_weight_type == "CEIL_2D":
+        return np.ceil(np.sqrt(squared))
+    if edge_weight_type == "ATT":
+        pseudo = np.sqrt(squared / 10.0)
+        rounded = _nint(pseudo)
+        return np.where(rounded < pseudo, rounded + 1, rounded)
+    raise ValueError(f"EDGE_WEIGHT_TYPE não suportado: {edge_weight_type}")
+
+def coordinate_distances(coordinates, edge_weight_type):
+    """Calcula a matriz de distâncias a partir das coordenadas, na métrica do TSPLIB."""
+    coords = np.asarray(coordinates, dtype=np.float64)
+    distances = pair_distances(coords[:, np.newaxis, :], coords[np.newaxis, :, :], edge_weight_type)
+    np.fill_diagonal(distances, 0.0)
+    return distances
+
+def explicit_distances(weights, dimension, edge_weight_format):
+    """Monta a matriz simétrica a partir de EDGE_WEIGHT_SECTION."""
+    weights = np.asarray(weights, dtype=np.float64)
+    edge_weight_format = _EXPLICIT_FORMAT_ALIASES.get(edge_weight_format, edge_weight_format)
+    if edge_weight_format == "FULL_MATRIX":
+        return weights[:dimension * dimension].reshape(dimension, dimension)
+
+    # Os formatos triangulares percorrem a matriz linha a linha
+    if edge_weight_format == "UPPER_ROW":
+        rows, cols = np.triu_indices(dimension, k=1)
+    elif edge_weight_format == "LOWER_ROW":
+        rows, cols = np.tril_indices(dimension, k=-1)
+    elif edge_weight_format == "UPPER_DIAG_ROW":
+        rows, cols = np.triu_indices(dimension)
+    elif edge_weight_format == "LOWER_DIAG_ROW":
+        rows, cols = np.tril_indices(dimension)
+    else:
+        raise ValueError(f"EDGE_WEIGHT_FORMAT não suportado: {edge_weight_format}")
+    distances = np.zeros((dimension, dimension))
+    distances[rows, cols] = weights[:len(rows)]
+    distances[cols, rows] = weights[:len(rows)]
+    return distances
+
+def read_tour(path):
+    """Lê um arquivo `.tour` / `.opt.tour` e devolve a rota com índices a partir de 0."""
+    _, sections = _read_sections(path)
+    nodes = []
+    for token in sections.get("TOUR_SECTION", []):
+        if token == "-1":
+            break
+        nodes.append(int(token) - 1)
+    return np.array(nodes, dtype=np.int32)
+
+def _parse_instance(path, dense=True):
+    """Lê o arquivo `.tsp` e retorna `(header, coordinates, distances)`.
+
+    Com `dense=False`, instâncias com coordenadas não têm a matriz calculada (`distances` é None).
+    """
+    header, sections = _read_sections(path)
+    dimension = int(header["DIMENSION"])
+    edge_weight_type = header.get("EDGE_WEIGHT_TYPE", "EUC_2D").upper()
+
+    coordinates = None
+    coordinate_tokens = sections.get("NODE_COORD_SECTION") or sections.get("DISPLAY_DATA_SECTION")
+    if coordinate_tokens:
+        # Cada nó ocupa três tokens: índice, x, y
+        table = np.asarray(coordinate_tokens, dtype=np.float64).reshape(-1, 3)[:dimension]
+        coordinates = table[np.argsort(table[:, 0], kind='stable'), 1:]
+
+    if edge_weight_type == "EXPLICIT":
+        distances = explicit_distances(sections["EDGE_WEIGHT_SECTION"], dimension,
+                                       header.get("EDGE_WEIGHT_FORMAT", "FULL_MATRIX").upper())
+    elif dense:
+        distances = coordinate_distances(coordinates, edge_weight_type)
+    else:
+        distances = None
+    return header, coordinates, distances
+
+def _save_atomically(path, array):
+    # Vários processos podem criar o mesmo cache ao mesmo tempo: o último rename vence
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    with open(temporary_path, "wb") as cache_file:
+        np.save(cache_file, array)
+    os.replace(temporary_path, path)
+
+def load_instance(path, cache_dir=None, tour_path=None):
+    """Carrega uma instância TSPLIB, usando um cache `.npy` mapeado em memória.
+
+    Na primeira leitura, as coordenadas e a matriz de distâncias são gravadas
+    em `cache_dir` (padrão: pasta `.tsplib_cache` ao lado do arquivo), em
+    arquivos identificados pelo hash do conteúdo do `.tsp`. Os dois arrays
+    devolvidos são sempre esses arquivos mapeados em memória
+    (`np.load(mmap_mode='r')`, somente leitura), então as leituras seguintes
+    começam imediatamente e processos diferentes compartilham as mesmas páginas.
+    Instâncias com coordenadas e mais de `DENSE_MATRIX_MAX_CITIES` cidades
+    guardam só as coordenadas; as distâncias são calculadas sob demanda.
+
+    Args:
+        path (str): Arquivo `.tsp`.
+        cache_dir (str | None): Pasta do cache.
+        tour_path (str | None): Arquivo da rota ótima; por padrão, `<nome>.opt.tour`
+            ao lado do `.tsp`, se existir.
+
+    Returns:
+        TSPInstance: A instância carregada.
+    """
+    with open(path, "rb") as tsp_file:
+        digest = hashlib.sha1(tsp_file.read()).hexdigest()[:16]
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(path)), ".tsplib_cache")
+    stem = os.path.basename(path)
+    if stem.endswith(".tsp"):
+        stem = stem[:-len(".tsp")]
+    prefix = os.path.join(cache_dir, f"{stem}-{digest}")
+    distances_path = f"{prefix}.distances.npy"
+    coordinates_path = f"{prefix}.coordinates.npy"
+
+    header = _read_header(path)
+    edge_weight_type = header.get("EDGE_WEIGHT_TYPE", "EUC_2D").upper()
+    dense = edge_weight_type == "EXPLICIT" or int(header["DIMENSION"]) <= DENSE_MATRIX_MAX_CITIES
+    if os.path.exists(distances_path if dense else coordinates_path):
+        distances = np.load(distances_path, mmap_mode='r') if dense else None
+        coordinates = np.load(coordinates_path, mmap_mode='r') if os.path.exists(coordinates_path) else None
+    else:
+        _, coordinates, distances = _parse_instance(path, dense)
+        os.makedirs(cache_dir, exist_ok=True)
+        if coordinates is not None:
+            _save_atomically(coordinates_path, np.ascontiguousarray(coordinates, dtype=np.float64))
+            coordinates = np.load(coordinates_path, mmap_mode='r')
+        if dense:
+            _save_atomically(distances_path, np.ascontiguousarray(distances, dtype=np.float64))
+            distances = np.load(distances_path, mmap_mode='r')
+
+    if tour_path is None:
+        candidate = os.path.join(os.path.dirname(path), f"{stem}.opt.tour")
+        tour_path = candidate if os.path.exists(candidate) else None
+    optimal_tour = read_tour(tour_path) if tour_path is not None else None
+
+    return TSPInstance(header.get("NAME", stem), edge_weight_type, coordinates, distances, optimal_tour)
@@ -1,8 +1,15 @@
 # visualization.py
 
+import queue
+import random
+import threading
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
 import pygame
 import matplotlib.pyplot as plt
-import random
+
 # --- Cores ---
 RED = (255, 0, 0)
 BLUE = (0, 0, 255)
@@ -10,6 +17,11 @@ GRAY = (128, 128, 128)
 BLACK = (0, 0, 0)
 WHITE = (255, 255, 255)
 
+TOP_ROUTES = 5   # Melhores rotas copiadas em cada snapshot (a primeira é a melhor)
+
+# Estado publicado pelo otimizador a cada geração (cópias, seguras para outra thread)
+Snapshot = namedtuple("Snapshot", ["generation", "best_route", "best_distance", "top_routes"])
+
 def setup_pygame_display(width, height):
     """Inicializa e configura a janela do Pygame."""
     pygame.init()
@@ -19,38 +31,142 @@ def setup_pygame_display(width, height):
     clock = pygame.time.Clock()
     return screen, clock
 
-def draw_all_elements(screen, best_individual, sorted_population, cities, generation, n_generations):
-    """Desenha todos os elementos na tela do Pygame."""
-    screen.fill(WHITE)
-    
-    draw_paths(screen, best_individual, cities, BLUE, 2)
-    
-    num_to_draw = min(5, len(sorted_population))
-    for i in range(1, num_to_draw):
-        if random.random() < 0.3:
-            draw_paths(screen, sorted_population[i], cities, GRAY, 1)
+class SnapshotQueue:
+    """Fila limitada de snapshots entre o otimizador e o laço de desenho.
+
+    Publicar nunca bloqueia: com a fila cheia, o snapshot mais antigo é
+    descartado. O laço de desenho consome só o mais recente (`latest()`).
+    """
+
+    def __init__(self, maxsize=2):
+        self._queue = queue.Queue(maxsize)
+
+    def publish(self, snapshot):
+        while True:
+            try:
+                self._queue.put_nowait(snapshot)
+                return
+            except queue.Full:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def latest(self):
+        """Esvazia a fila e retorna o snapshot mais recente (ou None, se não havia nenhum)."""
+        snapshot = None
+        while True:
+            try:
+                snapshot = self._queue.get_nowait()
+            except queue.Empty:
+                return snapshot
+
+class SnapshotPublisher:
+    """Observador do laço do AG que publica um snapshot por geração, sem desenhar nada.
+
+    Retorna False (interrompendo o AG) depois que `stop_event` é sinalizado,
+    por exemplo quando o usuário fecha a janela.
+    """
+
+    def __init__(self, snapshots, stop_event):
+        self.snapshots = snapshots
+        self.stop_event = stop_event
 
-    for city in cities:
-        pygame.draw.circle(screen, RED, city, 8)
-        
-    draw_text(screen, f"Geração: {generation}/{n_generations}", 10, 10, BLACK)
+    def __call__(self, generation, best_individual, sorted_population, best_distance):
+        # Cópias: a busca local e a troca de buffers ainda alteram as rotas depois deste ponto
+        self.snapshots.publish(Snapshot(generation, np.array(best_individual), float(best_distance),
+                                        np.array(sorted_population[:TOP_ROUTES])))
+        return not self.stop_event.is_set()
 
-    pygame.display.flip()
+class OptimizerThread(threading.Thread):
+    """Executa o otimizador fora da thread principal, que fica com a janela do Pygame."""
+
+    def __init__(self, target):
+        super().__init__(name="optimizer", daemon=True)
+        self._optimize = target
+        self.result = None
+        self.error = None
+
+    def run(self):
+        try:
+            self.result = self._optimize()
+        except BaseException as error:
+            self.error = error
+
+    def join_result(self):
+        """Espera o otimizador terminar e retorna seu resultado (ou repassa sua exceção)."""
+        self.join()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+class RouteRenderer:
+    """Desenha rotas sobre uma camada estática das cidades, construída uma única vez."""
+
+    def __init__(self, screen, cities, n_generations):
+        self.screen = screen
+        self.cities = cities
+        self.n_generations = n_generations
+        self._points = np.asarray(cities)
+        self._city_layer = None
+
+    def _cities_layer(self):
+        # Camada transparente com as cidades, desenhada por cima das rotas
+        if self._city_layer is None or self._city_layer.get_size() != self.screen.get_size():
+            self._city_layer = pygame.Surface(self.screen.get_size(), pygame.SRCALPHA)
+            for city in self.cities:
+                pygame.draw.circle(self._city_layer, RED, city, 8)
+        return self._city_layer
+
+    def draw(self, generation, best_individual, sorted_population, best_distance):
+        """Desenha um quadro com a melhor rota, algumas das seguintes e a distância da melhor."""
+        self.screen.fill(WHITE)
+        draw_paths(self.screen, best_individual, self._points, BLUE, 2)
+
+        num_to_draw = min(TOP_ROUTES, len(sorted_population))
+        for i in range(1, num_to_draw):
+            if random.random() < 0.3:
+                draw_paths(self.screen, sorted_population[i], self._points, GRAY, 1)
+
+        self.screen.blit(self._cities_layer(), (0, 0))
+        draw_text(self.screen, f"Geração: {generation}/{self.n_generations}", 10, 10, BLACK)
+        draw_text(self.screen, f"Distância: {best_distance:.0f}", 10, 40, BLACK)
+        pygame.display.flip()
+
+    def draw_snapshot(self, snapshot):
+        self.draw(snapshot.generation, snapshot.best_route, snapshot.top_routes, snapshot.best_distance)
+
+def run_render_loop(renderer, clock, snapshots, stop_event, optimizer, fps=60):
+    """Laço de desenho da thread principal, até o otimizador terminar.
+
+    A cada quadro (no máximo `fps` por segundo) trata os eventos da janela e
+    desenha apenas o snapshot mais recente; os intermediários são descartados,
+    então o otimizador nunca espera pela tela. Fechar a janela ou teclar Q/ESC
+    sinaliza `stop_event`.
+    """
+    while optimizer.is_alive():
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                stop_event.set()
+            if event.type == pygame.KEYDOWN and (event.key == pygame.K_q or event.key == pygame.K_ESCAPE):
+                stop_event.set()
+        snapshot = snapshots.latest()
+        if snapshot is not None:
+            renderer.draw_snapshot(snapshot)
+        clock.tick(fps)
 
 def draw_paths(screen, path, cities, color, width):
-    """Desenha a rota conectando as cidades."""
-    n = len(path)
-    for i in range(n):
-        city1_index = path[i]
-        city2_index = path[(i + 1) % n]
-        city1 = cities[city1_index]
-        city2 = cities[city2_index]
-        pygame.draw.line(screen, color, city1, city2, width)
-
-def draw_text(screen, text, x, y, color):
-    """Renderiza e exibe texto na tela."""
-    font = pygame.font.Font(None, 36)
-    text_surface = font.render(text, True, color)
+    """Desenha a rota fechada em uma única chamada a `pygame.draw.lines`."""
+    points = np.asarray(cities)[np.asarray(path)].tolist()
+    pygame.draw.lines(screen, color, True, points, width)
+
+@lru_cache(maxsize=None)
+def _font(size):
+    return pygame.font.Font(None, size)
+
+def draw_text(screen, text, x, y, color, size=36):
+    """Renderiza e exibe texto na tela (a fonte é criada uma vez por tamanho)."""
+    text_surface = _font(size).render(text, True, color)
     screen.blit(text_surface, (x, y))
 
 def update_performance_plots_at_end(best_fitness_history, best_distance_history, avg_distance_history):
@@ -0,0 +1,251 @@
+# benchmark.py
+
+import argparse
+import json
+import multiprocessing as mp
+import platform
+import sys
+import time
+import timeit
+
+import numpy as np
+
+from ga_logic import (create_initial_population, get_distance_matrix, calculate_total_distance, evaluate_population,
+                      order_crossover, order_crossover_batch, greedy_crossover, swap_mutation_inplace,
+                      reverse_mutation_inplace)
+from main import prepare_run, run_ga, create_cities
+from early_stopping import build_early_stopping
+from seeding import nearest_neighbor_tours
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+BENCHMARK_VERSION = 1
+BENCHMARK_SEED = 12345
+MICRO_SIZES = (50, 200, 1000, 5000)   # Números de cidades dos micro-benchmarks
+MICRO_MIN_TIME = 0.2                  # Segundos mínimos por medição (ver `timeit.Timer.autorange`)
+MICRO_REPEAT = 5                      # Medições por operador; vale a mais rápida
+BATCH_SIZE = 64                       # Rotas por chamada nos operadores em lote
+REGRESSION_THRESHOLD = 0.10           # Piora relativa tolerada antes de acusar regressão
+
+# Execuções completas em instâncias fixas. A qualidade alvo é `target_ratio`
+# vezes o comprimento da rota do vizinho mais próximo a partir da cidade 0, e
+# a semeadura heurística fica desligada para que o alvo meça o próprio AG.
+END_TO_END_CASES = (
+    {"name": "random-80", "cities": 80, "population": 1000, "generations": 300, "seed": 1,
+     "memetic": False, "crossover": "order", "target_ratio": 1.0},
+    {"name": "random-80-memetic", "cities": 80, "population": 200, "generations": 60, "seed": 1,
+     "memetic": True, "crossover": "order", "target_ratio": 0.95},
+    {"name": "random-1000-greedy", "cities": 1000, "population": 100, "generations": 40, "seed": 2,
+     "memetic": False, "crossover": "greedy", "target_ratio": 1.5},
+)
+
+# Métrica -> sentido da melhora, usado na comparação com a referência
+METRICS = {
+    "ops_per_second": "higher",
+    "generations_per_second": "higher",
+    "time_to_target_seconds": "lower",
+    "peak_rss_mb": "lower",
+}
+
+def micro_operations(n_cities, rng):
+    """Monta os operadores medidos para `n_cities` cidades.
+
+    Returns:
+        list: Tuplas `(nome, função sem argumentos, operações por chamada)`.
+    """
+    cities = create_cities(n_cities, rng)
+    distances = get_distance_matrix(cities)
+    routes = create_initial_population(n_cities, 2 * BATCH_SIZE, rng).routes
+    parents1, parents2 = routes[:BATCH_SIZE], routes[BATCH_SIZE:]
+    parent1, parent2 = parents1[0], parents2[0]
+    child = np.empty(n_cities, dtype=np.int32)
+    children = np.empty_like(parents1)
+    mutant = parent1.copy()
+    return [
+        ("calculate_total_distance", lambda: calculate_total_distance(parent1, cities), 1),
+        ("evaluate_population", lambda: evaluate_population(routes, cities), len(routes)),
+        ("order_crossover", lambda: order_crossover(parent1, parent2, out=child, rng=rng), 1),
+        ("order_crossover_batch", lambda: order_crossover_batch(parents1, parents2, out=children, rng=rng),
+         BATCH_SIZE),
+        ("greedy_crossover", lambda: greedy_crossover(parent1, parent2, distances, out=child, rng=rng), 1),
+        ("swap_mutation", lambda: swap_mutation_inplace(mutant, 1.0, cities, rng), 1),
+        ("reverse_mutation", lambda: reverse_mutation_inplace(mutant, 1.0, cities, rng), 1),
+    ]
+
+def run_micro_benchmarks(sizes=MICRO_SIZES, min_time=MICRO_MIN_TIME, repeat=MICRO_REPEAT, seed=BENCHMARK_SEED):
+    """Mede operações por segundo de cada operador para cada número de cidades.
+
+    Cada medição chama o operador o suficiente para durar `min_time`
+    segundos; das `repeat` medições, vale a mais rápida (a menos afetada por
+    ruído do sistema).
+    """
+    results = []
+    for n_cities in sizes:
+        rng = np.random.default_rng(seed)
+        for name, operation, ops_per_call in micro_operations(n_cities, rng):
+            timer = timeit.Timer(operation)
+            number, _ = timer.autorange()
+            number = max(1, int(number * min_time / 0.2))
+            best = min(timer.repeat(repeat, number))
+            results.append({"name": name, "n_cities": n_cities,
+                            "ops_per_second": number * ops_per_call / best})
+    return results
+
+def _peak_rss_mb():
+    """Memória residente de pico deste processo, em MiB (None se indisponível)."""
+    # No Linux, ru_maxrss sobrevive ao exec e inclui o pico do processo pai no
+    # momento do fork; VmHWM é só do programa atual
+    try:
+        with open("/proc/self/status") as status_file:
+            for line in status_file:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    # ru_maxrss vem em KiB no Linux e em bytes no macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 2**20
+
+def run_end_to_end_case(case):
+    """Executa um caso completo e mede velocidade, tempo até a qualidade alvo e memória de pico.
+
+    Deve rodar em um processo novo (ver `run_end_to_end`), para que a
+    memória de pico seja só a deste caso.
+    """
+    rng, cities_locations, _, _ = prepare_run(case["seed"], case["cities"])
+    distances = get_distance_matrix(cities_locations)
+    reference = distances.route_length(nearest_neighbor_tours(distances, [0])[0])
+    target = case["target_ratio"] * reference
+
+    timestamps = []
+    start_time = time.perf_counter()
+    results = run_ga(cities_locations, case["population"], case["generations"], case["memetic"],
+                     observer=lambda *_: timestamps.append(time.perf_counter()),
+                     early_stopping=build_early_stopping(), rng=rng, crossover=case["crossover"],
+                     seeding_fraction=0.0)
+
+    reached = np.flatnonzero(np.asarray(results["best_distance_history"]) <= target)
+    time_to_target = generations_to_target = None
+    if reached.size:
+        generations_to_target = int(reached[0]) + 1
+        time_to_target = timestamps[reached[0]] - start_time
+    return {
+        "name": case["name"],
+        "n_cities": case["cities"],
+        "case": case,
+        "generations": results["generations"],
+        "generations_per_second": results["generations_per_second"],
+        "target_distance": target,
+        "generations_to_target": generations_to_target,
+        "time_to_target_seconds": time_to_target,
+        "best_distance": results["best_distance"],
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+def run_end_to_end(cases=END_TO_END_CASES):
+    """Executa cada caso em um processo novo e devolve as medições na mesma ordem."""
+    context = mp.get_context("spawn")
+    with context.Pool(processes=1, maxtasksperchild=1) as pool:
+        return pool.map(run_end_to_end_case, cases, chunksize=1)
+
+def run_benchmarks(sizes=MICRO_SIZES, cases=END_TO_END_CASES, micro=True, end_to_end=True,
+                   min_time=MICRO_MIN_TIME, repeat=MICRO_REPEAT):
+    """Executa os benchmarks escolhidos e devolve o relatório (serializável em JSON)."""
+    return {
+        "version": BENCHMARK_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.platform(),
+        "micro": run_micro_benchmarks(sizes, min_time, repeat) if micro else [],
+        "end_to_end": run_end_to_end(cases) if end_to_end else [],
+    }
+
+def compare_reports(report, baseline, threshold=REGRESSION_THRESHOLD):
+    """Compara `report` com `baseline`, medição a medição.
+
+    Só entram as medições presentes nos dois relatórios (e, nas execuções
+    completas, com os mesmos parâmetros do caso). Um alvo que era atingido na
+    referência e deixou de ser também conta como regressão.
+
+    Returns:
+        tuple: `(linhas, regressões)`; cada linha é
+        `(seção, nome, n_cities, métrica, referência, atual, variação relativa)`
+        e `regressões` é a sublista das que pioraram mais que `threshold`.
+    """
+    rows, regressions = [], []
+    for section in ("micro", "end_to_end"):
+        baseline_entries = {(entry["name"], entry["n_cities"]): entry for entry in baseline.get(section, [])}
+        for entry in report.get(section, []):
+            reference = baseline_entries.get((entry["name"], entry["n_cities"]))
+            if reference is None or reference.get("case") != entry.get("case"):
+                continue
+            for metric, direction in METRICS.items():
+                if metric not in entry or reference.get(metric) is None:
+                    continue
+                old, new = reference[metric], entry[metric]
+                if new is None:
+                    change = float("inf")
+                else:
+                    change = (new - old) / old if old else 0.0
+                    if direction == "higher":
+                        change = -change
+                # `change` > 0 sempre significa piora
+                row = (section, entry["name"], entry["n_cities"], metric, old, new, change)
+                rows.append(row)
+                if change > threshold:
+                    regressions.append(row)
+    return rows, regressions
+
+def format_comparison(rows, threshold=REGRESSION_THRESHOLD):
+    """Tabela de texto da comparação, marcando as regressões."""
+    lines = [f"{'medição':<60} {'referência':>12} {'atual':>12} {'piora':>8}"]
+    for section, name, n_cities, metric, old, new, change in rows:
+        label = f"{section}/{name}[{n_cities}] {metric}"
+        new_text = "-" if new is None else f"{new:12.4g}"
+        change_text = "-" if new is None else f"{100 * change:7.1f}%"
+        flag = "  REGRESSÃO" if change > threshold else ""
+        lines.append(f"{label:<60} {old:12.4g} {new_text:>12} {change_text:>8}{flag}")
+    return "\n".join(lines)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks dos operadores e de execuções completas do AG.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(MICRO_SIZES),
+                        help="números de cidades dos micro-benchmarks")
+    parser.add_argument("--quick", action="store_true",
+                        help="medições curtas e casos completos reduzidos (para checagens rápidas)")
+    parser.add_argument("--skip-micro", action="store_true", help="não executa os micro-benchmarks")
+    parser.add_argument("--skip-end-to-end", action="store_true", help="não executa as execuções completas")
+    parser.add_argument("--baseline", help="relatório JSON de referência para comparação")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help="piora relativa tolerada (ex.: 0.1 = 10%%)")
+    parser.add_argument("--output", help="arquivo JSON de saída (padrão: saída padrão)")
+    return parser.parse_args(argv)
+
+if __name__ == '__main__':
+    args = parse_args()
+    min_time, repeat, cases = MICRO_MIN_TIME, MICRO_REPEAT, END_TO_END_CASES
+    if args.quick:
+        min_time, repeat = 0.05, 2
+        cases = [dict(case, generations=max(1, case["generations"] // 5)) for case in cases]
+    report = run_benchmarks(args.sizes, cases, not args.skip_micro, not args.skip_end_to_end, min_time, repeat)
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(report, output_file, indent=1)
+    else:
+        json.dump(report, sys.stdout, indent=1)
+        print()
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+        rows, regressions = compare_reports(report, baseline, args.threshold)
+        print(format_comparison(rows, args.threshold), file=sys.stderr)
+        if regressions:
+            print(f"{len(regressions)} regressão(ões) acima de {100 * args.threshold:.0f}%", file=sys.stderr)
+            sys.exit(1)
@@ -0,0 +1,65 @@
+# checkpoint.py
+
+import json
+import os
+
+import numpy as np
+
+CHECKPOINT_VERSION = 1
+
+def save_checkpoint(path, generation, population, rng, histories, cities_locations, config, elapsed_seconds):
+    """Grava o estado do AG ao fim de uma geração em um arquivo `.npz`.
+
+    O arquivo é escrito em um temporário e depois renomeado, então um
+    checkpoint anterior nunca fica corrompido se a execução for interrompida
+    no meio da gravação.
+
+    Args:
+        path (str): Caminho do arquivo `.npz`.
+        generation (int): Última geração concluída.
+        population (Population): População da próxima geração (rotas e comprimentos em cache).
+        rng (np.random.Generator): Gerador cujo estado será salvo.
+        histories (dict): Históricos por geração (nome -> lista), com `generation` entradas.
+        cities_locations (list): Coordenadas `(x, y)` das cidades.
+        config (dict): Parâmetros da execução (serializáveis em JSON).
+        elapsed_seconds (float): Tempo de execução acumulado.
+    """
+    arrays = {f"history_{name}": np.asarray(values) for name, values in histories.items()}
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "wb") as checkpoint_file:
+        np.savez(checkpoint_file,
+                 version=CHECKPOINT_VERSION,
+                 generation=generation,
+                 routes=population.routes,
+                 lengths=population.lengths,
+                 cities=np.asarray(cities_locations),
+                 elapsed_seconds=elapsed_seconds,
+                 # O estado do PCG64 contém inteiros de 128 bits: vai como JSON
+                 rng_state=json.dumps(rng.bit_generator.state),
+                 config=json.dumps(config),
+                 **arrays)
+    os.replace(temporary_path, path)
+
+def load_checkpoint(path):
+    """Lê um checkpoint gravado por `save_checkpoint`.
+
+    Returns:
+        dict: Estado salvo, com `rng` já restaurado e `cities` como lista de tuplas.
+    """
+    with np.load(path) as data:
+        if int(data["version"]) != CHECKPOINT_VERSION:
+            raise ValueError(f"Versão de checkpoint não suportada: {int(data['version'])}")
+        rng_state = json.loads(str(data["rng_state"]))
+        rng = np.random.Generator(getattr(np.random, rng_state["bit_generator"])())
+        rng.bit_generator.state = rng_state
+        return {
+            "generation": int(data["generation"]),
+            "routes": data["routes"],
+            "lengths": data["lengths"],
+            "cities": [tuple(city) for city in data["cities"].tolist()],
+            "elapsed_seconds": float(data["elapsed_seconds"]),
+            "rng": rng,
+            "config": json.loads(str(data["config"])),
+            "histories": {key[len("history_"):]: data[key].tolist()
+                          for key in data.files if key.startswith("history_")},
+        }
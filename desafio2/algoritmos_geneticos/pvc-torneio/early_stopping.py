@@ -0,0 +1,174 @@
+# early_stopping.py
+
+import time
+from collections import deque
+
+class Patience:
+    """Para quando a melhor distância não melhora por `generations` gerações seguidas."""
+
+    reason = "patience"
+
+    def __init__(self, generations, min_delta=1e-6):
+        self.generations = generations
+        self.min_delta = min_delta
+
+    def start(self, elapsed=0.0):
+        self.best_distance = float('inf')
+        self.stale_generations = 0
+
+    def update(self, generation, best_distance, avg_distance):
+        if best_distance < self.best_distance - self.min_delta:
+            self.best_distance = best_distance
+            self.stale_generations = 0
+        else:
+            self.stale_generations += 1
+        return self.stale_generations >= self.generations
+
+    def describe(self):
+        return f"sem melhora por {self.stale_generations} gerações"
+
+class RelativeImprovement:
+    """Para quando a melhora relativa nas últimas `window` gerações fica abaixo de `threshold`.
+
+    Guarda apenas as últimas `window` melhores distâncias (deque de tamanho
+    fixo), então cada atualização é O(1).
+    """
+
+    reason = "relative_improvement"
+
+    def __init__(self, window, threshold):
+        self.window = window
+        self.threshold = threshold
+
+    def start(self, elapsed=0.0):
+        self.history = deque(maxlen=self.window + 1)
+        self.improvement = None
+
+    def update(self, generation, best_distance, avg_distance):
+        self.history.append(best_distance)
+        if len(self.history) <= self.window:
+            return False
+        oldest = self.history[0]
+        self.improvement = (oldest - best_distance) / oldest if oldest > 0 else 0.0
+        return self.improvement < self.threshold
+
+    def describe(self):
+        return f"melhora de {100 * self.improvement:.3f}% nas últimas {self.window} gerações"
+
+class WallClock:
+    """Para quando a execução ultrapassa `seconds` segundos.
+
+    O `elapsed` de `start()` é o tempo já gasto antes do início da contagem,
+    como o de uma execução continuada de um checkpoint.
+    """
+
+    reason = "time_limit"
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+
+    def start(self, elapsed=0.0):
+        self.elapsed = elapsed
+        self.start_time = time.perf_counter() - elapsed
+
+    def update(self, generation, best_distance, avg_distance):
+        self.elapsed = time.perf_counter() - self.start_time
+        return self.elapsed >= self.seconds
+
+    def describe(self):
+        return f"limite de tempo de {self.seconds:g} s atingido ({self.elapsed:.1f} s)"
+
+class TargetLength:
+    """Para quando a melhor rota atinge o comprimento alvo (por exemplo, o ótimo conhecido)."""
+
+    reason = "target"
+
+    def __init__(self, target, tolerance=0.0):
+        self.target = target
+        self.tolerance = tolerance
+
+    def start(self, elapsed=0.0):
+        self.best_distance = None
+
+    def update(self, generation, best_distance, avg_distance):
+        self.best_distance = best_distance
+        return best_distance <= self.target * (1 + self.tolerance)
+
+    def describe(self):
+        return f"distância {self.best_distance:.2f} dentro do alvo {self.target:.2f}"
+
+class DiversityCollapse:
+    """Para quando a população colapsa em rotas quase idênticas.
+
+    A diversidade é medida pela distância média relativa à melhor,
+    `(avg - best) / best`, que já é calculada a cada geração.
+    """
+
+    reason = "diversity"
+
+    def __init__(self, min_gap):
+        self.min_gap = min_gap
+
+    def start(self, elapsed=0.0):
+        self.gap = None
+
+    def update(self, generation, best_distance, avg_distance):
+        self.gap = (avg_distance - best_distance) / best_distance if best_distance > 0 else 0.0
+        return self.gap < self.min_gap
+
+    def describe(self):
+        return f"média apenas {100 * self.gap:.3f}% acima da melhor rota"
+
+class EarlyStopping:
+    """Combina critérios de parada antecipada; o primeiro que disparar encerra a execução.
+
+    Uso típico::
+
+        early_stopping.start()
+        for generation in ...:
+            if early_stopping.update(generation, best_distance, avg_distance):
+                break
+        print(early_stopping.message)
+    """
+
+    def __init__(self, *policies):
+        self.policies = list(policies)
+        self.stop_reason = None
+        self.stopped_by = None
+
+    def start(self, elapsed=0.0):
+        """Reinicia os critérios; `elapsed` é o tempo já gasto (ao continuar um checkpoint)."""
+        self.stop_reason = None
+        self.stopped_by = None
+        for policy in self.policies:
+            policy.start(elapsed)
+
+    def update(self, generation, best_distance, avg_distance):
+        """Atualiza todos os critérios e retorna o motivo da parada (ou None)."""
+        for policy in self.policies:
+            if policy.update(generation, best_distance, avg_distance) and self.stopped_by is None:
+                self.stopped_by = policy
+                self.stop_reason = policy.reason
+        return self.stop_reason
+
+    @property
+    def message(self):
+        if self.stopped_by is None:
+            return None
+        return f"{self.stop_reason}: {self.stopped_by.describe()}"
+
+def build_early_stopping(patience=None, window=None, min_relative_improvement=None, time_limit=None,
+                         target_length=None, min_diversity=None):
+    """Monta um `EarlyStopping` apenas com os critérios informados (None desativa cada um)."""
+    policies = []
+    if patience is not None:
+        policies.append(Patience(patience))
+    if window is not None and min_relative_improvement is not None:
+        policies.append(RelativeImprovement(window, min_relative_improvement))
+    if time_limit is not None:
+        policies.append(WallClock(time_limit))
+    if target_length is not None:
+        policies.append(TargetLength(target_length))
+    if min_diversity is not None:
+        policies.append(DiversityCollapse(min_diversity))
+    return EarlyStopping(*policies)
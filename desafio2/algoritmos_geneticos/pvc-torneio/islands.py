@@ -0,0 +1,247 @@
+# islands.py
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import sys
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from ga_logic import register_distance_matrix
+from main import (N_CITIES, POPULATION_SIZE, N_GENERATIONS, MEMETIC_MODE,
+                  prepare_run, describe_instance, run_ga)
+from tsplib import load_instance
+
+# --- Parâmetros do modelo de ilhas ---
+N_ISLANDS = os.cpu_count() or 1
+MIGRATION_INTERVAL = 20     # Gerações entre duas migrações
+N_MIGRANTS = 5              # Elites enviadas por ilha a cada migração
+MIGRATION_TOPOLOGY = "ring" # "ring" (anel fixo) ou "random" (deslocamento sorteado a cada migração)
+
+class SharedArray:
+    """Array NumPy guardado em um bloco de `multiprocessing.shared_memory`.
+
+    O processo principal cria o bloco (`create=True`); os trabalhadores se
+    conectam a ele pelo nome, de modo que as rotas trocadas entre as ilhas
+    nunca passam por pickle.
+    """
+
+    def __init__(self, shape, dtype, name=None):
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        size = max(1, int(np.prod(self.shape)) * self.dtype.itemsize)
+        self._shm = shared_memory.SharedMemory(name=name, create=name is None, size=size)
+        self.array = np.ndarray(self.shape, dtype=self.dtype, buffer=self._shm.buf)
+
+    def spec(self):
+        """Descrição serializável usada para reabrir o bloco em outro processo."""
+        return self._shm.name, self.shape, self.dtype.str
+
+    @classmethod
+    def attach(cls, spec):
+        name, shape, dtype = spec
+        return cls(shape, dtype, name=name)
+
+    def close(self):
+        del self.array
+        self._shm.close()
+
+    def unlink(self):
+        self._shm.unlink()
+
+def migration_source(island, n_islands, topology, migration_rng):
+    """Retorna a ilha da qual `island` recebe imigrantes nesta migração.
+
+    Em ambas as topologias cada ilha envia e recebe de exatamente uma outra.
+    No modo "random" o deslocamento é sorteado de `migration_rng`; todos os
+    processos criam esse gerador a partir do mesmo fluxo e o consomem na mesma
+    ordem, portanto chegam à mesma escolha.
+    """
+    if topology == "ring":
+        offset = 1
+    elif topology == "random":
+        offset = int(migration_rng.integers(1, n_islands))
+    else:
+        raise ValueError(f"Topologia de migração desconhecida: {topology!r}")
+    return (island - offset) % n_islands
+
+def _island_worker(island, config, specs, barrier, seed_sequence, migration_seed_sequence):
+    """Executa o AG de uma ilha, trocando elites pela memória compartilhada.
+
+    Cada ilha recebe seu próprio fluxo (`seed_sequence`, derivado com
+    `SeedSequence.spawn`), independente dos fluxos das demais.
+    """
+    rng = np.random.default_rng(seed_sequence)
+    migration_rng = np.random.default_rng(migration_seed_sequence)
+    if config["tsplib"] is not None:
+        # O cache .npy já foi criado pelo processo principal: aqui ele só é mapeado
+        instance = load_instance(config["tsplib"])
+        register_distance_matrix(config["cities"], instance.distance_provider())
+    shared = {key: SharedArray.attach(spec) for key, spec in specs.items()}
+    migrants = shared["migrants"].array
+    migrant_lengths = shared["migrant_lengths"].array
+    n_islands = config["n_islands"]
+    n_migrants = config["n_migrants"]
+
+    def migrate(generation, population):
+        if n_islands == 1 or generation % config["migration_interval"] != 0:
+            return False
+        order = np.argsort(population.lengths, kind='stable')
+
+        # 1. Publica as melhores rotas desta ilha
+        migrants[island] = population.routes[order[:n_migrants]]
+        migrant_lengths[island] = population.lengths[order[:n_migrants]]
+        barrier.wait()
+
+        # 2. Substitui as piores rotas pelas elites da ilha de origem
+        source = migration_source(island, n_islands, config["topology"], migration_rng)
+        worst = order[-n_migrants:]
+        population.routes[worst] = migrants[source]
+        population.lengths[worst] = migrant_lengths[source]
+
+        # 3. Ninguém publica a próxima migração antes de todos terem lido esta
+        barrier.wait()
+        return True
+
+    try:
+        # Sem parada por convergência: todas as ilhas precisam chegar às mesmas barreiras
+        results = run_ga(config["cities"], config["population_size"], config["n_generations"],
+                         config["memetic"], convergence_generations=None, migration=migrate, rng=rng)
+        shared["best_routes"].array[island] = results["best_route"]
+        shared["best_distances"].array[island] = results["best_distance"]
+        shared["best_distance_history"].array[island] = results["best_distance_history"]
+        shared["avg_distance_history"].array[island] = results["avg_distance_history"]
+    finally:
+        for array in shared.values():
+            array.close()
+
+def run_islands(cities_locations, n_islands=N_ISLANDS, population_size=POPULATION_SIZE,
+                n_generations=N_GENERATIONS, migration_interval=MIGRATION_INTERVAL,
+                n_migrants=N_MIGRANTS, topology=MIGRATION_TOPOLOGY, memetic=MEMETIC_MODE, seed=None,
+                tsplib_path=None):
+    """Executa o modelo de ilhas: uma subpopulação por processo, com migração periódica de elites.
+
+    As ilhas avançam em sincronia (barreira a cada `migration_interval`
+    gerações), então o resultado depende apenas de `seed`, e não da ordem em
+    que os processos são escalonados.
+
+    Args:
+        cities_locations (list): Coordenadas `(x, y)` das cidades.
+        n_islands (int): Número de ilhas (processos).
+        population_size (int): Indivíduos por ilha.
+        n_generations (int): Gerações executadas por cada ilha.
+        migration_interval (int): Gerações entre duas migrações.
+        n_migrants (int): Elites enviadas por ilha a cada migração.
+        topology (str): "ring" ou "random".
+        memetic (bool): Aplica a busca local 2-opt / Or-opt em cada ilha.
+        seed (int | None): Semente da execução; os fluxos das ilhas são derivados dela.
+        tsplib_path (str | None): Instância TSPLIB cuja matriz de distâncias as ilhas usam.
+
+    Returns:
+        dict: Melhor rota entre todas as ilhas, históricos e estatísticas.
+    """
+    n_cities = len(cities_locations)
+    n_migrants = min(n_migrants, population_size - 1)
+    # Um fluxo independente por ilha, mais um compartilhado para sortear a migração
+    seed_sequence = np.random.SeedSequence(seed)
+    *island_seed_sequences, migration_seed_sequence = seed_sequence.spawn(n_islands + 1)
+    config = {
+        "cities": cities_locations,
+        "n_islands": n_islands,
+        "population_size": population_size,
+        "n_generations": n_generations,
+        "migration_interval": migration_interval,
+        "n_migrants": n_migrants,
+        "topology": topology,
+        "memetic": memetic,
+        "tsplib": tsplib_path,
+    }
+
+    shared = {
+        "migrants": SharedArray((n_islands, n_migrants, n_cities), np.int32),
+        "migrant_lengths": SharedArray((n_islands, n_migrants), np.float64),
+        "best_routes": SharedArray((n_islands, n_cities), np.int32),
+        "best_distances": SharedArray((n_islands,), np.float64),
+        "best_distance_history": SharedArray((n_islands, n_generations), np.float64),
+        "avg_distance_history": SharedArray((n_islands, n_generations), np.float64),
+    }
+    specs = {key: array.spec() for key, array in shared.items()}
+
+    start_time = time.perf_counter()
+    context = mp.get_context()
+    barrier = context.Barrier(n_islands)
+    workers = [context.Process(target=_island_worker,
+                               args=(island, config, specs, barrier, island_seed_sequences[island],
+                                     migration_seed_sequence))
+               for island in range(n_islands)]
+    try:
+        for worker in workers:
+            worker.start()
+        # Se uma ilha falhar, as demais são liberadas da barreira em vez de travar
+        while any(worker.is_alive() for worker in workers):
+            for worker in workers:
+                worker.join(timeout=0.1)
+                if worker.exitcode not in (None, 0):
+                    barrier.abort()
+        failed = [island for island, worker in enumerate(workers) if worker.exitcode != 0]
+        if failed:
+            raise RuntimeError(f"Ilhas {failed} terminaram com erro")
+        elapsed = time.perf_counter() - start_time
+
+        best_distances = shared["best_distances"].array.copy()
+        best_island = int(np.argmin(best_distances))
+        best_distance_history = shared["best_distance_history"].array
+        return {
+            "n_cities": n_cities,
+            "n_islands": n_islands,
+            "population_size": population_size,
+            "generations": n_generations,
+            "seed": seed_sequence.entropy,
+            "best_distance": float(best_distances[best_island]),
+            "best_route": shared["best_routes"].array[best_island].tolist(),
+            "island_best_distances": best_distances.tolist(),
+            "elapsed_seconds": elapsed,
+            "generations_per_second": n_generations / elapsed if elapsed > 0 else None,
+            "best_distance_history": best_distance_history.min(axis=0).tolist(),
+            "avg_distance_history": shared["avg_distance_history"].array.mean(axis=0).tolist(),
+        }
+    finally:
+        for array in shared.values():
+            array.close()
+            array.unlink()
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Modelo de ilhas do AG para o PCV (um processo por ilha).")
+    parser.add_argument("--seed", type=int, default=None, help="semente do gerador aleatório")
+    parser.add_argument("--cities", type=int, default=N_CITIES, help="número de cidades")
+    parser.add_argument("--islands", type=int, default=N_ISLANDS, help="número de ilhas (processos)")
+    parser.add_argument("--population", type=int, default=POPULATION_SIZE, help="tamanho da população de cada ilha")
+    parser.add_argument("--generations", type=int, default=N_GENERATIONS, help="gerações por ilha")
+    parser.add_argument("--migration-interval", type=int, default=MIGRATION_INTERVAL,
+                        help="gerações entre migrações")
+    parser.add_argument("--migrants", type=int, default=N_MIGRANTS, help="elites enviadas por migração")
+    parser.add_argument("--topology", choices=("ring", "random"), default=MIGRATION_TOPOLOGY,
+                        help="topologia de migração")
+    parser.add_argument("--memetic", action="store_true", default=MEMETIC_MODE,
+                        help="ativa a busca local 2-opt / Or-opt")
+    parser.add_argument("--tsplib", help="arquivo .tsp do TSPLIB (substitui as cidades aleatórias)")
+    parser.add_argument("--output", help="arquivo JSON de saída (padrão: saída padrão)")
+    return parser.parse_args(argv)
+
+if __name__ == '__main__':
+    args = parse_args()
+    _, cities_locations, _, instance = prepare_run(args.seed, args.cities, tsplib_path=args.tsplib)
+    results = run_islands(cities_locations, args.islands, args.population, args.generations,
+                          args.migration_interval, args.migrants, args.topology, args.memetic, args.seed,
+                          args.tsplib)
+    results["cities"] = cities_locations
+    describe_instance(results, instance)
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(results, output_file)
+    else:
+        json.dump(results, sys.stdout)
+        print()
@@ -0,0 +1,224 @@
+# local_search.py
+
+import time
+
+# Até este tamanho a matriz é copiada para listas Python (acesso escalar rápido);
+# acima, N² floats Python custariam memória demais e as linhas NumPy são usadas
+# diretamente, sem cópia
+LIST_MATRIX_MAX_CITIES = 500
+
+class _DistanceRow:
+    """Linha "virtual" da matriz de distâncias: `row[city]` calcula a distância sob demanda."""
+
+    __slots__ = ("_distance", "_city")
+
+    def __init__(self, distance, city):
+        self._distance = distance
+        self._city = city
+
+    def __getitem__(self, other):
+        return self._distance(self._city, other)
+
+class LocalSearch:
+    """Refinamento memético de rotas com movimentos 2-opt e Or-opt.
+
+    Cada movimento candidato é avaliado em O(1) pela variação das arestas
+    trocadas (delta), e apenas cidades presentes na lista de vizinhos mais
+    próximos são consideradas como novas ligações. Com uma
+    `CoordinateDistances` (instâncias grandes), as distâncias são calculadas
+    sob demanda e a memória fica O(N·K). O esforço por geração é
+    limitado por um orçamento de avaliações de movimentos e/ou de tempo.
+
+    Uso típico em cada geração::
+
+        local_search.start_generation()
+        local_search.improve(route)   # rota (array NumPy) alterada no lugar
+    """
+
+    def __init__(self, distance_matrix, n_neighbors=8, max_moves=None, time_budget_ms=None, max_segment_length=3):
+        """
+        Args:
+            distance_matrix (DistanceMatrix | CoordinateDistances): Distâncias das cidades.
+            n_neighbors (int): Tamanho da lista de vizinhos de cada cidade.
+            max_moves (int | None): Avaliações de movimentos permitidas por geração.
+            time_budget_ms (float | None): Tempo (ms) permitido por geração.
+            max_segment_length (int): Maior segmento deslocado pelo Or-opt.
+        """
+        self.n_cities = distance_matrix.n_cities
+        self.neighbors = distance_matrix.nearest_neighbors(n_neighbors)
+        if hasattr(distance_matrix, "matrix"):
+            if self.n_cities <= LIST_MATRIX_MAX_CITIES:
+                # Listas Python são bem mais rápidas que arrays NumPy para acessos escalares
+                self._dist = distance_matrix.matrix.tolist()
+            else:
+                self._dist = list(distance_matrix.matrix)
+        else:
+            self._dist = [_DistanceRow(distance_matrix.distance, city) for city in range(self.n_cities)]
+        self.max_moves = max_moves
+        self.time_budget_ms = time_budget_ms
+        self.max_segment_length = max_segment_length
+        self.moves_evaluated = 0
+        self.moves_applied = 0
+        self._deadline = None
+
+    def start_generation(self):
+        """Reinicia o orçamento de movimentos e de tempo para uma nova geração."""
+        self.moves_evaluated = 0
+        self.moves_applied = 0
+        if self.time_budget_ms is not None:
+            self._deadline = time.perf_counter() + self.time_budget_ms / 1000
+        else:
+            self._deadline = None
+
+    def budget_exhausted(self):
+        if self.max_moves is not None and self.moves_evaluated >= self.max_moves:
+            return True
+        return self._deadline is not None and time.perf_counter() >= self._deadline
+
+    def improve(self, route):
+        """Aplica 2-opt e Or-opt até um ótimo local ou até o fim do orçamento.
+
+        Args:
+            route (np.ndarray): Rota a ser melhorada no lugar.
+
+        Returns:
+            float: Variação do comprimento da rota (zero ou negativa).
+        """
+        if self.n_cities < 5 or self.budget_exhausted():
+            return 0.0
+
+        tour = route.tolist()
+        total_delta = 0.0
+        improved = True
+        while improved and not self.budget_exhausted():
+            delta_2opt = self._two_opt_pass(tour)
+            delta_oropt = self._or_opt_pass(tour)
+            total_delta += delta_2opt + delta_oropt
+            improved = delta_2opt < 0 or delta_oropt < 0
+
+        route[:] = tour
+        return total_delta
+
+    def _two_opt_pass(self, tour):
+        """Uma passada de 2-opt (primeira melhoria) sobre todas as cidades."""
+        dist = self._dist
+        n = len(tour)
+        pos = [0] * n
+        for index, city in enumerate(tour):
+            pos[city] = index
+
+        total_delta = 0.0
+        for a in range(n):
+            if self.budget_exhausted():
+                break
+            # Duas direções: trocar a aresta (a, sucessor) ou (predecessor, a)
+            for step in (1, -1):
+                i = pos[a]
+                b = tour[(i + step) % n]
+                d_ab = dist[a][b]
+                for c in self.neighbors[a]:
+                    d_ac = dist[a][c]
+                    # Vizinhos estão em ordem crescente: nenhum candidato restante melhora a rota
+                    if d_ac >= d_ab:
+                        break
+                    j = pos[c]
+                    d = tour[(j + step) % n]
+                    if c == b or d == a:
+                        continue
+                    self.moves_evaluated += 1
+                    delta = d_ac + dist[b][d] - d_ab - dist[c][d]
+                    if delta < -1e-10:
+                        if step == 1:
+                            self._reverse(tour, pos, i + 1, j)
+                        else:
+                            self._reverse(tour, pos, j, i - 1)
+                        self.moves_applied += 1
+                        total_delta += delta
+                        break
+        return total_delta
+
+    def _or_opt_pass(self, tour):
+        """Uma passada de Or-opt: move segmentos de 1 a `max_segment_length` cidades."""
+        dist = self._dist
+        n = len(tour)
+        pos = [0] * n
+        for index, city in enumerate(tour):
+            pos[city] = index
+
+        total_delta = 0.0
+        for length in range(1, self.max_segment_length + 1):
+            i = 0
+            while i < n:
+                if self.budget_exhausted():
+                    return total_delta
+                segment = [tour[(i + k) % n] for k in range(length)]
+                first, last = segment[0], segment[-1]
+                prev_city = tour[(i - 1) % n]
+                next_city = tour[(i + length) % n]
+                removal_gain = dist[prev_city][first] + dist[last][next_city] - dist[prev_city][next_city]
+
+                best = None
+                for end_city in (first, last):
+                    for c in self.neighbors[end_city]:
+                        if dist[end_city][c] >= removal_gain:
+                            break
+                        if c in segment:
+                            continue
+                        e = tour[(pos[c] + 1) % n]
+                        if e in segment:
+                            continue
+                        self.moves_evaluated += 1
+                        # Inserção entre c e e, mantendo ou invertendo o segmento
+                        insert_forward = dist[c][first] + dist[last][e] - dist[c][e]
+                        insert_reversed = dist[c][last] + dist[first][e] - dist[c][e]
+                        for insert_cost, reverse in ((insert_forward, False), (insert_reversed, True)):
+                            delta = insert_cost - removal_gain
+                            if delta < -1e-10 and (best is None or delta < best[0]):
+                                best = (delta, c, reverse)
+
+                if best is not None:
+                    delta, c, reverse = best
+                    self._move_segment(tour, pos, i, length, c, reverse)
+                    self.moves_applied += 1
+                    total_delta += delta
+                i += 1
+        return total_delta
+
+    @staticmethod
+    def _reverse(tour, pos, start, end):
+        """Inverte `tour[start..end]` (índices circulares) e atualiza `pos`."""
+        n = len(tour)
+        start %= n
+        end %= n
+        length = (end - start) % n + 1
+        for k in range(length // 2):
+            left = (start + k) % n
+            right = (end - k) % n
+            tour[left], tour[right] = tour[right], tour[left]
+            pos[tour[left]] = left
+            pos[tour[right]] = right
+
+    @staticmethod
+    def _move_segment(tour, pos, start, length, c, reverse):
+        """Move `tour[start..start+length-1]` (índices circulares) para logo depois de `c`.
+
+        Só o trecho entre o segmento e `c` é regravado (o mais curto dos dois
+        lados da volta), e `pos` é atualizado apenas nesse trecho.
+        """
+        n = len(tour)
+        moved = [tour[(start + k) % n] for k in range(length)]
+        if reverse:
+            moved.reverse()
+        # Cidades entre o fim do segmento e c (inclusive) e entre o sucessor de c e o início do segmento
+        after = (pos[c] - start) % n - length + 1
+        before = n - length - after
+        if after <= before:
+            first = start
+            new = [tour[(start + length + k) % n] for k in range(after)] + moved
+        else:
+            first = (pos[c] + 1) % n
+            new = moved + [tour[(first + k) % n] for k in range(before)]
+        for k, city in enumerate(new):
+            index = (first + k) % n
+            tour[index] = city
+            pos[city] = index
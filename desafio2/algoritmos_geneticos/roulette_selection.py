@@ -0,0 +1,99 @@
+# roulette_selection.py
+
+import numpy as np
+
+class RouletteWheel:
+    """Seleção proporcional ao peso (roleta), montada uma vez por geração.
+
+    A distribuição acumulada é calculada no construtor; cada sorteio é apenas
+    uma busca binária (`np.searchsorted`), feita de forma vetorizada para
+    todos os pais da geração.
+
+    Uso típico em cada geração::
+
+        wheel = RouletteWheel(1 / np.array(distances))
+        pairs = wheel.sample_pairs(n_children, rng, distinct=True)
+    """
+
+    def __init__(self, weights):
+        """
+        Args:
+            weights (array-like): Peso (não negativo) de cada indivíduo.
+        """
+        weights = np.asarray(weights, dtype=np.float64)
+        if weights.ndim != 1 or len(weights) == 0:
+            raise ValueError("A roleta precisa de um vetor de pesos não vazio")
+        if np.any(weights < 0) or not np.all(np.isfinite(weights)):
+            raise ValueError("Os pesos da roleta devem ser finitos e não negativos")
+        self.cumulative = np.cumsum(weights)
+        self.total = self.cumulative[-1]
+        if self.total <= 0:
+            raise ValueError("A soma dos pesos da roleta deve ser positiva")
+
+    def __len__(self):
+        return len(self.cumulative)
+
+    def _locate(self, points):
+        """Índices dos indivíduos cujas fatias da roleta contêm `points`."""
+        indices = np.searchsorted(self.cumulative, points, side='right')
+        return np.minimum(indices, len(self.cumulative) - 1)
+
+    def sample(self, n, rng):
+        """Sorteia `n` índices independentes (com reposição)."""
+        return self._locate(rng.random(n) * self.total)
+
+    def universal_sample(self, n, rng):
+        """Amostragem universal estocástica (SUS): `n` ponteiros igualmente espaçados.
+
+        Um único número aleatório posiciona todos os ponteiros, então cada
+        indivíduo recebe `floor` ou `ceil` do número esperado de cópias. Os
+        índices são devolvidos embaralhados, prontos para serem pareados.
+        """
+        spacing = self.total / n
+        pointers = rng.uniform(0, spacing) + spacing * np.arange(n)
+        return rng.permutation(self._locate(pointers))
+
+    def sample_pairs(self, n_pairs, rng, distinct=False, method="roulette"):
+        """Sorteia `n_pairs` pares de pais em um único passo vetorizado.
+
+        Args:
+            n_pairs (int): Quantidade de pares.
+            rng (np.random.Generator): Gerador de números aleatórios.
+            distinct (bool): Garante pais diferentes em cada par. Na roleta, o
+                segundo pai é sorteado de novo, o que equivale a
+                `np.random.choice(..., 2, p=..., replace=False)`. Na SUS, os
+                parceiros repetidos são trocados entre pares.
+            method (str): "roulette" ou "sus".
+
+        Returns:
+            np.ndarray: Array `(n_pairs, 2)` de índices.
+        """
+        if method == "roulette":
+            pairs = self.sample(2 * n_pairs, rng).reshape(n_pairs, 2)
+            if distinct and len(self) > 1:
+                repeated = np.flatnonzero(pairs[:, 0] == pairs[:, 1])
+                while repeated.size:
+                    pairs[repeated, 1] = self.sample(repeated.size, rng)
+                    repeated = repeated[pairs[repeated, 0] == pairs[repeated, 1]]
+            return pairs
+
+        if method == "sus":
+            pairs = self.universal_sample(2 * n_pairs, rng).reshape(n_pairs, 2)
+            if distinct and len(self) > 1:
+                # Trocar parceiros preserva o número de cópias de cada indivíduo,
+                # desde que cada troca envolva dois pares diferentes: os parceiros
+                # são sorteados sem reposição entre os pares sem repetição.
+                # Se um indivíduo ocupar mais da metade dos ponteiros, alguns
+                # pares repetidos são inevitáveis e permanecem.
+                for _ in range(8):
+                    repeated = np.flatnonzero(pairs[:, 0] == pairs[:, 1])
+                    candidates = np.setdiff1d(np.arange(n_pairs), repeated)
+                    n_swaps = min(repeated.size, candidates.size)
+                    if n_swaps == 0:
+                        break
+                    repeated = repeated[:n_swaps]
+                    partners = rng.choice(candidates, n_swaps, replace=False)
+                    pairs[repeated, 1], pairs[partners, 1] = pairs[partners, 1], pairs[repeated, 1]
+            return pairs
+
+        raise ValueError(f"Método de seleção proporcional desconhecido: {method!r}")
@@ -0,0 +1,40 @@
+# conftest.py
+
+import importlib
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+PVC_FOLDERS = ("pvc-torneio", "pvc-stop")
+
+def _folder_module_names():
+    return {path.stem for folder in ROOT.iterdir() if folder.is_dir() and folder.name != "tests"
+            for path in folder.glob("*.py")}
+
+def load_modules(folder, *names):
+    """Importa os módulos `names` da pasta `folder` (ex.: "pvc-torneio").
+
+    As pastas são programas independentes com módulos de mesmo nome
+    (`ga_logic`, `main`, ...), então os módulos já carregados de qualquer
+    pasta são descartados antes, e os de `names` são importados juntos, para
+    que compartilhem as mesmas dependências.
+
+    Returns:
+        SimpleNamespace: Um atributo por módulo.
+    """
+    for name in _folder_module_names():
+        sys.modules.pop(name, None)
+    folder_path = str(ROOT / folder)
+    sys.path.insert(0, folder_path)
+    try:
+        return SimpleNamespace(**{name: importlib.import_module(name) for name in names})
+    finally:
+        sys.path.remove(folder_path)
+
+@pytest.fixture(params=PVC_FOLDERS)
+def pvc_folder(request):
+    """Nome de cada pasta pvc-*; os testes que o usam rodam uma vez por pasta."""
+    return request.param
@@ -0,0 +1,92 @@
+# test_adaptive_mutation.py
+
+import numpy as np
+import pytest
+
+from conftest import load_modules
+
+def adaptive_mutation():
+    return load_modules("meu_teste", "adaptive_mutation").adaptive_mutation
+
+def mutate_generation(adaptation, clone, rng):
+    """One `mutate` call on a population of 5 with 2 pairs (4 children)."""
+    children = np.zeros((4, 3))
+    first, second = np.array([0, 2]), np.array([1, 3])
+    fitnesses = np.array([-1.0, -2.0, -3.0, -4.0, -5.0])
+    return adaptation.mutate(children, first, second, np.array(clone)[:, np.newaxis], fitnesses, 0, rng)
+
+@pytest.mark.parametrize("clones_win, factor_sign", [(True, 1), (False, -1)])
+def test_one_fifth_rule_scales_sigmas_by_clone_success(clones_win, factor_sign):
+    module = adaptive_mutation()
+    adaptation = module.SelfAdaptiveMutation(5, 3, -5.0, 5.0, "one_fifth")
+    rng = np.random.default_rng(0)
+    mutate_generation(adaptation, [True, False], rng)
+    before = adaptation.sigmas.copy()
+    # Children 0-1 are clones (parents -1 and -2); children 2-3 come from crossover and always lose,
+    # so they must not drag the rate down
+    clone_fitness = [0.0, 0.0] if clones_win else [-10.0, -10.0]
+    adaptation.update(np.array([0.0, *clone_fitness, -100.0, -100.0]))
+    success_rate = 1.0 if clones_win else 0.0
+    expected = np.clip(before * np.exp((success_rate - 0.2) / module.ONE_FIFTH_DAMPING),
+                       module.MIN_SIGMA, adaptation.max_sigma)
+    np.testing.assert_allclose(adaptation.sigmas, expected)
+    assert np.sign(np.log(adaptation.sigmas[1] / before[1])) == factor_sign
+
+def test_one_fifth_rule_without_clones_judges_all_children():
+    module = adaptive_mutation()
+    adaptation = module.SelfAdaptiveMutation(5, 3, -5.0, 5.0, "one_fifth")
+    mutate_generation(adaptation, [False, False], np.random.default_rng(1))
+    before = adaptation.sigmas.copy()
+    # Better parent of each pair: -1 and -3; one child in four beats it
+    adaptation.update(np.array([0.0, 0.0, -10.0, -10.0, -10.0]))
+    np.testing.assert_allclose(adaptation.sigmas, before * np.exp((0.25 - 0.2) / module.ONE_FIFTH_DAMPING))
+
+def test_lognormal_sigmas_are_perturbed_per_child():
+    module = adaptive_mutation()
+    adaptation = module.SelfAdaptiveMutation(5, 3, -5.0, 5.0, "lognormal", initial_sigma=1.0)
+    mutate_generation(adaptation, [False, True], np.random.default_rng(2))
+    assert adaptation.sigmas[0] == 1.0  # The elite keeps its sigma
+    assert len(set(adaptation.sigmas[1:].tolist())) == 4
+
+@pytest.mark.parametrize("method", ["one_fifth", "lognormal"])
+def test_sigmas_shrink_on_sphere(method):
+    modules = load_modules("meu_teste", "genetic_algorithm", "adaptive_mutation", "problems")
+    created = []
+    original = modules.adaptive_mutation.SelfAdaptiveMutation
+
+    class Recording(original):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            created.append(self)
+
+    modules.genetic_algorithm.SelfAdaptiveMutation = Recording
+    sphere = modules.problems.get_problem("sphere")
+    best = modules.genetic_algorithm.genetic_algorithm(
+        100, sphere.lower_bound, sphere.upper_bound, 60, 0.1, 4, 0.7, plot_all=False, seed=3,
+        objective=modules.problems.as_fitness(sphere), n_params=5, verbose=False, adaptation=method)
+    initial_sigma = modules.adaptive_mutation.INITIAL_SIGMA_FRACTION * (sphere.upper_bound - sphere.lower_bound)
+    assert np.median(created[0].sigmas) < initial_sigma / 10
+    assert sphere.function(best) < 0.05
+
+@pytest.mark.parametrize("method, covariance", [("one_fifth", False), ("lognormal", False), ("lognormal", True)])
+def test_seeded_adaptive_run_is_reproducible(method, covariance):
+    modules = load_modules("meu_teste", "genetic_algorithm", "problems")
+    rastrigin = modules.problems.get_problem("rastrigin")
+
+    def run():
+        histories = []
+        best = modules.genetic_algorithm.genetic_algorithm(
+            50, rastrigin.lower_bound, rastrigin.upper_bound, 15, 0.1, 3, 0.7, plot_all=False, seed=11,
+            objective=modules.problems.as_fitness(rastrigin), n_params=4, verbose=False,
+            observer=lambda generation, individual, fitness: histories.append(fitness),
+            adaptation=method, covariance=covariance)
+        return best, histories
+
+    best1, history1 = run()
+    best2, history2 = run()
+    assert np.array_equal(best1, best2)
+    assert history1 == history2
+
+def test_unknown_method_is_rejected():
+    with pytest.raises(ValueError):
+        adaptive_mutation().SelfAdaptiveMutation(10, 3, -1.0, 1.0, "cma")
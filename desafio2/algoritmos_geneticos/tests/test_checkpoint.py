@@ -0,0 +1,48 @@
+# test_checkpoint.py
+
+import numpy as np
+import pytest
+
+from conftest import load_modules
+
+HISTORIES = ("best_fitness_history", "best_distance_history", "avg_distance_history",
+             "rejected_duplicates_history")
+
+@pytest.mark.parametrize("memetic", [False, True])
+def test_resumed_run_is_bit_exact(tmp_path, memetic):
+    main = load_modules("pvc-torneio", "main").main
+    settings = dict(seed=7, n_cities=25, population_size=40, n_generations=20, memetic=memetic,
+                    early_stopping=main.build_early_stopping(patience=None))
+    uninterrupted = main.run_headless(**settings)
+
+    path = str(tmp_path / "run.npz")
+    main.run_headless(checkpoint_path=path, checkpoint_interval=8, **settings)
+    # O último checkpoint é o da geração 16: a execução continua dali até a 20
+    resumed = main.run_headless(resume_path=path,
+                                early_stopping=main.build_early_stopping(patience=None))
+
+    assert resumed["generations"] == uninterrupted["generations"] == 20
+    assert resumed["cities"] == uninterrupted["cities"]
+    assert resumed["best_route"] == uninterrupted["best_route"]
+    assert resumed["best_distance"] == uninterrupted["best_distance"]
+    for name in HISTORIES:
+        assert resumed[name] == uninterrupted[name], name
+
+def test_checkpoint_round_trip_restores_rng_state(tmp_path):
+    modules = load_modules("pvc-torneio", "ga_logic", "checkpoint")
+    rng = np.random.default_rng(3)
+    population = modules.ga_logic.Population(10, 6)
+    population.routes[:] = [rng.permutation(10) for _ in range(6)]
+    population.lengths[:] = rng.uniform(1, 2, 6)
+    rng.random(17)
+    path = str(tmp_path / "state.npz")
+    modules.checkpoint.save_checkpoint(path, 4, population, rng, {"best_distance": [1.5] * 4},
+                                       [(0, 0), (1, 1)], {"population_size": 6}, 2.5)
+
+    state = modules.checkpoint.load_checkpoint(path)
+    assert state["generation"] == 4
+    assert np.array_equal(state["routes"], population.routes)
+    assert np.array_equal(state["lengths"], population.lengths)
+    assert state["histories"] == {"best_distance": [1.5] * 4}
+    assert state["elapsed_seconds"] == 2.5
+    assert np.array_equal(state["rng"].random(5), rng.random(5))
@@ -0,0 +1,128 @@
+# test_crossover.py
+
+import ast
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from conftest import ROOT, load_modules
+
+def baseline_order_crossover(parent1, parent2, start, end):
+    """OX1 da versão original de `ga_logic.py`, com os pontos de corte informados."""
+    size = len(parent1)
+    child = [-1] * size
+    child[start:end+1] = parent1[start:end+1]
+    current_index = 0
+    for gene in parent2:
+        if gene not in child:
+            while child[current_index] != -1:
+                current_index = (current_index + 1) % size
+            child[current_index] = gene
+    return child
+
+class FixedIntegers:
+    """Substituto do gerador que devolve, em ordem, os valores de `integers` informados."""
+
+    def __init__(self, *values):
+        self.values = list(values)
+
+    def integers(self, high, size=None):
+        value = self.values.pop(0)
+        return np.asarray(value) if size is not None else value
+
+def pcv_crossover_functions():
+    """Extrai `sorted_cut_points` e `order_crossover` de pcv/main.py.
+
+    O script abre a janela do pygame ao ser importado, então só as duas
+    funções são compiladas, a partir da árvore sintática do arquivo.
+    """
+    tree = ast.parse((ROOT / "pcv" / "main.py").read_text())
+    names = {"sorted_cut_points", "order_crossover"}
+    functions = [node for node in tree.body if isinstance(node, ast.FunctionDef) and node.name in names]
+    namespace = {"np": np}
+    exec(compile(ast.Module(body=functions, type_ignores=[]), "pcv/main.py", "exec"), namespace)
+    return SimpleNamespace(**{name: namespace[name] for name in names})
+
+def random_parents(rng, n_cities, n_pairs=None):
+    shape = (n_cities,) if n_pairs is None else (n_pairs, n_cities)
+    base = np.broadcast_to(np.arange(n_cities), shape)
+    return rng.permuted(base, axis=-1), rng.permuted(base, axis=-1)
+
+@pytest.mark.parametrize("n_cities", [2, 3, 10, 80])
+def test_order_crossover_matches_baseline_for_same_seed(pvc_folder, n_cities):
+    ga_logic = load_modules(pvc_folder, "ga_logic").ga_logic
+    parents_rng = np.random.default_rng(n_cities)
+    for seed in range(50):
+        parent1, parent2 = (parent.tolist() for parent in random_parents(parents_rng, n_cities))
+        start, end = ga_logic.sorted_cut_points(n_cities, np.random.default_rng(seed))
+        expected = baseline_order_crossover(parent1, parent2, start, end)
+        assert ga_logic.order_crossover(parent1, parent2, rng=np.random.default_rng(seed)) == expected
+
+@pytest.mark.parametrize("cuts, segment", [((9, 0), (0, 9)), ((0, 0), (0, 1)), ((9, 8), (8, 9)),
+                                           ((8, 8), (8, 9)), ((4, 4), (4, 5))])
+def test_order_crossover_segment_bounds(pvc_folder, cuts, segment):
+    # `sorted_cut_points` sorteia o primeiro corte em [0, n) e o segundo em [0, n-1)
+    ga_logic = load_modules(pvc_folder, "ga_logic").ga_logic
+    parent1, parent2 = (parent.tolist() for parent in random_parents(np.random.default_rng(7), 10))
+    start, end = ga_logic.sorted_cut_points(10, FixedIntegers(*cuts))
+    assert (start, end) == segment
+    expected = baseline_order_crossover(parent1, parent2, start, end)
+    assert ga_logic.order_crossover(parent1, parent2, rng=FixedIntegers(*cuts)) == expected
+    out = np.empty(10, dtype=np.int32)
+    assert ga_logic.order_crossover(parent1, parent2, out=out, rng=FixedIntegers(*cuts)) is out
+    assert out.tolist() == expected
+
+def test_order_crossover_batch_matches_scalar(pvc_folder):
+    ga_logic = load_modules(pvc_folder, "ga_logic").ga_logic
+    n_pairs, n_cities = 64, 30
+    parents1, parents2 = random_parents(np.random.default_rng(1), n_cities, n_pairs)
+    # O lote sorteia todos os primeiros cortes e depois todos os segundos
+    cuts_rng = np.random.default_rng(2)
+    first = cuts_rng.integers(n_cities, size=n_pairs)
+    second = cuts_rng.integers(n_cities - 1, size=n_pairs)
+    children = ga_logic.order_crossover_batch(parents1, parents2, rng=np.random.default_rng(2))
+    for row in range(n_pairs):
+        scalar = ga_logic.order_crossover(parents1[row], parents2[row],
+                                          rng=FixedIntegers(first[row], second[row]))
+        assert children[row].tolist() == scalar
+
+def test_order_crossover_batch_segment_bounds(pvc_folder):
+    ga_logic = load_modules(pvc_folder, "ga_logic").ga_logic
+    parents1, parents2 = random_parents(np.random.default_rng(3), 10, 4)
+    # Segmentos [0, 9], [0, 1], [8, 9] e [3, 4]
+    rng = FixedIntegers([9, 0, 9, 3], [0, 0, 8, 3])
+    out = np.empty((4, 10), dtype=np.int32)
+    children = ga_logic.order_crossover_batch(parents1, parents2, out=out, rng=rng)
+    assert children is out
+    for row, (start, end) in enumerate([(0, 9), (0, 1), (8, 9), (3, 4)]):
+        expected = baseline_order_crossover(parents1[row].tolist(), parents2[row].tolist(), start, end)
+        assert children[row].tolist() == expected
+
+def test_pcv_cut_points_follow_ga_logic_rule(pvc_folder):
+    ga_logic = load_modules(pvc_folder, "ga_logic").ga_logic
+    pcv = pcv_crossover_functions()
+    for n_cities in (2, 3, 10):
+        for seed in range(50):
+            assert (pcv.sorted_cut_points(n_cities, np.random.default_rng(seed))
+                    == ga_logic.sorted_cut_points(n_cities, np.random.default_rng(seed)))
+
+@pytest.mark.parametrize("n_cities", [2, 3, 10, 80])
+def test_pcv_order_crossover_matches_baseline_for_same_seed(n_cities):
+    pcv = pcv_crossover_functions()
+    parents_rng = np.random.default_rng(n_cities)
+    for seed in range(50):
+        parent1, parent2 = (parent.tolist() for parent in random_parents(parents_rng, n_cities))
+        start, end = pcv.sorted_cut_points(n_cities, np.random.default_rng(seed))
+        expected = baseline_order_crossover(parent1, parent2, start, end)
+        assert pcv.order_crossover(parent1, parent2, np.random.default_rng(seed)) == expected
+
+@pytest.mark.parametrize("cuts, segment", [((9, 0), (0, 9)), ((0, 0), (0, 1)), ((9, 8), (8, 9)),
+                                           ((8, 8), (8, 9)), ((4, 4), (4, 5))])
+def test_pcv_order_crossover_segment_bounds(cuts, segment):
+    # Inclui o segmento de comprimento total [0, n-1], como em ga_logic
+    pcv = pcv_crossover_functions()
+    parent1, parent2 = (parent.tolist() for parent in random_parents(np.random.default_rng(7), 10))
+    assert pcv.sorted_cut_points(10, FixedIntegers(*cuts)) == segment
+    expected = baseline_order_crossover(parent1, parent2, *segment)
+    assert pcv.order_crossover(parent1, parent2, FixedIntegers(*cuts)) == expected
@@ -0,0 +1,50 @@
+# test_duplicates.py
+
+import numpy as np
+
+from conftest import load_modules
+
+def test_distinct_tour_count():
+    modules = load_modules("pvc-torneio", "ga_logic")
+    counts = [modules.ga_logic.distinct_tour_count(n, 10**6) for n in range(3, 9)]
+    assert counts == [1, 3, 12, 60, 360, 2520]
+    assert modules.ga_logic.distinct_tour_count(20, 1000) == 1000
+
+def test_rotations_and_reversals_are_duplicates(pvc_folder):
+    ga_logic = load_modules(pvc_folder, "ga_logic").ga_logic
+    index = ga_logic.RouteIndex()
+    assert index.add([0, 1, 2, 3, 4])
+    assert not index.add([2, 3, 4, 0, 1])
+    assert not index.add([4, 3, 2, 1, 0])
+    assert index.add([0, 2, 1, 3, 4])
+    assert index.rejected == 2
+
+def test_duplicates_accepted_after_rejection_limit(pvc_folder):
+    ga_logic = load_modules(pvc_folder, "ga_logic").ga_logic
+    population = ga_logic.Population(5, 4, max_rejections=2)
+    route = np.arange(5)
+    population.add(route, 10.0)
+    accepted = []
+    while not population.is_next_full():
+        population.next_row()[:] = route
+        accepted.append(population.accept_next(10.0))
+    assert accepted == [False, False, True, True, True]
+    population.swap()
+    assert population.rejected_duplicates == 2
+    assert (population.routes == route).all()
+
+def test_small_instances_fill_the_population(pvc_folder):
+    # 7 cidades têm só 360 ciclos distintos, menos que a população
+    modules = load_modules(pvc_folder, "main")
+    rng = np.random.default_rng(1)
+    cities = modules.main.create_cities(7, rng)
+    results = modules.main.run_ga(cities, population_size=400, n_generations=3, rng=rng)
+    assert results["generations"] == 3
+    assert results["rejected_duplicates_history"] == [0, 0, 0]
+
+def test_four_cities(pvc_folder):
+    modules = load_modules(pvc_folder, "main")
+    rng = np.random.default_rng(2)
+    results = modules.main.run_ga(modules.main.create_cities(4, rng), population_size=20, n_generations=5, rng=rng)
+    assert results["generations"] == 5
+    assert sorted(results["best_route"]) == [0, 1, 2, 3]
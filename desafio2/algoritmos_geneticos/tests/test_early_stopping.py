@@ -0,0 +1,40 @@
+# test_early_stopping.py
+
+import numpy as np
+
+from conftest import load_modules
+
+def test_wall_clock_counts_previous_elapsed_time(pvc_folder):
+    early_stopping = load_modules(pvc_folder, "early_stopping").early_stopping
+    clock = early_stopping.WallClock(10)
+    clock.start()
+    assert not clock.update(1, 100.0, 120.0)
+    clock.start(elapsed=12.0)
+    assert clock.update(1, 100.0, 120.0)
+    assert clock.elapsed >= 12.0
+
+def test_policies_accept_elapsed_on_start(pvc_folder):
+    early_stopping = load_modules(pvc_folder, "early_stopping").early_stopping
+    stopping = early_stopping.build_early_stopping(patience=5, window=3, min_relative_improvement=0.01,
+                                                   time_limit=30, target_length=10, min_diversity=0.01)
+    stopping.start(elapsed=31.0)
+    assert stopping.update(1, 100.0, 150.0) == "time_limit"
+
+def test_resumed_run_respects_time_limit(tmp_path):
+    modules = load_modules("pvc-torneio", "main", "checkpoint", "early_stopping")
+    main = modules.main
+    path = str(tmp_path / "run.npz")
+    rng = np.random.default_rng(5)
+    cities = main.create_cities(15, rng)
+    main.run_ga(cities, population_size=30, n_generations=4, rng=rng, checkpoint_path=path,
+                checkpoint_interval=2)
+
+    resume = modules.checkpoint.load_checkpoint(path)
+    assert resume["generation"] == 2
+    # Tempo já gasto acima do limite: a execução continuada para na primeira geração
+    resume["elapsed_seconds"] = 100.0
+    results = main.run_ga(resume["cities"], resume=resume,
+                          early_stopping=modules.early_stopping.build_early_stopping(time_limit=60))
+    assert results["stop_reason"] == "time_limit"
+    assert results["generations"] == 3
+    assert results["elapsed_seconds"] >= 100.0
@@ -0,0 +1,36 @@
+# test_fitness.py
+
+import numpy as np
+import pytest
+
+from conftest import load_modules
+
+def scalar_fitness_function(params):
+    """The original per-individual fitness function, kept as the reference."""
+    a, b, c = params
+    if a <= 0:
+        return -float('inf')  # Penalize downward facing u-shapes heavily
+    vertex_x = -b / (2 * a) #x value at vertex
+    vertex_y = a * (vertex_x ** 2) + b * vertex_x + c #y value at vertex
+    y_left = a * (-1) ** 2 + b * (-1) + c #y-coordinate at x = -1
+    y_right = a * (1) ** 2 + b * (1) + c #y-coordinate at x = 1
+    curviness = abs(y_left - vertex_y) + abs(y_right - vertex_y)
+    return -curviness  # Negate to minimize curviness
+
+@pytest.fixture
+def population():
+    rng = np.random.default_rng(2)
+    population = rng.uniform(-10, 10, (500, 3))
+    # Edge cases: a == 0, tiny positive a, and a vertex exactly at x = 0
+    population[:4] = [[0.0, 1.0, 2.0], [1e-9, 3.0, -1.0], [2.0, 0.0, 5.0], [-0.0, 0.0, 0.0]]
+    return population
+
+def test_vectorized_fitness_matches_scalar_original(population):
+    genetic_algorithm = load_modules("meu_teste", "genetic_algorithm").genetic_algorithm
+    expected = np.array([scalar_fitness_function(tuple(row)) for row in population.tolist()])
+    np.testing.assert_allclose(genetic_algorithm.fitness_function(population), expected, rtol=1e-12)
+
+def test_vectorized_fitness_accepts_single_individual(population):
+    genetic_algorithm = load_modules("meu_teste", "genetic_algorithm").genetic_algorithm
+    for row in population[:20].tolist():
+        assert genetic_algorithm.fitness_function(row) == pytest.approx(scalar_fitness_function(row), rel=1e-12)
@@ -0,0 +1,89 @@
+# test_genetic_algorithm.py
+
+import numpy as np
+import pytest
+
+from conftest import load_modules
+
+@pytest.mark.parametrize("population_size", [1, 2, 3, 5, 7])
+@pytest.mark.parametrize("adaptation, covariance", [(None, False), ("one_fifth", False), ("lognormal", True)])
+def test_populations_smaller_than_two_tournaments_run(population_size, adaptation, covariance):
+    genetic_algorithm = load_modules("meu_teste", "genetic_algorithm").genetic_algorithm
+    generations = []
+    best = genetic_algorithm.genetic_algorithm(
+        population_size, -5.0, 5.0, 4, 0.3, 4, 0.7, plot_all=False, seed=0, verbose=False,
+        observer=lambda generation, individual, fitness: generations.append(generation),
+        adaptation=adaptation, covariance=covariance)
+    assert best.shape == (3,)
+    assert generations == [1, 2, 3, 4]
+
+def test_tournaments_shrink_to_half_the_population():
+    genetic_algorithm = load_modules("meu_teste", "genetic_algorithm").genetic_algorithm
+    fitnesses = np.array([0.0, 1.0, 2.0, 3.0, 4.0])
+    first, second = genetic_algorithm.tournament_parents(fitnesses, 50, 4, np.random.default_rng(0))
+    # Tournaments of 2 from 4 distinct contestants: the two parents always differ
+    assert (first != second).all()
+    assert first.shape == second.shape == (50,)
+    empty = genetic_algorithm.tournament_parents(fitnesses[:1], 0, 4, np.random.default_rng(0))
+    assert [part.size for part in empty] == [0, 0]
+
+def record_generations(history, n_generations, n_params=2, population_size=4):
+    rng = np.random.default_rng(0)
+    for _ in range(n_generations):
+        population = rng.random((population_size, n_params))
+        fitnesses = rng.random(population_size)
+        history.record(population, fitnesses, int(np.argmax(fitnesses)))
+    return population, fitnesses
+
+@pytest.mark.parametrize("stride, kept", [(None, [7]), (3, [0, 3, 6, 7]), (4, [0, 4, 7]), (1, list(range(8)))])
+def test_history_keeps_snapshots_on_the_stride_and_the_last(stride, kept):
+    genetic_algorithm = load_modules("meu_teste", "genetic_algorithm").genetic_algorithm
+    history = genetic_algorithm.GenerationHistory(8, 2, snapshot_stride=stride)
+    population, fitnesses = record_generations(history, 8)
+    assert len(history) == 8
+    assert sorted(history.snapshots) == kept
+    final_population, final_fitnesses, best_index = history.final_snapshot()
+    assert final_population is population and final_fitnesses is fitnesses
+    assert best_index == int(np.argmax(fitnesses))
+    np.testing.assert_array_equal(history.best_individuals[7], population[best_index])
+
+def test_history_final_snapshot_after_an_early_stop():
+    genetic_algorithm = load_modules("meu_teste", "genetic_algorithm").genetic_algorithm
+    history = genetic_algorithm.GenerationHistory(10, 2, snapshot_stride=4)
+    population, fitnesses = record_generations(history, 6)
+    assert sorted(history.snapshots) == [0, 4, 5]
+    assert history.final_snapshot()[0] is population
+
+def test_history_statistics_skip_infeasible_individuals():
+    genetic_algorithm = load_modules("meu_teste", "genetic_algorithm").genetic_algorithm
+    history = genetic_algorithm.GenerationHistory(2, 1)
+    population = np.zeros((4, 1))
+    fitnesses = np.array([-1.0, -np.inf, -3.0, -np.inf])
+    history.record(population, fitnesses, 0)
+    history.record(population, np.full(4, -np.inf), 0)
+    assert history.mean_fitness[0] == -2.0
+    assert history.std_fitness[0] == 1.0
+    assert history.min_fitness[0] == -np.inf
+    assert history.max_fitness[0] == history.best_fitness[0] == -1.0
+    # Nothing feasible: mean -inf and zero spread instead of NaN
+    assert history.mean_fitness[1] == -np.inf
+    assert history.std_fitness[1] == 0.0
+
+def test_curviness_run_records_finite_statistics():
+    genetic_algorithm = load_modules("meu_teste", "genetic_algorithm").genetic_algorithm
+    histories = []
+    original = genetic_algorithm.GenerationHistory
+
+    class Recording(original):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            histories.append(self)
+
+    genetic_algorithm.GenerationHistory = Recording
+    # Half of the initial population has a <= 0 (fitness -inf)
+    genetic_algorithm.genetic_algorithm(40, -10.0, 10.0, 5, 0.3, 3, 0.7, plot_all=False, seed=1, verbose=False,
+                                        snapshot_stride=2)
+    history = histories[0]
+    assert np.isfinite(history.mean_fitness[:len(history)]).all()
+    assert np.isfinite(history.std_fitness[:len(history)]).all()
+    assert sorted(history.snapshots) == [0, 2, 4]
@@ -0,0 +1,106 @@
+# test_islands.py
+
+import threading
+
+import numpy as np
+import pytest
+
+from conftest import load_modules
+
+def islands_module():
+    return load_modules("pvc-torneio", "islands", "main", "ga_logic")
+
+@pytest.mark.parametrize("topology", ["ring", "random"])
+def test_seeded_island_runs_are_reproducible(topology):
+    modules = islands_module()
+    cities = modules.main.create_cities(25, np.random.default_rng(8))
+
+    def run():
+        return modules.islands.run_islands(cities, n_islands=3, population_size=40, n_generations=12,
+                                           migration_interval=4, n_migrants=3, topology=topology, seed=5)
+
+    first, second = run(), run()
+    assert first["best_route"] == second["best_route"]
+    assert first["island_best_distances"] == second["island_best_distances"]
+    assert first["best_distance_history"] == second["best_distance_history"]
+    assert first["avg_distance_history"] == second["avg_distance_history"]
+    assert sorted(first["best_route"]) == list(range(25))
+    assert first["best_distance"] == pytest.approx(
+        modules.ga_logic.calculate_total_distance(first["best_route"], cities))
+
+def test_migration_replaces_the_worst_routes_with_the_source_elites(monkeypatch):
+    # As ilhas rodam em threads (mesma memória compartilhada e mesma barreira), com um
+    # `run_ga` falso que só chama a migração uma vez e guarda a população antes e depois
+    modules = islands_module()
+    islands = modules.islands
+    n_islands, population_size, n_cities, n_migrants = 3, 8, 6, 2
+    before, after = {}, {}
+
+    def fake_run_ga(cities, population_size, n_generations, memetic, convergence_generations, migration, rng):
+        island = int(threading.current_thread().name)
+        population = modules.ga_logic.Population(n_cities, population_size)
+        population.routes[:] = [rng.permutation(n_cities) for _ in range(population_size)]
+        population.lengths[:] = 100 * island + rng.permutation(population_size)
+        before[island] = (population.routes.copy(), population.lengths.copy())
+        assert not migration(1, population)
+        assert migration(4, population)
+        after[island] = (population.routes.copy(), population.lengths.copy())
+        return {"best_route": population.routes[0].tolist(), "best_distance": 0.0,
+                "best_distance_history": [0.0] * n_generations, "avg_distance_history": [0.0] * n_generations}
+
+    monkeypatch.setattr(islands, "run_ga", fake_run_ga)
+    config = {"cities": [(0, 0)] * n_cities, "n_islands": n_islands, "population_size": population_size,
+              "n_generations": 4, "migration_interval": 4, "n_migrants": n_migrants, "topology": "ring",
+              "memetic": False, "tsplib": None}
+    shared = {
+        "migrants": islands.SharedArray((n_islands, n_migrants, n_cities), np.int32),
+        "migrant_lengths": islands.SharedArray((n_islands, n_migrants), np.float64),
+        "best_routes": islands.SharedArray((n_islands, n_cities), np.int32),
+        "best_distances": islands.SharedArray((n_islands,), np.float64),
+        "best_distance_history": islands.SharedArray((n_islands, 4), np.float64),
+        "avg_distance_history": islands.SharedArray((n_islands, 4), np.float64),
+    }
+    specs = {key: array.spec() for key, array in shared.items()}
+    barrier = threading.Barrier(n_islands)
+    *island_seeds, migration_seed = np.random.SeedSequence(0).spawn(n_islands + 1)
+    threads = [threading.Thread(target=islands._island_worker, name=str(island),
+                                args=(island, config, specs, barrier, island_seeds[island], migration_seed))
+               for island in range(n_islands)]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=30)
+    finally:
+        for array in shared.values():
+            array.close()
+            array.unlink()
+
+    assert sorted(after) == list(range(n_islands))
+    for island in range(n_islands):
+        source = (island - 1) % n_islands
+        routes, lengths = before[island]
+        source_routes, source_lengths = before[source]
+        order = np.argsort(lengths, kind='stable')
+        source_best = np.argsort(source_lengths, kind='stable')[:n_migrants]
+        new_routes, new_lengths = after[island]
+        # As piores rotas viram as elites da ilha anterior no anel; as demais não mudam
+        assert np.array_equal(new_routes[order[-n_migrants:]], source_routes[source_best])
+        assert np.array_equal(new_lengths[order[-n_migrants:]], source_lengths[source_best])
+        assert np.array_equal(new_routes[order[:-n_migrants]], routes[order[:-n_migrants]])
+
+def test_migration_source_topologies():
+    islands = islands_module().islands
+    rng = np.random.default_rng(0)
+    assert [islands.migration_source(island, 4, "ring", rng) for island in range(4)] == [3, 0, 1, 2]
+    for _ in range(20):
+        # Mesmo gerador em todas as ilhas: um único deslocamento, cada ilha recebe de outra
+        state = rng.bit_generator.state
+        sources = []
+        for island in range(5):
+            rng.bit_generator.state = state
+            sources.append(islands.migration_source(island, 5, "random", rng))
+        assert sorted(sources) == list(range(5))
+        assert all(source != island for island, source in enumerate(sources))
+    with pytest.raises(ValueError):
+        islands.migration_source(0, 3, "star", rng)
@@ -0,0 +1,62 @@
+# test_local_search.py
+
+import itertools
+
+import numpy as np
+import pytest
+
+from conftest import load_modules
+
+def route_length(route, matrix):
+    route = np.asarray(route)
+    return float(matrix[route, np.roll(route, -1)].sum())
+
+def cycle_key(tour):
+    """Rota como ciclo: começa na cidade 0 e segue o sentido de menor segundo elemento."""
+    start = tour.index(0)
+    forward = tour[start:] + tour[:start]
+    backward = [forward[0]] + forward[:0:-1]
+    return tuple(min(forward, backward))
+
+def rebuilt_move(tour, start, length, c, reverse):
+    """Movimento Or-opt da versão original: reconstrói a rota sem o segmento."""
+    n = len(tour)
+    segment = [tour[(start + k) % n] for k in range(length)]
+    moved = segment[::-1] if reverse else segment
+    rest = [city for city in tour if city not in segment]
+    j = rest.index(c)
+    return rest[:j + 1] + moved + rest[j + 1:]
+
+def test_move_segment_matches_full_rebuild():
+    LocalSearch = load_modules("pvc-torneio", "local_search").local_search.LocalSearch
+    n = 9
+    tour = [4, 7, 0, 2, 8, 1, 6, 3, 5]
+    for start, length, reverse in itertools.product(range(n), (1, 2, 3), (False, True)):
+        segment = {tour[(start + k) % n] for k in range(length)}
+        for c in tour:
+            if c in segment or tour[(tour.index(c) + 1) % n] in segment:
+                continue
+            moved, pos = list(tour), [0] * n
+            for index, city in enumerate(moved):
+                pos[city] = index
+            LocalSearch._move_segment(moved, pos, start, length, c, reverse)
+            assert cycle_key(moved) == cycle_key(rebuilt_move(tour, start, length, c, reverse))
+            assert all(moved[pos[city]] == city for city in range(n))
+
+@pytest.mark.parametrize("list_max_cities", [500, 0])
+def test_improve_keeps_permutation_and_reports_delta(list_max_cities, monkeypatch):
+    modules = load_modules("pvc-torneio", "ga_logic", "local_search")
+    # 0 força o caminho das linhas NumPy (instâncias grandes)
+    monkeypatch.setattr(modules.local_search, "LIST_MATRIX_MAX_CITIES", list_max_cities)
+    rng = np.random.default_rng(11)
+    cities = rng.uniform(0, 1000, (120, 2))
+    distances = modules.ga_logic.DistanceMatrix(cities)
+    local_search = modules.local_search.LocalSearch(distances, n_neighbors=8)
+    for _ in range(5):
+        route = rng.permutation(len(cities))
+        before = route_length(route, distances.matrix)
+        local_search.start_generation()
+        delta = local_search.improve(route)
+        assert sorted(route.tolist()) == list(range(len(cities)))
+        assert delta < 0
+        assert route_length(route, distances.matrix) == pytest.approx(before + delta)
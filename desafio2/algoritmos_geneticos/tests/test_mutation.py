@@ -0,0 +1,49 @@
+# test_mutation.py
+
+import numpy as np
+import pytest
+
+from conftest import load_modules
+
+@pytest.fixture
+def cities():
+    rng = np.random.default_rng(5)
+    return [tuple(point) for point in rng.uniform(0, 800, (25, 2)).tolist()]
+
+def test_swap_mutation_delta_matches_full_recompute(pvc_folder, cities):
+    ga_logic = load_modules(pvc_folder, "ga_logic").ga_logic
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        route = rng.permutation(len(cities))
+        before = ga_logic.calculate_total_distance(route, cities)
+        original = route.copy()
+        mutated, delta = ga_logic.swap_mutation_inplace(route, 1.0, cities, rng)
+        assert mutated is route
+        assert sorted(route.tolist()) == list(range(len(cities)))
+        assert (route != original).sum() == 2
+        assert ga_logic.calculate_total_distance(route, cities) == pytest.approx(before + delta, abs=1e-9)
+
+def test_swap_mutation_consumes_the_same_draws_as_the_tuple_version(pvc_folder, cities):
+    ga_logic = load_modules(pvc_folder, "ga_logic").ga_logic
+    route = tuple(range(len(cities)))
+    for seed in range(20):
+        expected = ga_logic.swap_mutation(route, 0.5, np.random.default_rng(seed))
+        mutated, _ = ga_logic.swap_mutation_inplace(np.array(route), 0.5, cities, np.random.default_rng(seed))
+        assert tuple(mutated.tolist()) == expected
+
+def test_reverse_mutation_delta_matches_full_recompute(cities):
+    ga_logic = load_modules("pvc-torneio", "ga_logic").ga_logic
+    rng = np.random.default_rng(1)
+    for _ in range(200):
+        route = rng.permutation(len(cities))
+        before = ga_logic.calculate_total_distance(route, cities)
+        mutated, delta = ga_logic.reverse_mutation_inplace(route, 1.0, cities, rng)
+        assert mutated is route
+        assert sorted(route.tolist()) == list(range(len(cities)))
+        assert ga_logic.calculate_total_distance(route, cities) == pytest.approx(before + delta, abs=1e-9)
+    # Mesmos sorteios que a versão com tuplas
+    for seed in range(20):
+        expected = ga_logic.reverse_mutation(tuple(range(len(cities))), 0.5, np.random.default_rng(seed))
+        mutated, _ = ga_logic.reverse_mutation_inplace(np.arange(len(cities)), 0.5, cities,
+                                                       np.random.default_rng(seed))
+        assert tuple(mutated.tolist()) == tuple(expected)
@@ -0,0 +1,42 @@
+# test_neighbors.py
+
+import numpy as np
+import pytest
+
+from conftest import load_modules
+
+def brute_force_neighbors(coords, k):
+    distances = np.sqrt(((coords[:, np.newaxis, :] - coords[np.newaxis, :, :]) ** 2).sum(axis=-1))
+    np.fill_diagonal(distances, np.inf)
+    order = np.argsort(distances, axis=1, kind='stable')[:, :k]
+    return order, np.take_along_axis(distances, order, axis=1)
+
+def point_sets():
+    rng = np.random.default_rng(21)
+    yield "uniforme", rng.uniform(0, 1000, (400, 2))
+    # Aglomerados densos deixam muitas células da grade vazias
+    centers = rng.uniform(0, 1000, (5, 2))
+    yield "aglomerados", centers[rng.integers(5, size=300)] + rng.normal(0, 5, (300, 2))
+    yield "faixa", np.column_stack([rng.uniform(0, 1000, 200), rng.uniform(0, 1, 200)])
+    yield "colinear", np.column_stack([rng.uniform(0, 1000, 100), np.zeros(100)])
+    yield "inteiros", rng.integers(0, 20, (150, 2)).astype(np.float64)
+
+@pytest.mark.parametrize("name, coords", list(point_sets()))
+@pytest.mark.parametrize("k", [1, 5, 8, 20])
+def test_grid_neighbors_match_brute_force(pvc_folder, name, coords, k):
+    ga_logic = load_modules(pvc_folder, "ga_logic").ga_logic
+    neighbors = ga_logic.grid_nearest_neighbors(coords, k)
+    expected, expected_distances = brute_force_neighbors(coords, k)
+
+    assert neighbors.shape == expected.shape
+    assert not (neighbors == np.arange(len(coords))[:, np.newaxis]).any()
+    assert all(len(set(row)) == k for row in neighbors.tolist())
+    distances = np.sqrt(((coords[neighbors] - coords[:, np.newaxis, :]) ** 2).sum(axis=-1))
+    # Empates podem trocar índices de lugar; as distâncias, em ordem, têm de ser as mesmas
+    np.testing.assert_allclose(distances, expected_distances, rtol=0, atol=1e-9)
+
+def test_grid_neighbors_small_inputs(pvc_folder):
+    ga_logic = load_modules(pvc_folder, "ga_logic").ga_logic
+    coords = np.array([[0.0, 0.0], [3.0, 0.0], [1.0, 0.0]])
+    assert ga_logic.grid_nearest_neighbors(coords, 10).tolist() == [[2, 1], [2, 0], [0, 1]]
+    assert ga_logic.grid_nearest_neighbors(coords[:1], 3).shape == (1, 0)
@@ -0,0 +1,71 @@
+# test_problems.py
+
+import numpy as np
+import pytest
+
+from conftest import load_modules
+
+OPTIMUM_POINTS = {
+    "sphere": lambda d: np.zeros(d),
+    "rastrigin": lambda d: np.zeros(d),
+    "ackley": lambda d: np.zeros(d),
+    "rosenbrock": lambda d: np.ones(d),
+    # Infimum as a -> 0+ with b = 0 (c does not matter): curviness = 2a + b^2 / 2a
+    "curviness": lambda d: np.array([1e-9, 0.0, 7.0]),
+}
+
+def problems():
+    return load_modules("meu_teste", "problems").problems
+
+def test_every_registered_problem_has_a_known_optimum_point():
+    assert set(problems().PROBLEMS) == set(OPTIMUM_POINTS)
+
+@pytest.mark.parametrize("name", sorted(OPTIMUM_POINTS))
+@pytest.mark.parametrize("dimension", [2, 10])
+def test_objectives_are_vectorized_and_score_their_optimum(name, dimension):
+    module = problems()
+    problem = module.get_problem(name)
+    dimension = module.problem_dimension(problem, dimension)
+    rng = np.random.default_rng(0)
+    population = rng.uniform(problem.lower_bound, problem.upper_bound, (50, dimension))
+    population[7] = OPTIMUM_POINTS[name](dimension)
+
+    values = problem.function(population)
+    assert values.shape == (50,)
+    assert values[7] == pytest.approx(problem.optimum, abs=1e-6)
+    assert np.all(values[np.arange(50) != 7] > values[7])
+    # Same values one row at a time, and as fitness (negated) for the GA
+    np.testing.assert_allclose([problem.function(row) for row in population], values)
+    np.testing.assert_array_equal(module.as_fitness(problem)(population), -values)
+
+def test_problem_dimension_respects_fixed_dimensions():
+    module = problems()
+    assert module.problem_dimension(module.get_problem("sphere"), 30) == 30
+    assert module.problem_dimension(module.get_problem("curviness"), 30) == 3
+
+def test_registry_lookup_and_registration(monkeypatch):
+    module = problems()
+    with pytest.raises(ValueError, match="unknown problem"):
+        module.get_problem("nope")
+    monkeypatch.setattr(module, "PROBLEMS", dict(module.PROBLEMS))
+    shifted = module.Problem("shifted", lambda x: np.sum((x - 1) ** 2, axis=-1), -2.0, 2.0, 0.0, None)
+    assert module.register_problem(shifted) is shifted
+    assert module.get_problem("shifted") is shifted
+
+def test_benchmark_run_reaches_epsilon_on_sphere():
+    benchmark = load_modules("meu_teste", "benchmark", "problems").benchmark
+    sphere = benchmark.get_problem("sphere")
+    result = benchmark.measure_run(sphere, 2, 100, generations=200, epsilon=1e-2, seed=0)
+    assert result["generations_to_epsilon"] is not None
+    assert result["best_error"] <= 1e-2
+    assert result["generations"] == result["generations_to_epsilon"]
+    assert result["time_to_epsilon_seconds"] > 0
+
+def test_benchmark_scaling_rows():
+    benchmark = load_modules("meu_teste", "benchmark").benchmark
+    rows = benchmark.run_scaling(("sphere", "curviness"), dimensions=(2, 4), population_sizes=(20,),
+                                 generations=3, epsilon=1e-12)
+    # curviness has a fixed D=3, so it appears once
+    assert [(row["problem"], row["dimension"]) for row in rows] == [("sphere", 2), ("sphere", 4), ("curviness", 3)]
+    assert all(row["evaluations_per_second"] > 0 and row["generations"] == 3 for row in rows)
+    assert len(benchmark.format_rows(rows).rows) == 3
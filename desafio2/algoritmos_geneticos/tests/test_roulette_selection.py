@@ -0,0 +1,63 @@
+# test_roulette_selection.py
+
+import numpy as np
+import pytest
+
+from conftest import load_modules
+
+def roulette_wheel():
+    return load_modules(".", "roulette_selection").roulette_selection.RouletteWheel
+
+def test_sus_distinct_pairs_keep_copy_counts():
+    RouletteWheel = roulette_wheel()
+    weights_rng = np.random.default_rng(0)
+    for seed in range(300):
+        weights = weights_rng.uniform(0.1, 5, 20)
+        weights[weights_rng.integers(20)] *= 4  # Um indivíduo dominante força pares repetidos
+        wheel = RouletteWheel(weights)
+        plain = wheel.sample_pairs(10, np.random.default_rng(seed), method="sus")
+        distinct = wheel.sample_pairs(10, np.random.default_rng(seed), distinct=True, method="sus")
+        assert np.array_equal(np.bincount(distinct.ravel(), minlength=20),
+                              np.bincount(plain.ravel(), minlength=20)), seed
+        # Só restam pares repetidos quando a troca é impossível
+        if (distinct[:, 0] == distinct[:, 1]).any():
+            assert np.bincount(distinct.ravel()).max() > 10
+
+def test_sus_copy_counts_are_floor_or_ceil_of_expected():
+    RouletteWheel = roulette_wheel()
+    weights = np.array([1.0, 2.0, 3.0, 4.0, 10.0])
+    wheel = RouletteWheel(weights)
+    expected = 40 * weights / weights.sum()
+    rng = np.random.default_rng(1)
+    for _ in range(200):
+        counts = np.bincount(wheel.universal_sample(40, rng), minlength=len(weights))
+        assert np.all(counts >= np.floor(expected)) and np.all(counts <= np.ceil(expected))
+
+@pytest.mark.parametrize("method", ["roulette", "sus"])
+def test_selection_is_proportional_to_weights(method):
+    RouletteWheel = roulette_wheel()
+    weights = np.array([0.0, 1.0, 2.0, 3.0, 4.0])
+    wheel = RouletteWheel(weights)
+    rng = np.random.default_rng(2)
+    pairs = np.concatenate([wheel.sample_pairs(50, rng, method=method) for _ in range(400)])
+    frequencies = np.bincount(pairs.ravel(), minlength=len(weights)) / pairs.size
+    assert frequencies[0] == 0
+    np.testing.assert_allclose(frequencies, weights / weights.sum(), atol=0.01)
+
+def test_distinct_roulette_pairs_match_choice_without_replacement():
+    RouletteWheel = roulette_wheel()
+    weights = np.array([1.0, 2.0, 7.0])
+    pairs = RouletteWheel(weights).sample_pairs(100000, np.random.default_rng(3), distinct=True)
+    assert not (pairs[:, 0] == pairs[:, 1]).any()
+    # Segundo pai de np.random.choice(3, 2, p=..., replace=False): P(j) = sum_i p_i p_j / (1 - p_i)
+    p = weights / weights.sum()
+    second = np.array([sum(p[i] * p[j] / (1 - p[i]) for i in range(3) if i != j) for j in range(3)])
+    np.testing.assert_allclose(np.bincount(pairs[:, 1], minlength=3) / len(pairs), second, atol=0.01)
+
+def test_invalid_weights_are_rejected():
+    RouletteWheel = roulette_wheel()
+    for weights in ([], [1.0, -1.0], [0.0, 0.0], [1.0, np.inf]):
+        with pytest.raises(ValueError):
+            RouletteWheel(weights)
+    with pytest.raises(ValueError):
+        RouletteWheel([1.0]).sample_pairs(1, np.random.default_rng(0), method="rank")
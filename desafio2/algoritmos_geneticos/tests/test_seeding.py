@@ -0,0 +1,43 @@
+# test_seeding.py
+
+import numpy as np
+import pytest
+
+from conftest import load_modules
+
+def test_seeding_is_on_by_default(pvc_folder):
+    main = load_modules(pvc_folder, "main").main
+    assert main.SEEDING_FRACTION == 0.05
+    rng = np.random.default_rng(3)
+    results = main.run_ga(main.create_cities(20, rng), population_size=40, n_generations=2, rng=rng)
+    assert results["seeded_routes"] == 2
+    rng = np.random.default_rng(3)
+    results = main.run_ga(main.create_cities(20, rng), population_size=40, n_generations=2, rng=rng,
+                          seeding_fraction=0.0)
+    assert results["seeded_routes"] == 0
+
+def test_rejected_duplicates_are_mutated_with_correct_lengths(pvc_folder):
+    # Com rotas semeadas, muitos filhos são duplicatas, reaproveitadas com uma mutação forçada;
+    # o comprimento em cache (filho + deltas) tem de bater com o recálculo
+    modules = load_modules(pvc_folder, "main", "ga_logic")
+    rng = np.random.default_rng(6)
+    cities = modules.main.create_cities(40, rng)
+    observed = []
+    observer = lambda generation, best, top, best_distance: observed.append((best.copy(), best_distance))
+    results = modules.main.run_ga(cities, population_size=200, n_generations=15, rng=rng,
+                                  seeding_fraction=0.1, observer=observer)
+    assert sum(results["rejected_duplicates_history"]) > 0
+    for best, best_distance in observed:
+        assert best_distance == pytest.approx(modules.ga_logic.calculate_total_distance(best, cities))
+
+def test_seeded_routes_are_valid_and_cached(pvc_folder):
+    modules = load_modules(pvc_folder, "main", "ga_logic", "seeding")
+    rng = np.random.default_rng(4)
+    cities = modules.main.create_cities(60, rng)
+    distances = modules.ga_logic.get_distance_matrix(cities)
+    population = modules.ga_logic.create_initial_population(60, 40, rng)
+    n_seeded = modules.seeding.seed_population(population, distances, 0.25, rng=rng)
+    assert 0 < n_seeded <= 10
+    seeded = population.routes[:n_seeded]
+    assert (np.sort(seeded, axis=1) == np.arange(60)).all()
+    np.testing.assert_allclose(population.lengths[:n_seeded], distances.route_lengths(seeded))
@@ -0,0 +1,35 @@
+# test_selection.py
+
+import numpy as np
+import pytest
+
+from conftest import load_modules
+
+def test_tournament_larger_than_population_raises(pvc_folder):
+    ga_logic = load_modules(pvc_folder, "ga_logic").ga_logic
+    rng = np.random.default_rng(0)
+    with pytest.raises(ValueError):
+        ga_logic.select_parent_index_by_tournament([1.0, 2.0, 3.0], 5, rng)
+    with pytest.raises(ValueError):
+        ga_logic._tournament_contestants(3, 4, 5, rng)
+
+def test_batched_tournament_is_capped_at_population_size(pvc_folder):
+    ga_logic = load_modules(pvc_folder, "ga_logic").ga_logic
+    winners = ga_logic.select_parent_indices(np.array([1.0, 2.0, 3.0]), 4, "tournament", 5,
+                                             rng=np.random.default_rng(0))
+    assert (winners == 2).all()
+
+def test_tournament_of_whole_population_picks_the_best(pvc_folder):
+    ga_logic = load_modules(pvc_folder, "ga_logic").ga_logic
+    rng = np.random.default_rng(0)
+    fitness = [0.5, 3.0, 1.0]
+    assert all(ga_logic.select_parent_index_by_tournament(fitness, 3, rng) == 1 for _ in range(20))
+    assert (ga_logic.select_parent_indices(np.array(fitness), 10, "tournament", 3, rng=rng) == 1).all()
+
+def test_tournament_contestants_are_distinct(pvc_folder):
+    ga_logic = load_modules(pvc_folder, "ga_logic").ga_logic
+    rng = np.random.default_rng(0)
+    for n_individuals, k in ((50, 3), (10, 4), (6, 6)):
+        contestants = ga_logic._tournament_contestants(n_individuals, 200, k, rng)
+        assert contestants.shape == (200, k)
+        assert all(len(set(row)) == k for row in contestants.tolist())
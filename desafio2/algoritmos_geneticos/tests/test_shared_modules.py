@@ -0,0 +1,17 @@
+# test_shared_modules.py
+
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Módulos copiados em pvc-torneio e pvc-stop: cada pasta é um programa
+# independente, mas as cópias não podem divergir
+SHARED_MODULES = ("early_stopping", "tsplib", "seeding", "profiling", "visualization")
+
+@pytest.mark.parametrize("module", SHARED_MODULES)
+def test_shared_module_copies_are_identical(module):
+    torneio = (ROOT / "pvc-torneio" / f"{module}.py").read_bytes()
+    stop = (ROOT / "pvc-stop" / f"{module}.py").read_bytes()
+    assert torneio == stop, f"{module}.py divergiu entre pvc-torneio e pvc-stop"
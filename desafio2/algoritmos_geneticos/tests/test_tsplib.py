@@ -0,0 +1,117 @@
+# test_tsplib.py
+
+import numpy as np
+import pytest
+
+from conftest import load_modules
+
+BURMA14 = [(16.47, 96.10), (16.47, 94.44), (20.09, 92.54), (22.39, 93.37), (25.23, 97.24),
+           (22.00, 96.05), (20.47, 97.02), (17.20, 96.29), (16.30, 97.38), (14.05, 98.12),
+           (16.53, 97.38), (21.52, 95.59), (19.41, 97.13), (20.09, 94.55)]
+BURMA14_OPTIMAL_TOUR = [1, 2, 14, 3, 4, 5, 6, 12, 7, 13, 8, 11, 9, 10]
+BURMA14_OPTIMAL_LENGTH = 3323
+
+def write_coordinate_instance(path, name, edge_weight_type, coordinates, section="NODE_COORD_SECTION"):
+    lines = [f"NAME: {name}", "TYPE: TSP", f"DIMENSION: {len(coordinates)}",
+             f"EDGE_WEIGHT_TYPE: {edge_weight_type}", section]
+    # Nós fora de ordem: o leitor ordena pelo índice
+    for index in reversed(range(len(coordinates))):
+        x, y = coordinates[index]
+        lines.append(f"{index + 1} {x} {y}")
+    path.write_text("\n".join(lines + ["EOF", ""]))
+    return str(path)
+
+def write_tour(path, tour):
+    path.write_text("\n".join(["TYPE: TOUR", f"DIMENSION: {len(tour)}", "TOUR_SECTION",
+                               *map(str, tour), "-1", "EOF", ""]))
+    return str(path)
+
+def tsplib(pvc_folder):
+    return load_modules(pvc_folder, "tsplib").tsplib
+
+def test_euc_2d_rounds_to_nearest_integer(pvc_folder, tmp_path):
+    path = write_coordinate_instance(tmp_path / "tri.tsp", "tri", "EUC_2D", [(0, 0), (3, 4), (1, 1.2)])
+    instance = tsplib(pvc_folder).load_instance(path, cache_dir=str(tmp_path / "cache"))
+    # 5, sqrt(1 + 1.44) = 1.56 -> 2, sqrt(4 + 7.84) = 3.44 -> 3
+    assert instance.edge_weight_type == "EUC_2D"
+    assert np.array_equal(instance.distances, [[0, 5, 2], [5, 0, 3], [2, 3, 0]])
+    assert np.array_equal(instance.coordinates, [(0, 0), (3, 4), (1, 1.2)])
+
+def test_att_pseudo_euclidean_rounds_up(pvc_folder):
+    module = tsplib(pvc_folder)
+    # sqrt(100 / 10) = 3.16 -> 4 (arredondado para baixo, então soma 1); sqrt(2500 / 10) = 15.8 -> 16
+    distances = module.pair_distances([[0, 0], [0, 0]], [[10, 0], [30, 40]], "ATT")
+    assert distances.tolist() == [4.0, 16.0]
+
+def test_geo_matches_published_burma14_optimum(pvc_folder, tmp_path):
+    path = write_coordinate_instance(tmp_path / "burma14.tsp", "burma14", "GEO", BURMA14)
+    write_tour(tmp_path / "burma14.opt.tour", BURMA14_OPTIMAL_TOUR)
+    instance = tsplib(pvc_folder).load_instance(path, cache_dir=str(tmp_path / "cache"))
+    assert instance.dimension == 14
+    assert instance.optimal_tour.tolist() == [node - 1 for node in BURMA14_OPTIMAL_TOUR]
+    assert instance.optimal_distance == BURMA14_OPTIMAL_LENGTH
+    assert np.array_equal(instance.distances, instance.distances.T)
+
+FULL = np.array([[0, 1, 2, 3], [1, 0, 4, 5], [2, 4, 0, 6], [3, 5, 6, 0]])
+
+def explicit_tokens(edge_weight_format):
+    rows, cols = {
+        "UPPER_ROW": np.triu_indices(4, 1), "LOWER_ROW": np.tril_indices(4, -1),
+        "UPPER_DIAG_ROW": np.triu_indices(4), "LOWER_DIAG_ROW": np.tril_indices(4),
+        # Formatos por coluna: a transposta percorrida por linha
+        "UPPER_COL": np.tril_indices(4, -1)[::-1], "LOWER_COL": np.triu_indices(4, 1)[::-1],
+        "UPPER_DIAG_COL": np.tril_indices(4)[::-1], "LOWER_DIAG_COL": np.triu_indices(4)[::-1],
+    }.get(edge_weight_format, np.indices((4, 4)).reshape(2, -1))
+    return FULL[rows, cols].tolist()
+
+@pytest.mark.parametrize("edge_weight_format", ["FULL_MATRIX", "UPPER_ROW", "LOWER_ROW", "UPPER_DIAG_ROW",
+                                                "LOWER_DIAG_ROW", "UPPER_COL", "LOWER_COL",
+                                                "UPPER_DIAG_COL", "LOWER_DIAG_COL"])
+def test_explicit_formats(pvc_folder, tmp_path, edge_weight_format):
+    tokens = explicit_tokens(edge_weight_format)
+    path = tmp_path / "explicit.tsp"
+    path.write_text("\n".join(["NAME: explicit", "TYPE: TSP", "DIMENSION: 4", "EDGE_WEIGHT_TYPE: EXPLICIT",
+                               f"EDGE_WEIGHT_FORMAT: {edge_weight_format}", "EDGE_WEIGHT_SECTION",
+                               " ".join(map(str, tokens[:5])), " ".join(map(str, tokens[5:])),
+                               "DISPLAY_DATA_SECTION", "1 0 0", "2 1 0", "3 1 1", "4 0 1", "EOF", ""]))
+    instance = tsplib(pvc_folder).load_instance(str(path), cache_dir=str(tmp_path / "cache"))
+    assert np.array_equal(instance.distances, FULL)
+    assert np.array_equal(instance.coordinates, [(0, 0), (1, 0), (1, 1), (0, 1)])
+    assert instance.distance_provider().route_length(np.arange(4)) == 1 + 4 + 6 + 3
+
+def test_cache_is_reused_and_memory_mapped(pvc_folder, tmp_path, monkeypatch):
+    module = tsplib(pvc_folder)
+    path = write_coordinate_instance(tmp_path / "burma14.tsp", "burma14", "GEO", BURMA14)
+    cache_dir = str(tmp_path / "cache")
+    first = module.load_instance(path, cache_dir=cache_dir)
+    assert len(list((tmp_path / "cache").iterdir())) == 2
+
+    def fail(*args, **kwargs):
+        raise AssertionError("o cache deveria ter sido reaproveitado")
+
+    monkeypatch.setattr(module, "_parse_instance", fail)
+    second = module.load_instance(path, cache_dir=cache_dir)
+    for instance in (first, second):
+        assert isinstance(instance.distances, np.memmap)
+        assert isinstance(instance.coordinates, np.memmap)
+        assert not instance.coordinates.flags.writeable
+    assert np.array_equal(first.distances, second.distances)
+    assert np.array_equal(second.coordinates, BURMA14)
+
+    # Outro conteúdo, outro hash: o arquivo é lido de novo
+    monkeypatch.undo()
+    write_coordinate_instance(tmp_path / "burma14.tsp", "burma14", "GEO", BURMA14[::-1])
+    module.load_instance(path, cache_dir=cache_dir)
+    assert len(list((tmp_path / "cache").iterdir())) == 4
+
+def test_large_instances_cache_only_coordinates(pvc_folder, tmp_path, monkeypatch):
+    module = tsplib(pvc_folder)
+    monkeypatch.setattr(module, "DENSE_MATRIX_MAX_CITIES", 10)
+    path = write_coordinate_instance(tmp_path / "burma14.tsp", "burma14", "GEO", BURMA14)
+    write_tour(tmp_path / "burma14.opt.tour", BURMA14_OPTIMAL_TOUR)
+    for _ in range(2):
+        instance = module.load_instance(path, cache_dir=str(tmp_path / "cache"))
+        assert instance.distances is None
+        assert isinstance(instance.coordinates, np.memmap)
+        assert instance.optimal_distance == BURMA14_OPTIMAL_LENGTH
+    assert [entry.name.split(".", 1)[1] for entry in (tmp_path / "cache").iterdir()] == ["coordinates.npy"]
@@ -0,0 +1,38 @@
+# test_visualization.py
+
+import threading
+
+import numpy as np
+
+from conftest import load_modules
+
+def test_snapshots_carry_the_best_distance_of_run_ga(pvc_folder):
+    modules = load_modules(pvc_folder, "main", "ga_logic", "visualization")
+    visualization = modules.visualization
+    published = []
+
+    class RecordingQueue(visualization.SnapshotQueue):
+        def publish(self, snapshot):
+            published.append(snapshot)
+
+    rng = np.random.default_rng(4)
+    cities = modules.main.create_cities(20, rng)
+    observer = visualization.SnapshotPublisher(RecordingQueue(), threading.Event())
+    results = modules.main.run_ga(cities, population_size=30, n_generations=6, observer=observer, rng=rng)
+
+    assert [snapshot.generation for snapshot in published] == list(range(1, results["generations"] + 1))
+    for snapshot, best_distance in zip(published, results["best_distance_history"]):
+        assert snapshot.best_distance == best_distance
+        assert snapshot.best_distance == modules.ga_logic.calculate_total_distance(snapshot.best_route, cities)
+        assert np.array_equal(snapshot.top_routes[0], snapshot.best_route)
+
+def test_publisher_stops_the_run_once_stop_event_is_set(pvc_folder):
+    modules = load_modules(pvc_folder, "main", "visualization")
+    stop_event = threading.Event()
+    stop_event.set()
+    rng = np.random.default_rng(4)
+    cities = modules.main.create_cities(20, rng)
+    observer = modules.visualization.SnapshotPublisher(modules.visualization.SnapshotQueue(), stop_event)
+    results = modules.main.run_ga(cities, population_size=30, n_generations=6, observer=observer, rng=rng)
+    assert results["stop_reason"] == "observer"
+    assert results["generations"] == 1